@@ -4,11 +4,8 @@ import logging
 import os
 import sys
 from datetime import datetime
-from shutil import which
 
-from esphome import const, writer, yaml_util
-import esphome.codegen as cg
-from esphome.config import iter_components, read_config, strip_default_ids
+from esphome import const
 from esphome.const import (
     CONF_BAUD_RATE,
     CONF_BROKER,
@@ -81,15 +78,16 @@ def choose_upload_log_host(default, check_default, show_ota, show_mqtt, show_api
         return default
     if check_default is not None and check_default in [opt[1] for opt in options]:
         return check_default
-    if CORE.is_zephyr:
-        if which("mcumgr") is not None:
-            try:
-                from esphome.components.zephyr.netUpload import get_flash_address
-                address = get_flash_address()
-            except RuntimeError:
-                address = None
-            if address is not None:
-                options.append((f"Zephyr OTA?, {address}", address))
+    # Only a device with the bootloader flashed can be flashed over the network,
+    # don't wait for mDNS otherwise
+    if CORE.is_zephyr and os.path.exists(CORE.relative_build_path("boot_flashed.info")):
+        try:
+            from esphome.components.zephyr.netUpload import get_flash_address
+            address = get_flash_address()
+        except RuntimeError:
+            address = None
+        if address is not None:
+            options.append((f"Zephyr OTA?, {address}", address))
     return choose_prompt(options)
 
 
@@ -147,6 +145,9 @@ def run_miniterm(config, port):
 
 
 def wrap_to_code(name, comp):
+    from esphome import yaml_util
+    import esphome.codegen as cg
+
     coro = coroutine(comp.to_code)
 
     @functools.wraps(comp.to_code)
@@ -169,6 +170,8 @@ def write_cpp(config):
 
 
 def generate_cpp_contents(config):
+    from esphome.config import iter_components
+
     _LOGGER.info("Generating C++ source...")
 
     for name, component, conf in iter_components(CORE.config):
@@ -180,6 +183,8 @@ def generate_cpp_contents(config):
 
 
 def write_cpp_file():
+    from esphome import writer
+
     if CORE.target_platform == "zephyr":
         with CORE.zephyr_manager.get_writer() as builder:
             result = builder.run()
@@ -326,6 +331,9 @@ def command_wizard(args):
 
 
 def command_config(args, config):
+    from esphome import yaml_util
+    from esphome.config import strip_default_ids
+
     _LOGGER.info("Configuration is valid!")
     if not CORE.verbose:
         config = strip_default_ids(config)
@@ -434,8 +442,11 @@ def command_version(args):
 
 
 def command_clean(args, config):
+    from esphome import config_cache, writer
+
     try:
         writer.clean_build()
+        config_cache.clear_config_cache()
     except OSError as err:
         _LOGGER.error("Error deleting build files: %s", err)
         return 1
@@ -449,12 +460,26 @@ def command_dashboard(args):
     return dashboard.start_web_server(args)
 
 
+def _update_all_target(path):
+    """Return the target platform path was built for last time, if known."""
+    from esphome.storage_json import StorageJSON, ext_storage_path
+
+    storage = StorageJSON.load(
+        ext_storage_path(os.path.dirname(path), os.path.basename(path))
+    )
+    return storage.target_platform if storage is not None else None
+
+
 def command_update_all(args):
     import click
+    import subprocess
+    import threading
+    from concurrent.futures import ThreadPoolExecutor, as_completed
 
     success = {}
     files = list_yaml_files(args.configuration)
     twidth = 60
+    print_lock = threading.Lock()
 
     def print_bar(middle_text):
         middle_text = f" {middle_text} "
@@ -462,23 +487,82 @@ def command_update_all(args):
         half_line = "=" * ((twidth - width) // 2)
         click.echo(f"{half_line}{middle_text}{half_line}")
 
-    for f in files:
-        print(f"Updating {color(Fore.CYAN, f)}")
-        print("-" * twidth)
-        print()
-        rc = run_external_process(
-            "esphome", "--dashboard", "run", f, "--no-logs", "--device", "OTA"
-        )
-        if rc == 0:
-            print_bar(f"[{color(Fore.BOLD_GREEN, 'SUCCESS')}] {f}")
-            success[f] = True
+    def run_step(title, f, *cmd):
+        if args.jobs == 1:
+            # Nothing else runs at the same time, show the output as it is
+            print(f"{title} {color(Fore.CYAN, f)}")
+            print("-" * twidth)
+            print()
+            rc = run_external_process("esphome", "--dashboard", *cmd)
         else:
-            print_bar(f"[{color(Fore.BOLD_RED, 'ERROR')}] {f}")
-            success[f] = False
+            # Several steps run at the same time, prefix their lines with the config
+            with print_lock:
+                print(f"{title} {color(Fore.CYAN, f)}")
+            rc = run_prefixed(f"[{f}] ", "esphome", "--dashboard", *cmd)
+        with print_lock:
+            if rc == 0:
+                print_bar(f"[{color(Fore.BOLD_GREEN, 'SUCCESS')}] {f}")
+            else:
+                print_bar(f"[{color(Fore.BOLD_RED, 'ERROR')}] {f}")
+            print()
+            print()
+            print()
+        return rc == 0
+
+    def run_prefixed(prefix, *cmd):
+        try:
+            proc = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+            )
+        except OSError as err:
+            _LOGGER.error("Running command failed: %s", err)
+            return 1
+        with proc:
+            for line in proc.stdout:
+                line = line.decode("utf-8", "backslashreplace").rstrip("\r\n")
+                with print_lock:
+                    print(f"{prefix}{line}")
+        return proc.returncode
+
+    def upload(f):
+        success[f] = run_step("Uploading", f, "upload", f, "--device", "OTA")
+
+    def compile_(f):
+        success[f] = run_step("Compiling", f, "compile", f)
+        if not success[f]:
+            return
+        if args.jobs == 1:
+            upload(f)
+        else:
+            # Upload while the other configs are still compiling
+            uploads.append(upload_pool.submit(upload, f))
 
-        print()
-        print()
-        print()
+    # The first build for a target installs its toolchain and libraries into the
+    # shared PlatformIO directories, the other builds for it wait so they don't try to
+    # install the same packages at the same time.
+    targets = {}
+    for f in files:
+        targets.setdefault(_update_all_target(f), []).append(f)
+
+    uploads = []
+    # One upload at a time, OTA updates saturate the network anyway
+    upload_pool = ThreadPoolExecutor(1)
+    with ThreadPoolExecutor(args.jobs) as compile_pool, upload_pool:
+        first_builds = {
+            compile_pool.submit(compile_, target_files[0]): target_files[1:]
+            for target_files in targets.values()
+        }
+        builds = []
+        for future in as_completed(first_builds):
+            builds.append(future)
+            builds.extend(
+                compile_pool.submit(compile_, f) for f in first_builds[future]
+            )
+        # Raise the exceptions of the worker threads
+        for future in builds:
+            future.result()
+        for future in uploads:
+            future.result()
 
     print_bar(f"[{color(Fore.BOLD_WHITE, 'SUMMARY')}]")
     failed = 0
@@ -527,6 +611,29 @@ POST_CONFIG_ACTIONS = {
 }
 
 
+# Commands that can skip validation if the configuration has not changed since
+# it was last validated
+CONFIG_CACHE_ACTIONS = {
+    "compile",
+    "upload",
+    "logs",
+    "run",
+    "clean-mqtt",
+    "mqtt-fingerprint",
+    "idedata",
+}
+
+
+def _positive_int(value):
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value!r} is not a positive integer")
+    return number
+
+
 def parse_args(argv):
     options_parser = argparse.ArgumentParser(add_help=False)
     options_parser.add_argument(
@@ -538,6 +645,11 @@ def parse_args(argv):
     options_parser.add_argument(
         "--dashboard", help=argparse.SUPPRESS, action="store_true"
     )
+    options_parser.add_argument(
+        "--profile-imports",
+        help="Report the modules that took the longest to import.",
+        action="store_true",
+    )
     options_parser.add_argument(
         "-s",
         "--substitution",
@@ -698,6 +810,13 @@ def parse_args(argv):
     parser_update.add_argument(
         "configuration", help="Your YAML configuration file directories.", nargs="+"
     )
+    parser_update.add_argument(
+        "-j",
+        "--jobs",
+        help="Number of configurations to compile in parallel.",
+        type=_positive_int,
+        default=1,
+    )
 
     parser_idedata = subparsers.add_parser("idedata")
     parser_idedata.add_argument(
@@ -785,6 +904,19 @@ def parse_args(argv):
 
 def run_esphome(argv):
     args = parse_args(argv)
+    if not args.profile_imports:
+        return _run_esphome(args)
+
+    from esphome.import_profiler import ImportProfiler
+
+    with ImportProfiler() as profiler:
+        try:
+            return _run_esphome(args)
+        finally:
+            safe_print(profiler.report())
+
+
+def _run_esphome(args):
     CORE.dashboard = args.dashboard
 
     setup_log(
@@ -815,11 +947,16 @@ def run_esphome(argv):
             _LOGGER.error(e, exc_info=args.verbose)
             return 1
 
+    from esphome.config import read_config
+
     for conf_path in args.configuration:
         CORE.config_path = conf_path
         CORE.dashboard = args.dashboard
 
-        config = read_config(dict(args.substitution) if args.substitution else {})
+        config = read_config(
+            dict(args.substitution) if args.substitution else {},
+            use_cache=args.command in CONFIG_CACHE_ACTIONS,
+        )
         if config is None:
             return 2
         CORE.config = config
@@ -0,0 +1,110 @@
+"""Content-addressed cache for generated display assets.
+
+Rasterizing fonts and converting images with Pillow is one of the slower parts of
+code generation, and the result only depends on the source file and the options
+it is converted with. The generated data is stored in `.esphome/asset_cache/`,
+keyed by the hash of both, so it is shared by all devices in the configuration
+directory. The least recently used entries are removed when the cache grows
+beyond MAX_CACHE_SIZE.
+"""
+import hashlib
+import logging
+import os
+import pickle
+from typing import Any, Callable, Dict, Optional
+
+from esphome import const
+from esphome.core import CORE
+from esphome.helpers import write_file
+
+_LOGGER = logging.getLogger(__name__)
+
+# Increase when the structure of the cached data changes
+CACHE_VERSION = 1
+MAX_CACHE_SIZE = 64 * 1024 * 1024
+
+
+def asset_cache_dir() -> str:
+    return CORE.relative_internal_path("asset_cache")
+
+
+def _hash_file(path: str) -> Optional[str]:
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f_handle:
+            for block in iter(lambda: f_handle.read(1024 * 1024), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _cache_key(kind: str, file_hash: str, options: Dict[str, Any]) -> str:
+    import PIL
+
+    key = (
+        CACHE_VERSION,
+        const.__version__,
+        PIL.__version__,
+        kind,
+        file_hash,
+        sorted((str(k), repr(v)) for k, v in options.items()),
+    )
+    return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+
+
+def _evict(directory: str, max_size: int) -> None:
+    """Remove the least recently used entries until the cache fits in max_size."""
+    entries = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError as err:
+            _LOGGER.debug("Could not remove asset cache entry %s: %s", path, err)
+            continue
+        total -= size
+
+
+def cached_asset(
+    kind: str, path: str, options: Dict[str, Any], generate: Callable[[], Any]
+) -> Any:
+    """Return the data generate() creates for the asset file at path.
+
+    The result is reused as long as the contents of path, kind and options are the
+    same, so generate must only depend on those. It must return picklable data.
+    """
+    file_hash = _hash_file(path)
+    if file_hash is None:
+        # Let generate() report the missing file
+        return generate()
+
+    directory = asset_cache_dir()
+    cache_path = os.path.join(directory, _cache_key(kind, file_hash, options))
+    try:
+        with open(cache_path, "rb") as f_handle:
+            data = pickle.load(f_handle)
+        # The modification time is the last use, for the LRU eviction
+        os.utime(cache_path)
+        _LOGGER.debug("Using cached %s data for %s", kind, path)
+        return data
+    except FileNotFoundError:
+        pass
+    except Exception as err:  # pylint: disable=broad-except
+        # Any problem with the cache just means we have to generate again
+        _LOGGER.debug("Could not read asset cache %s: %s", cache_path, err)
+
+    data = generate()
+    try:
+        write_file(cache_path, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+        _evict(directory, MAX_CACHE_SIZE)
+    except Exception as err:  # pylint: disable=broad-except
+        _LOGGER.debug("Could not store asset cache %s: %s", cache_path, err)
+    return data
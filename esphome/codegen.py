@@ -15,6 +15,7 @@ from esphome.cpp_generator import (  # noqa
     TemplateArguments,
     StructInitializer,
     ArrayInitializer,
+    ByteArrayInitializer,
     safe_exp,
     Statement,
     LineComment,
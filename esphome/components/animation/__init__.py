@@ -1,12 +1,12 @@
 import logging
 
-from esphome import core
+from esphome import asset_cache, core
 from esphome.components import display, font
 import esphome.components.image as espImage
 import esphome.config_validation as cv
 import esphome.codegen as cg
 from esphome.const import CONF_FILE, CONF_ID, CONF_RAW_DATA_ID, CONF_RESIZE, CONF_TYPE
-from esphome.core import CORE, HexInt
+from esphome.core import CORE
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,68 +32,41 @@ CONFIG_SCHEMA = cv.All(font.validate_pillow_installed, ANIMATION_SCHEMA)
 CODEOWNERS = ["@syndlex"]
 
 
-async def to_code(config):
+def load_animation(path, resize, image_type):
+    """Load and convert all frames of the file, returns (width, height, frames, data)."""
     from PIL import Image
 
-    path = CORE.relative_config_path(config[CONF_FILE])
     try:
         image = Image.open(path)
     except Exception as e:
         raise core.EsphomeError(f"Could not load image file {path}: {e}")
 
-    width, height = image.size
     frames = image.n_frames
-    if CONF_RESIZE in config:
-        image.thumbnail(config[CONF_RESIZE])
-        width, height = image.size
-    else:
-        if width > 500 or height > 500:
-            _LOGGER.warning(
-                "The image you requested is very big. Please consider using"
-                " the resize parameter."
-            )
-
-    if config[CONF_TYPE] == "GRAYSCALE":
-        data = [0 for _ in range(height * width * frames)]
-        pos = 0
-        for frameIndex in range(frames):
-            image.seek(frameIndex)
-            frame = image.convert("L", dither=Image.NONE)
-            pixels = list(frame.getdata())
-            for pix in pixels:
-                data[pos] = pix
-                pos += 1
-
-    elif config[CONF_TYPE] == "RGB24":
-        data = [0 for _ in range(height * width * 3 * frames)]
-        pos = 0
-        for frameIndex in range(frames):
-            image.seek(frameIndex)
-            frame = image.convert("RGB")
-            pixels = list(frame.getdata())
-            for pix in pixels:
-                data[pos] = pix[0]
-                pos += 1
-                data[pos] = pix[1]
-                pos += 1
-                data[pos] = pix[2]
-                pos += 1
-
-    elif config[CONF_TYPE] == "BINARY":
-        width8 = ((width + 7) // 8) * 8
-        data = [0 for _ in range((height * width8 // 8) * frames)]
-        for frameIndex in range(frames):
-            image.seek(frameIndex)
-            frame = image.convert("1", dither=Image.NONE)
-            for y in range(height):
-                for x in range(width):
-                    if frame.getpixel((x, y)):
-                        continue
-                    pos = x + y * width8 + (height * width8 * frameIndex)
-                    data[pos // 8] |= 0x80 >> (pos % 8)
-
-    rhs = [HexInt(x) for x in data]
-    prog_arr = cg.progmem_array(config[CONF_RAW_DATA_ID], rhs)
+    if resize is not None:
+        image.thumbnail(resize)
+    width, height = image.size
+
+    data = bytearray()
+    for frame_index in range(frames):
+        image.seek(frame_index)
+        data += espImage.image_to_bytes(image, image_type, Image.NONE)
+    return width, height, frames, bytes(data)
+
+
+async def to_code(config):
+    path = CORE.relative_config_path(config[CONF_FILE])
+    options = {"resize": config.get(CONF_RESIZE), "image_type": config[CONF_TYPE]}
+    width, height, frames, data = asset_cache.cached_asset(
+        "animation", path, options, lambda: load_animation(path, **options)
+    )
+
+    if CONF_RESIZE not in config and (width > 500 or height > 500):
+        _LOGGER.warning(
+            "The image you requested is very big. Please consider using"
+            " the resize parameter."
+        )
+
+    prog_arr = cg.progmem_array(config[CONF_RAW_DATA_ID], data)
     cg.new_Pvariable(
         config[CONF_ID],
         prog_arr,
@@ -18,6 +18,10 @@
 #include <esp_system.h>
 #endif
 
+#ifdef USE_SENSOR
+#include "esphome/components/sensor/filter.h"
+#endif
+
 namespace esphome {
 namespace debug {
 
@@ -37,6 +41,10 @@ void DebugComponent::dump_config() {
   this->free_heap_ = heap_caps_get_free_size(MALLOC_CAP_INTERNAL);
 #endif
   ESP_LOGD(TAG, "Free Heap Size: %u bytes", this->free_heap_);
+#ifdef USE_SENSOR
+  this->filter_heap_ = sensor::Filter::get_heap_bytes();
+  ESP_LOGD(TAG, "Sensor Filter Heap: %u bytes", static_cast<unsigned>(this->filter_heap_));
+#endif
 
 #ifdef USE_ARDUINO
   const char *flash_mode;
@@ -224,6 +232,14 @@ void DebugComponent::loop() {
     ESP_LOGD(TAG, "Free Heap Size: %u bytes", this->free_heap_);
     this->status_momentary_warning("heap", 1000);
   }
+#ifdef USE_SENSOR
+  // Filters only allocate while they are set up
+  size_t filter_heap = sensor::Filter::get_heap_bytes();
+  if (filter_heap != this->filter_heap_) {
+    this->filter_heap_ = filter_heap;
+    ESP_LOGD(TAG, "Sensor Filter Heap: %u bytes", static_cast<unsigned>(this->filter_heap_));
+  }
+#endif
 }
 float DebugComponent::get_setup_priority() const { return setup_priority::LATE; }
 
@@ -1,6 +1,7 @@
 #pragma once
 
 #include "esphome/core/component.h"
+#include "esphome/core/defines.h"
 
 namespace esphome {
 namespace debug {
@@ -13,6 +14,9 @@ class DebugComponent : public Component {
 
  protected:
   uint32_t free_heap_{};
+#ifdef USE_SENSOR
+  size_t filter_heap_{};
+#endif
 };
 
 }  // namespace debug
@@ -1,11 +1,11 @@
 import functools
 
-from esphome import core
+from esphome import asset_cache, core
 from esphome.components import display
 import esphome.config_validation as cv
 import esphome.codegen as cg
 from esphome.const import CONF_FILE, CONF_GLYPHS, CONF_ID, CONF_RAW_DATA_ID, CONF_SIZE
-from esphome.core import CORE, HexInt
+from esphome.core import CORE
 
 DEPENDENCIES = ["display"]
 MULTI_CONF = True
@@ -90,36 +90,56 @@ FONT_SCHEMA = cv.Schema(
 CONFIG_SCHEMA = cv.All(validate_pillow_installed, FONT_SCHEMA)
 
 
-async def to_code(config):
+def mask_to_bytes(mask):
+    """Pack a glyph mask from ImageFont.getmask() into bytes.
+
+    Eight pixels per byte (MSB first) with a set bit for every pixel set in the
+    mask, each row is padded to a whole byte.
+    """
+    from PIL import Image
+
+    glyph = Image.new("L", mask.size)
+    glyph.putdata(mask)
+    return glyph.point(lambda pixel: 255 if pixel else 0, "1").tobytes()
+
+
+def load_font(path, size, glyphs):
+    """Rasterize the glyphs of the font file.
+
+    Returns (ascent, descent, data, glyph_args) where glyph_args contains the
+    (data offset, offset_x, offset_y, width, height) of every glyph.
+    """
     from PIL import ImageFont
 
-    path = CORE.relative_config_path(config[CONF_FILE])
     try:
-        font = ImageFont.truetype(path, config[CONF_SIZE])
+        font = ImageFont.truetype(path, size)
     except Exception as e:
         raise core.EsphomeError(f"Could not load truetype file {path}: {e}")
 
     ascent, descent = font.getmetrics()
 
     glyph_args = {}
-    data = []
-    for glyph in config[CONF_GLYPHS]:
+    data = bytearray()
+    for glyph in glyphs:
         mask = font.getmask(glyph, mode="1")
         _, (offset_x, offset_y) = font.font.getsize(glyph)
         width, height = mask.size
-        width8 = ((width + 7) // 8) * 8
-        glyph_data = [0] * (height * width8 // 8)
-        for y in range(height):
-            for x in range(width):
-                if not mask.getpixel((x, y)):
-                    continue
-                pos = x + y * width8
-                glyph_data[pos // 8] |= 0x80 >> (pos % 8)
         glyph_args[glyph] = (len(data), offset_x, offset_y, width, height)
-        data += glyph_data
+        data += mask_to_bytes(mask)
+    return ascent, descent, bytes(data), glyph_args
+
+
+async def to_code(config):
+    path = CORE.relative_config_path(config[CONF_FILE])
+    options = {
+        "size": config[CONF_SIZE],
+        "glyphs": [str(glyph) for glyph in config[CONF_GLYPHS]],
+    }
+    ascent, descent, data, glyph_args = asset_cache.cached_asset(
+        "font", path, options, lambda: load_font(path, **options)
+    )
 
-    rhs = [HexInt(x) for x in data]
-    prog_arr = cg.progmem_array(config[CONF_RAW_DATA_ID], rhs)
+    prog_arr = cg.progmem_array(config[CONF_RAW_DATA_ID], data)
 
     glyph_initializer = []
     for glyph in config[CONF_GLYPHS]:
@@ -1,6 +1,6 @@
 import logging
 
-from esphome import core
+from esphome import asset_cache, core
 from esphome.components import display, font
 import esphome.config_validation as cv
 import esphome.codegen as cg
@@ -12,7 +12,7 @@ from esphome.const import (
     CONF_RESIZE,
     CONF_TYPE,
 )
-from esphome.core import CORE, HexInt
+from esphome.core import CORE
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -44,63 +44,58 @@ IMAGE_SCHEMA = cv.Schema(
 CONFIG_SCHEMA = cv.All(font.validate_pillow_installed, IMAGE_SCHEMA)
 
 
-async def to_code(config):
+def image_to_bytes(image, image_type, dither):
+    """Convert a PIL image to the pixel data for an Image of image_type.
+
+    GRAYSCALE is one byte per pixel, RGB24 three. BINARY packs eight pixels in a
+    byte (MSB first) with a set bit for every black pixel, each row is padded to a
+    whole byte.
+    """
+    from PIL import ImageChops
+
+    if image_type == "GRAYSCALE":
+        return image.convert("L", dither=dither).tobytes()
+    if image_type == "RGB24":
+        return image.convert("RGB").tobytes()
+    # Invert first, so the padding bits stay 0
+    return ImageChops.invert(image.convert("1", dither=dither)).tobytes()
+
+
+def load_image(path, resize, image_type, dither):
+    """Load and convert the image file, returns (width, height, data)."""
     from PIL import Image
 
-    path = CORE.relative_config_path(config[CONF_FILE])
     try:
         image = Image.open(path)
     except Exception as e:
         raise core.EsphomeError(f"Could not load image file {path}: {e}")
 
+    if resize is not None:
+        image.thumbnail(resize)
     width, height = image.size
 
-    if CONF_RESIZE in config:
-        image.thumbnail(config[CONF_RESIZE])
-        width, height = image.size
-    else:
-        if width > 500 or height > 500:
-            _LOGGER.warning(
-                "The image you requested is very big. Please consider using"
-                " the resize parameter."
-            )
-
-    dither = Image.NONE if config[CONF_DITHER] == "NONE" else Image.FLOYDSTEINBERG
-    if config[CONF_TYPE] == "GRAYSCALE":
-        image = image.convert("L", dither=dither)
-        pixels = list(image.getdata())
-        data = [0 for _ in range(height * width)]
-        pos = 0
-        for pix in pixels:
-            data[pos] = pix
-            pos += 1
-
-    elif config[CONF_TYPE] == "RGB24":
-        image = image.convert("RGB")
-        pixels = list(image.getdata())
-        data = [0 for _ in range(height * width * 3)]
-        pos = 0
-        for pix in pixels:
-            data[pos] = pix[0]
-            pos += 1
-            data[pos] = pix[1]
-            pos += 1
-            data[pos] = pix[2]
-            pos += 1
-
-    elif config[CONF_TYPE] == "BINARY":
-        image = image.convert("1", dither=dither)
-        width8 = ((width + 7) // 8) * 8
-        data = [0 for _ in range(height * width8 // 8)]
-        for y in range(height):
-            for x in range(width):
-                if image.getpixel((x, y)):
-                    continue
-                pos = x + y * width8
-                data[pos // 8] |= 0x80 >> (pos % 8)
-
-    rhs = [HexInt(x) for x in data]
-    prog_arr = cg.progmem_array(config[CONF_RAW_DATA_ID], rhs)
+    dither = Image.NONE if dither == "NONE" else Image.FLOYDSTEINBERG
+    return width, height, image_to_bytes(image, image_type, dither)
+
+
+async def to_code(config):
+    path = CORE.relative_config_path(config[CONF_FILE])
+    options = {
+        "resize": config.get(CONF_RESIZE),
+        "image_type": config[CONF_TYPE],
+        "dither": config[CONF_DITHER],
+    }
+    width, height, data = asset_cache.cached_asset(
+        "image", path, options, lambda: load_image(path, **options)
+    )
+
+    if CONF_RESIZE not in config and (width > 500 or height > 500):
+        _LOGGER.warning(
+            "The image you requested is very big. Please consider using"
+            " the resize parameter."
+        )
+
+    prog_arr = cg.progmem_array(config[CONF_RAW_DATA_ID], bytes(data))
     cg.new_Pvariable(
         config[CONF_ID], prog_arr, width, height, IMAGE_TYPE[config[CONF_TYPE]]
     )
@@ -112,6 +112,15 @@ def validate_send_first_at(value):
     return value
 
 
+# The windows of the sliding window filters are allocated for their full size at boot,
+# up to 8 bytes per value
+MAX_WINDOW_SIZE = 1000
+validate_window_size = cv.All(
+    cv.int_range(min=1, max=MAX_WINDOW_SIZE),
+    msg=f"window_size must be an integer between 1 and {MAX_WINDOW_SIZE}, "
+    "the memory for the whole window is reserved when the device boots",
+)
+
 FILTER_REGISTRY = Registry()
 validate_filters = cv.validate_registry("filter", FILTER_REGISTRY)
 
@@ -279,7 +288,7 @@ async def filter_out_filter_to_code(config, filter_id):
 MEDIAN_SCHEMA = cv.All(
     cv.Schema(
         {
-            cv.Optional(CONF_WINDOW_SIZE, default=5): cv.positive_not_null_int,
+            cv.Optional(CONF_WINDOW_SIZE, default=5): validate_window_size,
             cv.Optional(CONF_SEND_EVERY, default=5): cv.positive_not_null_int,
             cv.Optional(CONF_SEND_FIRST_AT, default=1): cv.positive_not_null_int,
         }
@@ -290,9 +299,10 @@ MEDIAN_SCHEMA = cv.All(
 
 @FILTER_REGISTRY.register("median", MedianFilter, MEDIAN_SCHEMA)
 async def median_filter_to_code(config, filter_id):
+    # The window is sized at compile time and stored in the filter
     return cg.new_Pvariable(
         filter_id,
-        config[CONF_WINDOW_SIZE],
+        cg.TemplateArguments(config[CONF_WINDOW_SIZE]),
         config[CONF_SEND_EVERY],
         config[CONF_SEND_FIRST_AT],
     )
@@ -301,7 +311,7 @@ async def median_filter_to_code(config, filter_id):
 MIN_SCHEMA = cv.All(
     cv.Schema(
         {
-            cv.Optional(CONF_WINDOW_SIZE, default=5): cv.positive_not_null_int,
+            cv.Optional(CONF_WINDOW_SIZE, default=5): validate_window_size,
             cv.Optional(CONF_SEND_EVERY, default=5): cv.positive_not_null_int,
             cv.Optional(CONF_SEND_FIRST_AT, default=1): cv.positive_not_null_int,
         }
@@ -314,7 +324,7 @@ MIN_SCHEMA = cv.All(
 async def min_filter_to_code(config, filter_id):
     return cg.new_Pvariable(
         filter_id,
-        config[CONF_WINDOW_SIZE],
+        cg.TemplateArguments(config[CONF_WINDOW_SIZE]),
         config[CONF_SEND_EVERY],
         config[CONF_SEND_FIRST_AT],
     )
@@ -323,7 +333,7 @@ async def min_filter_to_code(config, filter_id):
 MAX_SCHEMA = cv.All(
     cv.Schema(
         {
-            cv.Optional(CONF_WINDOW_SIZE, default=5): cv.positive_not_null_int,
+            cv.Optional(CONF_WINDOW_SIZE, default=5): validate_window_size,
             cv.Optional(CONF_SEND_EVERY, default=5): cv.positive_not_null_int,
             cv.Optional(CONF_SEND_FIRST_AT, default=1): cv.positive_not_null_int,
         }
@@ -336,7 +346,7 @@ MAX_SCHEMA = cv.All(
 async def max_filter_to_code(config, filter_id):
     return cg.new_Pvariable(
         filter_id,
-        config[CONF_WINDOW_SIZE],
+        cg.TemplateArguments(config[CONF_WINDOW_SIZE]),
         config[CONF_SEND_EVERY],
         config[CONF_SEND_FIRST_AT],
     )
@@ -345,7 +355,7 @@ async def max_filter_to_code(config, filter_id):
 SLIDING_AVERAGE_SCHEMA = cv.All(
     cv.Schema(
         {
-            cv.Optional(CONF_WINDOW_SIZE, default=15): cv.positive_not_null_int,
+            cv.Optional(CONF_WINDOW_SIZE, default=15): validate_window_size,
             cv.Optional(CONF_SEND_EVERY, default=15): cv.positive_not_null_int,
             cv.Optional(CONF_SEND_FIRST_AT, default=1): cv.positive_not_null_int,
         }
@@ -362,7 +372,7 @@ SLIDING_AVERAGE_SCHEMA = cv.All(
 async def sliding_window_moving_average_filter_to_code(config, filter_id):
     return cg.new_Pvariable(
         filter_id,
-        config[CONF_WINDOW_SIZE],
+        cg.TemplateArguments(config[CONF_WINDOW_SIZE]),
         config[CONF_SEND_EVERY],
         config[CONF_SEND_FIRST_AT],
     )
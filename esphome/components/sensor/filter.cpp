@@ -8,6 +8,8 @@ namespace sensor {
 
 static const char *const TAG = "sensor.filter";
 
+static size_t filter_heap_bytes = 0;  // NOLINT(cppcoreguidelines-avoid-non-const-global-variables)
+
 // Filter
 void Filter::input(float value) {
   ESP_LOGVV(TAG, "Filter(%p)::input(%f)", this, value);
@@ -29,18 +31,30 @@ void Filter::initialize(Sensor *parent, Filter *next) {
   this->parent_ = parent;
   this->next_ = next;
 }
+void *Filter::operator new(size_t size) {
+  filter_heap_bytes += size;
+  return ::operator new(size);
+}
+void Filter::operator delete(void *ptr, size_t size) {
+  filter_heap_bytes -= size;
+  ::operator delete(ptr);
+}
+size_t Filter::get_heap_bytes() { return filter_heap_bytes; }
 
 // MedianFilter
-MedianFilter::MedianFilter(size_t window_size, size_t send_every, size_t send_first_at)
-    : send_every_(send_every), send_at_(send_every - send_first_at), window_size_(window_size) {}
-void MedianFilter::set_send_every(size_t send_every) { this->send_every_ = send_every; }
-void MedianFilter::set_window_size(size_t window_size) { this->window_size_ = window_size; }
-optional<float> MedianFilter::new_value(float value) {
+MedianFilterBase::MedianFilterBase(float *values, float *sorted, size_t capacity, size_t send_every,
+                                   size_t send_first_at)
+    : window_(values, sorted, capacity), send_every_(send_every), send_at_(send_every - send_first_at) {}
+void MedianFilterBase::set_send_every(size_t send_every) { this->send_every_ = send_every; }
+void MedianFilterBase::set_window_size(size_t window_size) {
+  this->window_.set_window_size(window_size);
+  if (this->window_.get_window_size() != window_size)
+    ESP_LOGW(TAG, "MedianFilter(%p) holds at most %u values", this,
+             static_cast<unsigned>(this->window_.get_window_size()));
+}
+optional<float> MedianFilterBase::new_value(float value) {
   if (!std::isnan(value)) {
-    while (this->queue_.size() >= this->window_size_) {
-      this->queue_.pop_front();
-    }
-    this->queue_.push_back(value);
+    this->window_.push(value);
     ESP_LOGVV(TAG, "MedianFilter(%p)::new_value(%f)", this, value);
   }
 
@@ -48,17 +62,8 @@ optional<float> MedianFilter::new_value(float value) {
     this->send_at_ = 0;
 
     float median = 0.0f;
-    if (!this->queue_.empty()) {
-      std::deque<float> median_queue = this->queue_;
-      sort(median_queue.begin(), median_queue.end());
-
-      size_t queue_size = median_queue.size();
-      if (queue_size % 2) {
-        median = median_queue[queue_size / 2];
-      } else {
-        median = (median_queue[queue_size / 2] + median_queue[(queue_size / 2) - 1]) / 2.0f;
-      }
-    }
+    if (!this->window_.empty())
+      median = this->window_.median();
 
     ESP_LOGVV(TAG, "MedianFilter(%p)::new_value(%f) SENDING", this, median);
     return median;
@@ -67,16 +72,18 @@ optional<float> MedianFilter::new_value(float value) {
 }
 
 // MinFilter
-MinFilter::MinFilter(size_t window_size, size_t send_every, size_t send_first_at)
-    : send_every_(send_every), send_at_(send_every - send_first_at), window_size_(window_size) {}
-void MinFilter::set_send_every(size_t send_every) { this->send_every_ = send_every; }
-void MinFilter::set_window_size(size_t window_size) { this->window_size_ = window_size; }
-optional<float> MinFilter::new_value(float value) {
+MinFilterBase::MinFilterBase(IndexedValue *entries, size_t capacity, size_t send_every, size_t send_first_at)
+    : window_(entries, capacity), send_every_(send_every), send_at_(send_every - send_first_at) {}
+void MinFilterBase::set_send_every(size_t send_every) { this->send_every_ = send_every; }
+void MinFilterBase::set_window_size(size_t window_size) {
+  this->window_.set_window_size(window_size);
+  if (this->window_.get_window_size() != window_size)
+    ESP_LOGW(TAG, "MinFilter(%p) holds at most %u values", this,
+             static_cast<unsigned>(this->window_.get_window_size()));
+}
+optional<float> MinFilterBase::new_value(float value) {
   if (!std::isnan(value)) {
-    while (this->queue_.size() >= this->window_size_) {
-      this->queue_.pop_front();
-    }
-    this->queue_.push_back(value);
+    this->window_.push(value);
     ESP_LOGVV(TAG, "MinFilter(%p)::new_value(%f)", this, value);
   }
 
@@ -84,10 +91,8 @@ optional<float> MinFilter::new_value(float value) {
     this->send_at_ = 0;
 
     float min = 0.0f;
-    if (!this->queue_.empty()) {
-      std::deque<float>::iterator it = std::min_element(queue_.begin(), queue_.end());
-      min = *it;
-    }
+    if (!this->window_.empty())
+      min = this->window_.front();
 
     ESP_LOGVV(TAG, "MinFilter(%p)::new_value(%f) SENDING", this, min);
     return min;
@@ -96,16 +101,18 @@ optional<float> MinFilter::new_value(float value) {
 }
 
 // MaxFilter
-MaxFilter::MaxFilter(size_t window_size, size_t send_every, size_t send_first_at)
-    : send_every_(send_every), send_at_(send_every - send_first_at), window_size_(window_size) {}
-void MaxFilter::set_send_every(size_t send_every) { this->send_every_ = send_every; }
-void MaxFilter::set_window_size(size_t window_size) { this->window_size_ = window_size; }
-optional<float> MaxFilter::new_value(float value) {
+MaxFilterBase::MaxFilterBase(IndexedValue *entries, size_t capacity, size_t send_every, size_t send_first_at)
+    : window_(entries, capacity), send_every_(send_every), send_at_(send_every - send_first_at) {}
+void MaxFilterBase::set_send_every(size_t send_every) { this->send_every_ = send_every; }
+void MaxFilterBase::set_window_size(size_t window_size) {
+  this->window_.set_window_size(window_size);
+  if (this->window_.get_window_size() != window_size)
+    ESP_LOGW(TAG, "MaxFilter(%p) holds at most %u values", this,
+             static_cast<unsigned>(this->window_.get_window_size()));
+}
+optional<float> MaxFilterBase::new_value(float value) {
   if (!std::isnan(value)) {
-    while (this->queue_.size() >= this->window_size_) {
-      this->queue_.pop_front();
-    }
-    this->queue_.push_back(value);
+    this->window_.push(value);
     ESP_LOGVV(TAG, "MaxFilter(%p)::new_value(%f)", this, value);
   }
 
@@ -113,10 +120,8 @@ optional<float> MaxFilter::new_value(float value) {
     this->send_at_ = 0;
 
     float max = 0.0f;
-    if (!this->queue_.empty()) {
-      std::deque<float>::iterator it = std::max_element(queue_.begin(), queue_.end());
-      max = *it;
-    }
+    if (!this->window_.empty())
+      max = this->window_.front();
 
     ESP_LOGVV(TAG, "MaxFilter(%p)::new_value(%f) SENDING", this, max);
     return max;
@@ -125,15 +130,24 @@ optional<float> MaxFilter::new_value(float value) {
 }
 
 // SlidingWindowMovingAverageFilter
-SlidingWindowMovingAverageFilter::SlidingWindowMovingAverageFilter(size_t window_size, size_t send_every,
-                                                                   size_t send_first_at)
-    : send_every_(send_every), send_at_(send_every - send_first_at), window_size_(window_size) {}
-void SlidingWindowMovingAverageFilter::set_send_every(size_t send_every) { this->send_every_ = send_every; }
-void SlidingWindowMovingAverageFilter::set_window_size(size_t window_size) { this->window_size_ = window_size; }
-optional<float> SlidingWindowMovingAverageFilter::new_value(float value) {
+SlidingWindowMovingAverageFilterBase::SlidingWindowMovingAverageFilterBase(float *values, size_t capacity,
+                                                                           size_t send_every, size_t send_first_at)
+    : queue_(values, capacity), send_every_(send_every), send_at_(send_every - send_first_at), window_size_(capacity) {}
+void SlidingWindowMovingAverageFilterBase::set_send_every(size_t send_every) { this->send_every_ = send_every; }
+void SlidingWindowMovingAverageFilterBase::set_window_size(size_t window_size) {
+  this->window_size_ = std::min(window_size, this->queue_.capacity());
+  if (this->window_size_ != window_size)
+    ESP_LOGW(TAG, "SlidingWindowMovingAverageFilter(%p) holds at most %u values", this,
+             static_cast<unsigned>(this->window_size_));
+  while (this->queue_.size() > this->window_size_) {
+    this->sum_ -= this->queue_.front();
+    this->queue_.pop_front();
+  }
+}
+optional<float> SlidingWindowMovingAverageFilterBase::new_value(float value) {
   if (!std::isnan(value)) {
     if (this->queue_.size() == this->window_size_) {
-      this->sum_ -= this->queue_[0];
+      this->sum_ -= this->queue_.front();
       this->queue_.pop_front();
     }
     this->queue_.push_back(value);
@@ -150,8 +164,8 @@ optional<float> SlidingWindowMovingAverageFilter::new_value(float value) {
     if (this->send_at_ >= 10000) {
       // Recalculate to prevent floating point error accumulating
       this->sum_ = 0;
-      for (auto v : this->queue_)
-        this->sum_ += v;
+      for (size_t i = 0; i < this->queue_.size(); i++)
+        this->sum_ += this->queue_[i];
       average = this->sum_ / this->queue_.size();
       this->send_at_ = 0;
     }
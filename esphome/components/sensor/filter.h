@@ -2,7 +2,8 @@
 
 #include "esphome/core/component.h"
 #include "esphome/core/helpers.h"
-#include <queue>
+#include "sliding_window.h"
+#include <cstddef>
 #include <utility>
 
 namespace esphome {
@@ -35,6 +36,14 @@ class Filter {
 
   void output(float value);
 
+  virtual ~Filter() = default;
+
+  /// Filters are allocated through these to keep track of the heap they use.
+  static void *operator new(size_t size);
+  static void operator delete(void *ptr, size_t size);
+  /// The number of heap bytes of all filter objects, the windows of sliding filters included.
+  static size_t get_heap_bytes();
+
  protected:
   friend Sensor;
 
@@ -44,118 +53,158 @@ class Filter {
 
 /** Simple median filter.
  *
- * Takes the median of the last <send_every> values and pushes it out every <send_every>.
+ * Takes the median of the last <window_size> values and pushes it out every <send_every>.
+ *
+ * The window is stored in the filter itself, see MedianFilter.
  */
-class MedianFilter : public Filter {
+class MedianFilterBase : public Filter {
  public:
-  /** Construct a MedianFilter.
-   *
-   * @param window_size The number of values that should be used in median calculation.
-   * @param send_every After how many sensor values should a new one be pushed out.
-   * @param send_first_at After how many values to forward the very first value. Defaults to the first value
-   *   on startup being published on the first *raw* value, so with no filter applied. Must be less than or equal to
-   *   send_every.
-   */
-  explicit MedianFilter(size_t window_size, size_t send_every, size_t send_first_at);
-
   optional<float> new_value(float value) override;
 
   void set_send_every(size_t send_every);
+  /// Set the number of values used in median calculation, at most the capacity of the filter.
   void set_window_size(size_t window_size);
 
  protected:
-  std::deque<float> queue_;
+  MedianFilterBase(float *values, float *sorted, size_t capacity, size_t send_every, size_t send_first_at);
+
+  SortedWindow window_;
   size_t send_every_;
   size_t send_at_;
-  size_t window_size_;
 };
 
-/** Simple min filter.
- *
- * Takes the min of the last <send_every> values and pushes it out every <send_every>.
- */
-class MinFilter : public Filter {
+template<size_t N> class MedianFilter : public MedianFilterBase {
  public:
-  /** Construct a MinFilter.
+  /** Construct a MedianFilter of the last N values.
    *
-   * @param window_size The number of values that the min should be returned from.
    * @param send_every After how many sensor values should a new one be pushed out.
    * @param send_first_at After how many values to forward the very first value. Defaults to the first value
    *   on startup being published on the first *raw* value, so with no filter applied. Must be less than or equal to
    *   send_every.
    */
-  explicit MinFilter(size_t window_size, size_t send_every, size_t send_first_at);
+  MedianFilter(size_t send_every, size_t send_first_at)
+      : MedianFilterBase(this->values_, this->sorted_, N, send_every, send_first_at) {}
 
+ protected:
+  float values_[N];
+  float sorted_[N];
+};
+
+/** Simple min filter.
+ *
+ * Takes the min of the last <window_size> values and pushes it out every <send_every>.
+ *
+ * The window is stored in the filter itself, see MinFilter.
+ */
+class MinFilterBase : public Filter {
+ public:
   optional<float> new_value(float value) override;
 
   void set_send_every(size_t send_every);
+  /// Set the number of values that the min should be returned from, at most the capacity of the filter.
   void set_window_size(size_t window_size);
 
  protected:
-  std::deque<float> queue_;
+  MinFilterBase(IndexedValue *entries, size_t capacity, size_t send_every, size_t send_first_at);
+
+  MinWindow window_;
   size_t send_every_;
   size_t send_at_;
-  size_t window_size_;
 };
 
-/** Simple max filter.
- *
- * Takes the max of the last <send_every> values and pushes it out every <send_every>.
- */
-class MaxFilter : public Filter {
+template<size_t N> class MinFilter : public MinFilterBase {
  public:
-  /** Construct a MaxFilter.
+  /** Construct a MinFilter of the last N values.
    *
-   * @param window_size The number of values that the max should be returned from.
    * @param send_every After how many sensor values should a new one be pushed out.
    * @param send_first_at After how many values to forward the very first value. Defaults to the first value
    *   on startup being published on the first *raw* value, so with no filter applied. Must be less than or equal to
    *   send_every.
    */
-  explicit MaxFilter(size_t window_size, size_t send_every, size_t send_first_at);
+  MinFilter(size_t send_every, size_t send_first_at) : MinFilterBase(this->entries_, N, send_every, send_first_at) {}
+
+ protected:
+  IndexedValue entries_[N];
+};
 
+/** Simple max filter.
+ *
+ * Takes the max of the last <window_size> values and pushes it out every <send_every>.
+ *
+ * The window is stored in the filter itself, see MaxFilter.
+ */
+class MaxFilterBase : public Filter {
+ public:
   optional<float> new_value(float value) override;
 
   void set_send_every(size_t send_every);
+  /// Set the number of values that the max should be returned from, at most the capacity of the filter.
   void set_window_size(size_t window_size);
 
  protected:
-  std::deque<float> queue_;
+  MaxFilterBase(IndexedValue *entries, size_t capacity, size_t send_every, size_t send_first_at);
+
+  MaxWindow window_;
   size_t send_every_;
   size_t send_at_;
-  size_t window_size_;
 };
 
-/** Simple sliding window moving average filter.
- *
- * Essentially just takes takes the average of the last window_size values and pushes them out
- * every send_every.
- */
-class SlidingWindowMovingAverageFilter : public Filter {
+template<size_t N> class MaxFilter : public MaxFilterBase {
  public:
-  /** Construct a SlidingWindowMovingAverageFilter.
+  /** Construct a MaxFilter of the last N values.
    *
-   * @param window_size The number of values that should be averaged.
    * @param send_every After how many sensor values should a new one be pushed out.
    * @param send_first_at After how many values to forward the very first value. Defaults to the first value
    *   on startup being published on the first *raw* value, so with no filter applied. Must be less than or equal to
    *   send_every.
    */
-  explicit SlidingWindowMovingAverageFilter(size_t window_size, size_t send_every, size_t send_first_at);
+  MaxFilter(size_t send_every, size_t send_first_at) : MaxFilterBase(this->entries_, N, send_every, send_first_at) {}
+
+ protected:
+  IndexedValue entries_[N];
+};
 
+/** Simple sliding window moving average filter.
+ *
+ * Essentially just takes takes the average of the last window_size values and pushes them out
+ * every send_every.
+ *
+ * The window is stored in the filter itself, see SlidingWindowMovingAverageFilter.
+ */
+class SlidingWindowMovingAverageFilterBase : public Filter {
+ public:
   optional<float> new_value(float value) override;
 
   void set_send_every(size_t send_every);
+  /// Set the number of values that should be averaged, at most the capacity of the filter.
   void set_window_size(size_t window_size);
 
  protected:
+  SlidingWindowMovingAverageFilterBase(float *values, size_t capacity, size_t send_every, size_t send_first_at);
+
   float sum_{0.0};
-  std::deque<float> queue_;
+  RingBuffer queue_;
   size_t send_every_;
   size_t send_at_;
   size_t window_size_;
 };
 
+template<size_t N> class SlidingWindowMovingAverageFilter : public SlidingWindowMovingAverageFilterBase {
+ public:
+  /** Construct a SlidingWindowMovingAverageFilter of the last N values.
+   *
+   * @param send_every After how many sensor values should a new one be pushed out.
+   * @param send_first_at After how many values to forward the very first value. Defaults to the first value
+   *   on startup being published on the first *raw* value, so with no filter applied. Must be less than or equal to
+   *   send_every.
+   */
+  SlidingWindowMovingAverageFilter(size_t send_every, size_t send_first_at)
+      : SlidingWindowMovingAverageFilterBase(this->values_, N, send_every, send_first_at) {}
+
+ protected:
+  float values_[N];
+};
+
 /** Simple exponential moving average filter.
  *
  * Essentially just takes the average of the last few values using exponentially decaying weights.
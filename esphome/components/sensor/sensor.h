@@ -90,7 +90,7 @@ class Sensor : public EntityBase {
    * sensor->add_filters({
    *   LambdaFilter([&](float value) -> optional<float> { return 42/value; }),
    *   OffsetFilter(1),
-   *   SlidingWindowMovingAverageFilter(15, 15), // average over last 15 values
+   *   SlidingWindowMovingAverageFilter<15>(15, 1), // average over last 15 values
    * });
    */
   void add_filters(const std::vector<Filter *> &filters);
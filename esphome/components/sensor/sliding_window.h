@@ -0,0 +1,172 @@
+#pragma once
+
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <cstring>
+#include <functional>
+
+namespace esphome {
+namespace sensor {
+
+/** The last values of a sensor in the order they arrived.
+ *
+ * The values are stored in memory provided by the owner, which is never reallocated.
+ */
+class RingBuffer {
+ public:
+  RingBuffer(float *data, size_t capacity) : data_(data), capacity_(capacity) {}
+
+  size_t size() const { return this->size_; }
+  size_t capacity() const { return this->capacity_; }
+  bool empty() const { return this->size_ == 0; }
+  bool full() const { return this->size_ == this->capacity_; }
+
+  /// The value at position i, 0 being the oldest value.
+  float operator[](size_t i) const { return this->data_[this->wrap_(this->head_ + i)]; }
+  float front() const { return this->data_[this->head_]; }
+
+  void pop_front() {
+    this->head_ = this->wrap_(this->head_ + 1);
+    this->size_--;
+  }
+  void push_back(float value) {
+    this->data_[this->wrap_(this->head_ + this->size_)] = value;
+    this->size_++;
+  }
+
+ protected:
+  // No modulo, integer division is slow on some of the targets
+  size_t wrap_(size_t i) const { return i >= this->capacity_ ? i - this->capacity_ : i; }
+
+  float *data_;
+  size_t capacity_;
+  size_t head_{0};
+  size_t size_{0};
+};
+
+/** The last values of a sensor, also kept sorted for order statistics such as the median.
+ *
+ * Once the window is full, adding a value removes the oldest one. Both are located with a binary
+ * search and the sorted values between are moved with memmove, which for the window sizes sensors
+ * use is faster than a tree.
+ *
+ * The window uses two arrays of `capacity` floats provided by the owner, its size can be
+ * changed up to that capacity.
+ */
+class SortedWindow {
+ public:
+  SortedWindow(float *values, float *sorted, size_t capacity)
+      : values_(values, capacity), sorted_(sorted), window_size_(capacity) {}
+
+  size_t size() const { return this->values_.size(); }
+  bool empty() const { return this->values_.empty(); }
+  size_t get_window_size() const { return this->window_size_; }
+
+  /// The value with the given rank, 0 being the smallest value.
+  float operator[](size_t rank) const { return this->sorted_[rank]; }
+
+  float median() const {
+    size_t size = this->size();
+    if (size % 2)
+      return this->sorted_[size / 2];
+    return (this->sorted_[size / 2] + this->sorted_[size / 2 - 1]) / 2.0f;
+  }
+
+  void push(float value) {
+    if (this->size() >= this->window_size_)
+      this->pop_oldest_();
+    float *begin = this->sorted_;
+    float *end = begin + this->size();
+    float *pos = std::upper_bound(begin, end, value);
+    std::memmove(pos + 1, pos, (end - pos) * sizeof(float));
+    *pos = value;
+    this->values_.push_back(value);
+  }
+
+  /// Change the size of the window (at most the capacity), keeping the newest values that fit.
+  void set_window_size(size_t window_size) {
+    this->window_size_ = std::min(window_size, this->values_.capacity());
+    while (this->size() > this->window_size_)
+      this->pop_oldest_();
+  }
+
+ protected:
+  void pop_oldest_() {
+    float *end = this->sorted_ + this->size();
+    float *oldest = std::lower_bound(this->sorted_, end, this->values_.front());
+    std::memmove(oldest, oldest + 1, (end - oldest - 1) * sizeof(float));
+    this->values_.pop_front();
+  }
+
+  RingBuffer values_;
+  float *sorted_;
+  size_t window_size_;
+};
+
+/// A value of a MonotonicWindow, with the number of the value in the sensor's stream.
+struct IndexedValue {
+  float value;
+  // Wraps around, only differences between indices are used
+  uint32_t index;
+};
+
+/** The minimum (or maximum) of the last values of a sensor, with amortized constant time updates.
+ *
+ * Only the values that can still become the extreme of the window are kept (a monotonic queue):
+ * every stored value is followed by newer ones that are all less extreme, so the first one is the
+ * extreme of the window.
+ *
+ * The window uses an array of `capacity` entries provided by the owner, its size can be changed
+ * up to that capacity.
+ */
+template<typename Compare> class MonotonicWindow {
+ public:
+  MonotonicWindow(IndexedValue *entries, size_t capacity)
+      : entries_(entries), capacity_(capacity), window_size_(capacity) {}
+
+  bool empty() const { return this->size_ == 0; }
+  size_t get_window_size() const { return this->window_size_; }
+  /// The extreme of the window.
+  float front() const { return this->entries_[this->head_].value; }
+
+  void push(float value) {
+    // The window always holds the newest value, so at most the front leaves it
+    if (this->size_ != 0 && this->count_ - this->entries_[this->head_].index >= this->window_size_)
+      this->pop_front_();
+    // Values that are not more extreme than the new one can't become the extreme anymore
+    while (this->size_ != 0 && !this->compare_(this->back_().value, value))
+      this->size_--;
+    this->entries_[this->wrap_(this->head_ + this->size_)] = IndexedValue{value, this->count_++};
+    this->size_++;
+  }
+
+  /// Change the size of the window (at most the capacity), keeping the newest values that fit.
+  void set_window_size(size_t window_size) {
+    this->window_size_ = std::min(window_size, this->capacity_);
+    while (this->size_ != 0 && this->count_ - this->entries_[this->head_].index > this->window_size_)
+      this->pop_front_();
+  }
+
+ protected:
+  size_t wrap_(size_t i) const { return i >= this->capacity_ ? i - this->capacity_ : i; }
+  const IndexedValue &back_() const { return this->entries_[this->wrap_(this->head_ + this->size_ - 1)]; }
+  void pop_front_() {
+    this->head_ = this->wrap_(this->head_ + 1);
+    this->size_--;
+  }
+
+  IndexedValue *entries_;
+  size_t capacity_;
+  size_t window_size_;
+  size_t head_{0};
+  size_t size_{0};
+  uint32_t count_{0};
+  Compare compare_;
+};
+
+using MinWindow = MonotonicWindow<std::less<float>>;
+using MaxWindow = MonotonicWindow<std::greater<float>>;
+
+}  // namespace sensor
+}  // namespace esphome
@@ -16,7 +16,7 @@ import esphome.codegen as cg
 
 from .gpio import zephyr_pin_to_code  # noqa
 from .const import (ZEPHYR_CORE_KEY, ZEPHYR_FRAMEWORK_DEFUALT_VERSION,
-                    ZEPHYR_BASE, KCONFIG_KEY, FLASH_ARGS)
+                    ZEPHYR_BASE, KCONFIG_KEY, FLASH_ARGS, SIGNING_KEY)
 
 from .zephyrManager import ZephyrManager
 
@@ -34,7 +34,8 @@ def set_core_data(config):
     manager = CORE.data[ZEPHYR_CORE_KEY] = ZephyrManager(config[CONF_BOARD],
                                                          config[ZEPHYR_BASE],
                                                          config[KCONFIG_KEY],
-                                                         config[FLASH_ARGS])
+                                                         config[FLASH_ARGS],
+                                                         config.get(SIGNING_KEY))
 
     now = datetime.now()
     version = f"{now.year-2000}.{now.month}.{now.day}+{now.hour if now.hour !=0 else ''}{now.minute:02d}{now.second:02d}"
@@ -182,7 +183,9 @@ CONFIG_SCHEMA = cv.All(
             cv.Required(ZEPHYR_BASE): cv.string_strict,
             cv.Optional(CONF_FRAMEWORK, default={}): ZEPHYR_FRAMEWORK_SCHEMA,
             cv.Optional(KCONFIG_KEY, default={}): cv.Any(dict),
-            cv.Required(FLASH_ARGS): cv.string_strict
+            cv.Required(FLASH_ARGS): cv.string_strict,
+            # MCUboot and the images are signed with it, created if it doesn't exist
+            cv.Optional(SIGNING_KEY): cv.string_strict,
         }
     ),
     set_core_data
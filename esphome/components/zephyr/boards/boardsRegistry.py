@@ -12,6 +12,8 @@ class _BoardsRegistry(UserDict):
             if name in self:
                 raise KeyError(f"Board {name} is already registered")
             self[name] = validator
+            # Keep the class in its module, pickle looks it up there
+            return validator
         return wrapped_registrer
 
 
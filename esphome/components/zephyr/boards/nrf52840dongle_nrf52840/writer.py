@@ -1,5 +1,6 @@
 import os
 from textwrap import dedent
+from esphome.helpers import write_file_if_changed
 from ...zephyr_writer import ZephyrDirectoryBuilder
 
 
@@ -19,8 +20,10 @@ class DongleDirectoryBuilder(ZephyrDirectoryBuilder):
         contents = self.manager.board.flash_mapping()
         contents = contents.replace("CODE_PARTITION", "newboot_partition")
         contents += CONTENTS
-        with open(os.path.join(self.boot_dir, "mcuboot", "boot", "zephyr", "dts.overlay"), "a") as f:
-            f.write(contents)
+        write_file_if_changed(
+            os.path.join(self.boot_dir, "mcuboot", "boot", "zephyr", "dts.overlay"),
+            self._read_mcuboot_file("dts.overlay") + contents,
+        )
 
     def createAppOverlay(self) -> None:
         contents = '\n'.join((CONTENTS, *self.manager.device_overlay_list))
@@ -34,5 +37,4 @@ class DongleDirectoryBuilder(ZephyrDirectoryBuilder):
                 };
             };
         """)
-        with open(os.path.join(self.proj_dir, "app.overlay"), "w") as f:
-            f.write(contents)
\ No newline at end of file
+        write_file_if_changed(os.path.join(self.proj_dir, "app.overlay"), contents)
\ No newline at end of file
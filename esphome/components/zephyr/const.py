@@ -6,6 +6,7 @@ KEY_BOARD = "board"
 ZEPHYR_BASE = "zephyr_base"
 KCONFIG_KEY = "Kconfigs"
 FLASH_ARGS = "flash_args"
+SIGNING_KEY = "signing_key"
 
 PROJ_DIR = "proj"
 BOOT_DIR = "boot"
@@ -1,78 +1,98 @@
+import json
+import logging
 import os
-import re
-import subprocess
+import time
 
-from typing import Union, Any
+from typing import Union, Any, Dict, Optional
 
-from esphome.util import run_external_process
-from esphome.core import CORE
+from esphome.const import ENV_MDNS_TIMEOUT
+from esphome.core import CORE, EsphomeError
+from esphome.helpers import write_file
 
-def get_flash_address() -> str:
-    from ipaddress import IPv6Address
-    from time import sleep
-    from zeroconf import ServiceBrowser, ServiceStateChange, Zeroconf
+# Thread devices keep their addresses, this only spares the mDNS round trip when
+# uploading again shortly after
+ADDRESS_CACHE_TTL = 300
+DEFAULT_MDNS_TIMEOUT = 3.0
 
-    def on_service_state_change(zeroconf, service_type, name, state_change):
-        if state_change is ServiceStateChange.Added:
-            zeroconf.get_service_info(service_type, name)
+_LOGGER = logging.getLogger(__name__)
 
-    zc = Zeroconf()
-    ServiceBrowser(zc, "_esphomelib._tcp.local.", handlers=[on_service_state_change])
-    sleep(1)
-    entry = zc.cache.entries_with_name(f'{CORE.name}.local.')
-    zc.close()
-    if entry:
-        for en in entry:
-            if hasattr(en, 'address'):
-                return str(IPv6Address(en.address))
-    raise RuntimeError("Cannont find address to use in net flashing")
+
+def _address_cache_path() -> str:
+    return CORE.relative_internal_path("zephyr_addresses.json")
+
+
+def _load_address_cache() -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(_address_cache_path(), encoding="utf-8") as f_handle:
+            cache = json.load(f_handle)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_address_cache(cache: Dict[str, Dict[str, Any]]) -> None:
+    try:
+        write_file(_address_cache_path(), json.dumps(cache, indent=2))
+    except EsphomeError:
+        # Only a cache
+        pass
+
+
+def _mdns_timeout() -> float:
+    value = os.getenv(ENV_MDNS_TIMEOUT)
+    if value is None:
+        return DEFAULT_MDNS_TIMEOUT
+    try:
+        timeout = float(value)
+    except ValueError:
+        timeout = -1.0
+    if not timeout > 0:
+        _LOGGER.warning("Invalid %s '%s', using %s seconds",
+                        ENV_MDNS_TIMEOUT, value, DEFAULT_MDNS_TIMEOUT)
+        return DEFAULT_MDNS_TIMEOUT
+    return timeout
+
+
+def forget_flash_address() -> None:
+    cache = _load_address_cache()
+    if cache.pop(CORE.name, None) is not None:
+        _save_address_cache(cache)
+
+
+def get_flash_address(timeout: Optional[float] = None) -> str:
+    from esphome.zeroconf import shared_zeroconf
+
+    cache = _load_address_cache()
+    entry = cache.get(CORE.name)
+    if entry and time.time() - entry.get("time", 0) < ADDRESS_CACHE_TTL:
+        return entry["address"]
+
+    if timeout is None:
+        timeout = _mdns_timeout()
+    try:
+        address = shared_zeroconf().resolve_host6(f"{CORE.name}.local.", timeout)
+    except Exception as err:
+        raise RuntimeError(f"Error resolving mDNS hostname: {err}") from err
+    if address is None:
+        raise RuntimeError("Cannont find address to use in net flashing")
+
+    cache[CORE.name] = {"address": address, "time": time.time()}
+    _save_address_cache(cache)
+    return address
 
 
 def net_upload(bootloader: bool, proj_dir: os.PathLike, address:str) -> Union[int, bytes, Any]:
+        from esphome.components.zephyr_ota.smp import run_smp_upload
+
         if not bootloader:
             print("Cannot use net flash if bootloader was not previously flashed")
             return 1
-        flash_args = ["mcumgr",
-                      "--conntype",
-                      "udp",
-                      f"--connstring=[{address}]:1337",
-                      "image",
-                      "upload",
-                      "-e",
-                      f"{os.path.join(proj_dir, 'build', 'zephyr' '/zephyr.signed.bin')}"
-                      ]
-        result = run_external_process(*flash_args)
+        # Upload, confirm and reset in one SMP session, instead of one mcumgr
+        # process (and connection) per step
+        result = run_smp_upload(
+            address, os.path.join(proj_dir, "build", "zephyr", "zephyr.signed.bin")
+        )
         if result != 0:
-            return result
-        list_args = ["mcumgr",
-                     "--conntype",
-                     "udp",
-                     f"--connstring=[{address}]:1337",
-                     "image",
-                     "list",
-                     ]
-        command = subprocess.run(list_args, capture_output=True)
-        if command.returncode != 0:
-            return command.returncode
-        output = command.stdout.decode()
-        hashes = re.findall(r"^.*hash[:] ([A-Za-z0-9]*)$", output, re.MULTILINE)
-        confirm_args = ["mcumgr",
-                        "--conntype",
-                        "udp",
-                        f"--connstring=[{address}]:1337",
-                        "image",
-                        "confirm",
-                        f"{hashes[-1]}"
-                        ]
-        value = run_external_process(*confirm_args)
-        if value != 0:
-            return value
-        restart_args = ["mcumgr",
-                        "--conntype",
-                        "udp",
-                        f"--connstring=[{address}]:1337",
-                        "reset"
-                        ]
-        value = run_external_process(*restart_args)
-
-        return value
\ No newline at end of file
+            # The device may have a new address
+            forget_flash_address()
+        return result
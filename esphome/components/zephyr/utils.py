@@ -22,4 +22,21 @@ def swap_build_path(path: str):
         CORE.build_path = path
         yield
     finally:
-        CORE.build_path = current_dir
\ No newline at end of file
+        CORE.build_path = current_dir
+
+
+@contextmanager
+def file_lock(path: Union[os.PathLike, str]):
+    """Hold an exclusive lock on path, for directories shared between builds."""
+    try:
+        import fcntl
+    except ImportError:
+        # No flock on Windows, builds of the same directory are not protected there
+        yield
+        return
+    with open(path, "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
@@ -1,6 +1,11 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import logging
 import os
+import subprocess
 
-from typing import MutableMapping, Any, Tuple, Union, Iterable, Mapping, Type
+from typing import MutableMapping, Any, Optional, Tuple, Union, Iterable, Mapping, Type
 from .zephyr_writer import ZephyrDirectoryBuilder
 
 import esphome.config_validation as cv
@@ -12,14 +17,22 @@ from esphome.util import run_external_process
 from .boards import registry, BaseZephyrBoard
 from .netUpload import net_upload
 from .const import PROJ_DIR, BOOT_DIR
-from .utils import at_location
+from .utils import at_location, file_lock
+
+_LOGGER = logging.getLogger(__name__)
+
+# Created in a shared bootloader dir once MCUboot was built there
+BOOTLOADER_DONE = "esphome_build_done"
+# The signing key of all devices without one of their own, in .esphome/
+SHARED_SIGNING_KEY = "zephyr_signing_key.pem"
 
 class ZephyrManager:
     def __init__(self,
                  board: str,
                  zephyr_base: str,
                  Kconfigs: MutableMapping[str, Any],
-                 flash_args: str
+                 flash_args: str,
+                 signing_key: Optional[str] = None
                  ) -> None:
         if board not in registry:
             raise cv.Invalid("Specified board does not appear to be a "
@@ -29,10 +42,22 @@ class ZephyrManager:
         self._zephyr_base = zephyr_base
         self.Kconfigs = Kconfigs
         self.flash_args = flash_args
+        self._signing_key = signing_key
         self.device_overlay_list = []
         self.add_Kconfig_vec((("CONFIG_SPI", "n"),
                               ("CONFIG_I2C", "n")))
 
+    def __eq__(self, other: object) -> bool:
+        # Validation compares CORE.data before and after validators run
+        if not isinstance(other, ZephyrManager):
+            return NotImplemented
+        return (type(self._board), self.board_name, self._zephyr_base,
+                self.Kconfigs, self.flash_args, self._signing_key,
+                self.device_overlay_list) == \
+               (type(other._board), other.board_name, other._zephyr_base,
+                other.Kconfigs, other.flash_args, other._signing_key,
+                other.device_overlay_list)
+
     @property
     def board(self) -> BaseZephyrBoard:
         return self._board
@@ -41,6 +66,21 @@ class ZephyrManager:
     def zephyr_base(self) -> str:
         return self._zephyr_base
 
+    @property
+    def signing_key(self) -> str:
+        """Return the key MCUboot checks the images with.
+
+        Devices share one key unless one is configured, so they can share the
+        bootloader build too. Devices that were set up with a key of their own
+        keep it, their bootloader doesn't accept images signed with another key.
+        """
+        if self._signing_key is not None:
+            return os.path.abspath(CORE.relative_config_path(self._signing_key))
+        device_key = os.path.abspath(CORE.relative_build_path(f"{CORE.name}.pem"))
+        if os.path.exists(device_key):
+            return device_key
+        return os.path.abspath(CORE.relative_internal_path(SHARED_SIGNING_KEY))
+
     def add_Kconfig(self,
                     config_name: str,
                     config_value: Union[str, int, float, bool]) -> None :
@@ -74,8 +114,8 @@ class ZephyrManager:
         if net_flash:
             return net_upload(bootloader, proj_dir, host)
 
-        # get the base path to the boot dir
-        boot_dir = os.path.abspath(CORE.relative_build_path(BOOT_DIR))
+        # get the base path to the (shared) boot dir
+        boot_dir = self.bootloader_dir()
 
         with at_location(self._zephyr_base):
             result = self.board.upload(self.flash_args, boot_dir, proj_dir,
@@ -85,49 +125,96 @@ class ZephyrManager:
     def get_writer(self) -> ZephyrDirectoryBuilder:
         return self.board.get_writer()
 
+    def bootloader_dir(self) -> str:
+        """Return the directory MCUboot is built in, its build is in build/.
+
+        The bootloader only depends on the board, the flash mapping, the signing
+        key and the MCUboot sources. So it is built in a directory shared by all
+        devices where those are the same, keyed by their hash.
+        """
+        boot_dir = os.path.abspath(CORE.relative_build_path(BOOT_DIR))
+        parts = [self.board_name, self.board.pre_compile_bootloader([])]
+        for path in (
+            # revision and hash of the MCUboot sources
+            os.path.join(boot_dir, "mcuboot.json"),
+            os.path.join(boot_dir, "mcuboot", "boot", "zephyr", "dts.overlay"),
+            self.signing_key,
+        ):
+            try:
+                with open(path, "rb") as f:
+                    parts.append(hashlib.sha256(f.read()).hexdigest())
+            except OSError:
+                # Not set up by the writer, build it for this device only
+                return boot_dir
+        key = hashlib.sha256(json.dumps(parts).encode()).hexdigest()[:16]
+        return os.path.abspath(CORE.relative_internal_path("zephyr_mcuboot", key))
+
+    def compile_bootloader(self, boot_dir: str) -> int:
+        """Build MCUboot in boot_dir, unless it was built there already."""
+        source_dir = os.path.abspath(
+            CORE.relative_build_path(BOOT_DIR, "mcuboot", "boot", "zephyr")
+        )
+        key_file = self.signing_key
+        done_path = os.path.join(boot_dir, BOOTLOADER_DONE)
+        os.makedirs(boot_dir, exist_ok=True)
+        with file_lock(os.path.join(boot_dir, "build.lock")):
+            if os.path.exists(done_path):
+                _LOGGER.info("Using MCUboot from %s", boot_dir)
+                return 0
+            _LOGGER.info("Building MCUboot in %s", boot_dir)
+            build_command = ["west",
+                             "build",
+                             "-b",
+                             self.board_name,
+                             "-p",
+                             "auto",
+                             "-d",
+                             os.path.join(boot_dir, "build"),
+                             source_dir,
+                             "--",
+                             f'-DCONFIG_BOOT_SIGNATURE_KEY_FILE="{key_file}"',
+                             ]
+            build_command = self.board.pre_compile_bootloader(build_command)
+            # Runs next to the application build, don't mix up their output
+            process = subprocess.run(build_command,
+                                     cwd=self._zephyr_base,
+                                     stdout=subprocess.PIPE,
+                                     stderr=subprocess.STDOUT,
+                                     check=False)
+            if process.returncode != 0 or CORE.verbose:
+                print(process.stdout.decode(errors="replace"))
+            if process.returncode != 0:
+                _LOGGER.error("Building MCUboot failed")
+                return process.returncode
+            if boot_dir != os.path.abspath(CORE.relative_build_path(BOOT_DIR)):
+                with open(done_path, "w") as f:
+                    f.write("")
+        return 0
+
     def compile(self):
         # get the base path to the project dir
         proj_dir = os.path.abspath(CORE.relative_build_path(PROJ_DIR))
-        # get the base path to the boot dir
-        boot_dir = os.path.abspath(CORE.relative_build_path(BOOT_DIR))
-        # get the path to the key file
-        key_file = os.path.abspath(CORE.relative_build_path(f"{CORE.name}.pem"))
         # check if the bootloader has been flashed already
         boot_info_path = os.path.abspath(CORE.relative_build_path("boot_flashed.info"))
         bootloader = os.path.exists(boot_info_path)
-        with at_location(self._zephyr_base):
-            os.environ['ZEPHYR_BASE'] = f"{self._zephyr_base}/zephyr"
-            # run the west build command
-            build_command = ["west",
-                            "build",
-                            "-b",
-                            self.board_name,
-                            "-p",
-                            "auto",
-                            "-d",
-                            os.path.join(proj_dir, "build"),
-                            os.path.join(proj_dir, str(CORE.name)),
-                            ]
-            build_command = self.board.pre_compile_application(build_command)
-            result = run_external_process(*build_command)
-
-            if result == 0 and not bootloader:
-                # build the boot loader
-                # run the west build command
-                build_command = ["west",
-                                "build",
-                                "-b",
-                                self.board_name,
-                                "-p",
-                                "auto",
-                                "-d",
-                                os.path.join(boot_dir, "build"),
-                                os.path.join(boot_dir, "mcuboot", "boot", "zephyr"),
-                                "--",
-                                f'-DCONFIG_BOOT_SIGNATURE_KEY_FILE="{key_file}"',
-                                ]
-                build_command = self.board.pre_compile_bootloader(build_command)
-
-                result = run_external_process(*build_command)
-
-        return result
\ No newline at end of file
+        os.environ['ZEPHYR_BASE'] = f"{self._zephyr_base}/zephyr"
+        # run the west build command
+        build_command = ["west",
+                        "build",
+                        "-b",
+                        self.board_name,
+                        "-p",
+                        "auto",
+                        "-d",
+                        os.path.join(proj_dir, "build"),
+                        os.path.join(proj_dir, str(CORE.name)),
+                        ]
+        build_command = self.board.pre_compile_application(build_command)
+        if bootloader:
+            return run_external_process(*build_command, cwd=self._zephyr_base)
+
+        # the boot loader doesn't depend on the application, build both at once
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            boot_result = executor.submit(self.compile_bootloader, self.bootloader_dir())
+            result = run_external_process(*build_command, cwd=self._zephyr_base)
+            return result or boot_result.result()
@@ -1,4 +1,6 @@
 from __future__ import annotations
+import hashlib
+import json
 import logging
 import os
 import shutil
@@ -10,7 +12,8 @@ from textwrap import dedent
 
 from esphome.core import CORE
 from .const import ZEPHYR_BASE, ZEPHYR_CORE_KEY, KCONFIG_KEY
-from esphome.helpers import mkdir_p
+from .utils import file_lock
+from esphome.helpers import mkdir_p, read_file, write_file_if_changed
 
 
 if TYPE_CHECKING:
@@ -40,7 +43,7 @@ class ZephyrDirectoryBuilder:
         self.zephyr_base = self.manager.zephyr_base
         self.proj_dir = CORE.relative_build_path(os.path.join(PROJ_DIR, CORE.name))
         self.boot_dir = CORE.relative_build_path(BOOT_DIR)
-        self.key_file = os.path.abspath(CORE.relative_build_path(f"{self.proj_name}.pem"))
+        self.key_file = self.manager.signing_key
 
     def __enter__(self) -> "ZephyrDirectoryBuilder":
         self._saved_build_path = CORE.build_path
@@ -83,12 +86,10 @@ class ZephyrDirectoryBuilder:
             target_sources(app PRIVATE ${{sources_SRC}})
             """  # noqa
         )
-        with open(os.path.join(self.proj_dir, "CMakeLists.txt"), "w") as f:
-            f.write(
-                cmakeStr.format(
-                    base_dir=self.zephyr_base, projName=self.proj_name
-                )
-            )
+        write_file_if_changed(
+            os.path.join(self.proj_dir, "CMakeLists.txt"),
+            cmakeStr.format(base_dir=self.zephyr_base, projName=self.proj_name),
+        )
 
     def createProjFile(self) -> None:
         self.manager.add_Kconfig_vec((
@@ -97,13 +98,16 @@ class ZephyrDirectoryBuilder:
         ))
         result = '\n'.join(f"{key}={value}"
                            for key, value in self.manager.Kconfigs.items())
-        with open(os.path.join(self.proj_dir, "prj.conf"), "w") as f:
-            f.write(result)
+        write_file_if_changed(os.path.join(self.proj_dir, "prj.conf"), result)
 
     def createAppOverlayBoot(self) -> None:
-        contents = self.manager.board.flash_mapping()
-        with open(os.path.join(self.boot_dir, "mcuboot", "boot", "zephyr", "dts.overlay"), "a") as f:
-            f.write(contents)
+        # Add to the overlay of the MCUboot sources, not to our own last version
+        contents = self._read_mcuboot_file("dts.overlay")
+        contents += self.manager.board.flash_mapping()
+        write_file_if_changed(
+            os.path.join(self.boot_dir, "mcuboot", "boot", "zephyr", "dts.overlay"),
+            contents,
+        )
 
                     #zephyr,console = &cdc_acm_uart0;
     def createAppOverlay(self) -> None:
@@ -130,40 +134,102 @@ class ZephyrDirectoryBuilder:
         contents += self.manager.board.flash_mapping()
         contents = '\n'.join((contents, *self.manager.device_overlay_list))
 
-        with open(os.path.join(self.proj_dir, "app.overlay"), "w") as f:
-            f.write(contents)
+        write_file_if_changed(os.path.join(self.proj_dir, "app.overlay"), contents)
 
     def setupBootloader(self):
-        # create the signing keys if one does not exist
-        if not os.path.exists(self.key_file):
-            keyProcessResults = subprocess.run(
-                [
-                    "imgtool",
-                    "keygen",
-                    "-k",
-                    self.key_file,
-                    "-t",
-                    "rsa-2048",
-                ]
-            )
-
-            if keyProcessResults.returncode != 0:
-                raise Exception("Problem createing signing key")
-
-            # protect the key from accidental deletion
-            os.chmod(self.key_file, mode=0o444)
-
-        # always copy the bootloader in case there is a new version
-        shutil.copytree(
-            os.path.join(self.zephyr_base, "bootloader", "mcuboot"),
-            os.path.join(f"{self.boot_dir}", "mcuboot"), dirs_exist_ok=True,
-            ignore=shutil.ignore_patterns(".git")
-        )
+        # create the signing key if one does not exist, once for all devices
+        # sharing it
+        mkdir_p(os.path.dirname(self.key_file))
+        with file_lock(f"{self.key_file}.lock"):
+            if not os.path.exists(self.key_file):
+                keyProcessResults = subprocess.run(
+                    [
+                        "imgtool",
+                        "keygen",
+                        "-k",
+                        self.key_file,
+                        "-t",
+                        "rsa-2048",
+                    ]
+                )
+
+                if keyProcessResults.returncode != 0:
+                    raise Exception("Problem createing signing key")
+
+                # protect the key from accidental deletion
+                os.chmod(self.key_file, mode=0o444)
+
+        self.syncBootloader()
 
         boot_config_path = os.path.join(self.boot_dir, "mcuboot", "boot", "zephyr", "prj.conf")
-        with open(boot_config_path, "a") as f:
-            config = 'CONFIG_BOOT_SIGNATURE_KEY_FILE="{}"\n'
-            f.write(config.format(os.path.abspath(self.key_file)))
+        config = 'CONFIG_BOOT_SIGNATURE_KEY_FILE="{}"\n'
+        write_file_if_changed(
+            boot_config_path,
+            self._read_mcuboot_file("prj.conf") + config.format(os.path.abspath(self.key_file)),
+        )
+
+    @property
+    def mcuboot_dir(self) -> str:
+        return os.path.join(self.zephyr_base, "bootloader", "mcuboot")
+
+    def _read_mcuboot_file(self, name: str) -> str:
+        path = os.path.join(self.mcuboot_dir, "boot", "zephyr", name)
+        return read_file(path) if os.path.isfile(path) else ""
+
+    def syncBootloader(self) -> None:
+        """Copy the MCUboot sources, but only if they changed since the last copy.
+
+        Copying the whole tree changes the modification time of every file, which
+        makes west reconfigure and rebuild the bootloader.
+        """
+        stamp_path = os.path.join(self.boot_dir, "mcuboot.json")
+        stamp = {
+            "source": self.mcuboot_dir,
+            "revision": git_revision(self.mcuboot_dir),
+            "hash": tree_hash(self.mcuboot_dir),
+        }
+        dest = os.path.join(self.boot_dir, "mcuboot")
+        try:
+            with open(stamp_path, encoding="utf-8") as f:
+                if json.load(f) == stamp and os.path.isdir(dest):
+                    return
+        except (OSError, ValueError):
+            pass
+
+        _LOGGER.info("Copying MCUboot %s", stamp["revision"] or self.mcuboot_dir)
+        # start from scratch, so files removed upstream don't stay around
+        shutil.rmtree(dest, ignore_errors=True)
+        shutil.copytree(self.mcuboot_dir, dest, ignore=shutil.ignore_patterns(".git"))
+        write_file_if_changed(stamp_path, json.dumps(stamp))
+
+
+def git_revision(path: str) -> str | None:
+    """Return the checked out git commit of path, if it is a git repository."""
+    if not os.path.exists(os.path.join(path, ".git")):
+        return None
+    try:
+        result = subprocess.run(
+            ["git", "-C", path, "rev-parse", "HEAD"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.decode().strip()
+
+
+def tree_hash(path: str) -> str:
+    """Hash the names, sizes and modification times of all files below path."""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d != ".git")
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            stat = os.stat(file_path)
+            rel_path = os.path.relpath(file_path, path)
+            digest.update(f"{rel_path}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
 
 
             #const struct device *dev = DEVICE_DT_GET(DT_CHOSEN(zephyr_console));
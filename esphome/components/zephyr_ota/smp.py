@@ -0,0 +1,469 @@
+"""Minimal mcumgr SMP client over UDP, for uploading images to Zephyr devices.
+
+Implements the parts of the Simple Management Protocol that are needed for an OTA
+update: image upload, image confirm and reset, all within a single UDP session.
+Image chunks are sent pipelined, with a window sized after the SMP buffers the
+device reports.
+"""
+import asyncio
+import hashlib
+import logging
+import struct
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from esphome.core import EsphomeError
+
+_LOGGER = logging.getLogger(__name__)
+
+SMP_UDP_PORT = 1337
+
+MGMT_OP_READ = 0
+MGMT_OP_READ_RSP = 1
+MGMT_OP_WRITE = 2
+MGMT_OP_WRITE_RSP = 3
+
+MGMT_GROUP_ID_OS = 0
+MGMT_GROUP_ID_IMAGE = 1
+
+OS_MGMT_ID_RESET = 5
+OS_MGMT_ID_MCUMGR_PARAMS = 6
+IMG_MGMT_ID_STATE = 0
+IMG_MGMT_ID_UPLOAD = 1
+
+MGMT_ERRORS = {
+    1: "unknown error",
+    2: "out of memory",
+    3: "invalid argument",
+    4: "timeout",
+    5: "no such entry",
+    6: "bad state",
+    7: "message too large",
+    8: "not supported",
+    9: "corrupt",
+}
+
+# op, flags, payload length, group, sequence number, command
+SMP_HEADER = struct.Struct(">BBHHBB")
+
+# CONFIG_MCUMGR_BUF_SIZE and CONFIG_MCUMGR_BUF_COUNT defaults, for devices that
+# can't report their parameters
+DEFAULT_BUF_SIZE = 384
+DEFAULT_BUF_COUNT = 4
+# IPv6 minimum MTU minus the IPv6 and UDP headers
+MAX_UDP_PAYLOAD = 1232
+MAX_WINDOW = 8
+
+REQUEST_TIMEOUT = 2.0
+REQUEST_RETRIES = 5
+# The first upload request erases the whole image slot before it is answered
+ERASE_TIMEOUT = 30.0
+
+IMAGE_MAGIC = 0x96F3B83D
+IMAGE_TLV_INFO_MAGIC = 0x6907
+IMAGE_TLV_SHA256 = 0x10
+
+
+class SMPError(EsphomeError):
+    pass
+
+
+def _cbor_head(major: int, value: int) -> bytes:
+    if value < 24:
+        return bytes([major << 5 | value])
+    for info, fmt in ((24, ">B"), (25, ">H"), (26, ">I"), (27, ">Q")):
+        try:
+            return bytes([major << 5 | info]) + struct.pack(fmt, value)
+        except struct.error:
+            continue
+    raise ValueError(f"Integer {value} too large for CBOR")
+
+
+def cbor_encode(value: Any) -> bytes:
+    """Encode the subset of CBOR used by SMP: ints, bytes, str, lists and dicts."""
+    if value is False:
+        return b"\xf4"
+    if value is True:
+        return b"\xf5"
+    if value is None:
+        return b"\xf6"
+    if isinstance(value, int):
+        if value < 0:
+            return _cbor_head(1, -1 - value)
+        return _cbor_head(0, value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return _cbor_head(2, len(value)) + bytes(value)
+    if isinstance(value, str):
+        data = value.encode("utf-8")
+        return _cbor_head(3, len(data)) + data
+    if isinstance(value, (list, tuple)):
+        return _cbor_head(4, len(value)) + b"".join(map(cbor_encode, value))
+    if isinstance(value, dict):
+        return _cbor_head(5, len(value)) + b"".join(
+            cbor_encode(k) + cbor_encode(v) for k, v in value.items()
+        )
+    raise ValueError(f"Can't encode {type(value).__name__} as CBOR")
+
+
+class _CBORDecoder:
+    BREAK = object()
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.pos = 0
+
+    def read(self, size: int) -> bytes:
+        if self.pos + size > len(self.data):
+            raise ValueError("Truncated CBOR data")
+        result = self.data[self.pos : self.pos + size]
+        self.pos += size
+        return result
+
+    def decode(self) -> Any:
+        (initial,) = self.read(1)
+        major, info = initial >> 5, initial & 0x1F
+        if major == 7:
+            return self._simple(info)
+        if info == 31:
+            return self._indefinite(major)
+        value = self._argument(info)
+        if major == 0:
+            return value
+        if major == 1:
+            return -1 - value
+        if major == 2:
+            return self.read(value)
+        if major == 3:
+            return self.read(value).decode("utf-8")
+        if major == 4:
+            return [self.decode() for _ in range(value)]
+        if major == 5:
+            return {self.decode(): self.decode() for _ in range(value)}
+        # major 6, a tag. Only the tagged value is of interest
+        return self.decode()
+
+    def _argument(self, info: int) -> int:
+        if info < 24:
+            return info
+        if info > 27:
+            raise ValueError(f"Invalid CBOR additional information {info}")
+        (value,) = struct.unpack(
+            (">B", ">H", ">I", ">Q")[info - 24], self.read(1 << (info - 24))
+        )
+        return value
+
+    def _simple(self, info: int) -> Any:
+        if info == 31:
+            return self.BREAK
+        if info in (25, 26, 27):
+            size = 1 << (info - 24)
+            (value,) = struct.unpack((">e", ">f", ">d")[info - 25], self.read(size))
+            return value
+        return {20: False, 21: True, 22: None, 23: None}.get(info)
+
+    def _items(self):
+        while True:
+            item = self.decode()
+            if item is self.BREAK:
+                return
+            yield item
+
+    def _indefinite(self, major: int) -> Any:
+        if major == 2:
+            return b"".join(self._items())
+        if major == 3:
+            return "".join(self._items())
+        if major == 4:
+            return list(self._items())
+        if major == 5:
+            items = list(self._items())
+            return dict(zip(items[::2], items[1::2]))
+        raise ValueError(f"Invalid indefinite length CBOR major type {major}")
+
+
+def cbor_decode(data: bytes) -> Any:
+    try:
+        return _CBORDecoder(data).decode()
+    except (struct.error, UnicodeDecodeError) as err:
+        raise ValueError(f"Invalid CBOR data: {err}") from err
+
+
+def image_hash(image: bytes) -> bytes:
+    """Return the SHA-256 hash of a signed MCUboot image.
+
+    That is the hash stored in the TLV area of the image, which is also what the
+    device uses to identify the image (and what `mcumgr image list` shows).
+    """
+    try:
+        magic, _, hdr_size, protect_tlv_size, img_size = struct.unpack_from(
+            "<IIHHI", image
+        )
+        if magic != IMAGE_MAGIC:
+            raise SMPError("Not a signed MCUboot image")
+        offset = hdr_size + img_size + protect_tlv_size
+        tlv_magic, tlv_total = struct.unpack_from("<HH", image, offset)
+        if tlv_magic != IMAGE_TLV_INFO_MAGIC:
+            raise SMPError("MCUboot image has no TLV area")
+        end = offset + tlv_total
+        offset += 4
+        while offset < end:
+            tlv_type, tlv_len = struct.unpack_from("<HH", image, offset)
+            offset += 4
+            if tlv_type == IMAGE_TLV_SHA256:
+                return bytes(image[offset : offset + tlv_len])
+            offset += tlv_len
+    except struct.error as err:
+        raise SMPError(f"Invalid MCUboot image: {err}") from err
+    raise SMPError("MCUboot image has no SHA-256 hash")
+
+
+class _SMPProtocol(asyncio.DatagramProtocol):
+    def __init__(self, client: "SMPClient"):
+        self._client = client
+
+    def datagram_received(self, data, addr):
+        self._client.response_received(data)
+
+    def error_received(self, exc):
+        # For example ICMP port unreachable, the request is retried anyway
+        _LOGGER.debug("SMP socket error: %s", exc)
+
+
+class SMPClient:
+    """An SMP session with a device, used as async context manager."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int = SMP_UDP_PORT,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.timeout = REQUEST_TIMEOUT if timeout is None else timeout
+        self.retries = REQUEST_RETRIES if retries is None else retries
+        self._transport = None
+        self._seq = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+
+    async def __aenter__(self) -> "SMPClient":
+        loop = asyncio.get_running_loop()
+        try:
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: _SMPProtocol(self), remote_addr=(self.host, self.port)
+            )
+        except OSError as err:
+            raise SMPError(f"Could not connect to {self.host}: {err}") from err
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        self._transport.close()
+
+    def response_received(self, data: bytes) -> None:
+        if len(data) < SMP_HEADER.size:
+            return
+        _, _, length, _, seq, _ = SMP_HEADER.unpack_from(data)
+        future = self._pending.get(seq)
+        if future is None or future.done():
+            # Answer to a retried request
+            return
+        try:
+            future.set_result(
+                cbor_decode(data[SMP_HEADER.size : SMP_HEADER.size + length])
+            )
+        except ValueError as err:
+            future.set_exception(SMPError(f"Invalid SMP response: {err}"))
+
+    async def request(
+        self,
+        op: int,
+        group: int,
+        command: int,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Send a request and return the response, retrying it on timeouts."""
+        seq = self._seq
+        self._seq = (seq + 1) % 256
+        body = cbor_encode(payload)
+        packet = SMP_HEADER.pack(op, 0, len(body), group, seq, command) + body
+        future = asyncio.get_running_loop().create_future()
+        self._pending[seq] = future
+        try:
+            for _ in range(1 + (self.retries if retries is None else retries)):
+                self._transport.sendto(packet)
+                try:
+                    response = await asyncio.wait_for(
+                        asyncio.shield(future), timeout or self.timeout
+                    )
+                    break
+                except asyncio.TimeoutError:
+                    continue
+            else:
+                raise SMPError(f"No response from {self.host}")
+        finally:
+            del self._pending[seq]
+
+        if not isinstance(response, dict):
+            raise SMPError(f"Invalid SMP response to {group}/{command}: {response!r}")
+        rc = response.get("rc", 0)
+        if rc:
+            raise SMPError(
+                f"Request {group}/{command} failed with error {rc}: "
+                f"{MGMT_ERRORS.get(rc, 'unknown error')}"
+            )
+        return response
+
+    async def read_params(self) -> Tuple[int, int]:
+        """Return the size and number of the SMP buffers of the device."""
+        try:
+            response = await self.request(
+                MGMT_OP_READ, MGMT_GROUP_ID_OS, OS_MGMT_ID_MCUMGR_PARAMS, {}, retries=1
+            )
+            return int(response["buf_size"]), int(response["buf_count"])
+        except (SMPError, KeyError, TypeError, ValueError):
+            # Older devices don't support the parameters command
+            return DEFAULT_BUF_SIZE, DEFAULT_BUF_COUNT
+
+    async def upload(
+        self,
+        image: bytes,
+        progress: Optional[Callable[[float], None]] = None,
+        mtu: Optional[int] = None,
+    ) -> None:
+        """Upload image to the secondary slot of the device."""
+        buf_size, buf_count = await self.read_params()
+        mtu = min(mtu or buf_size, buf_size, MAX_UDP_PAYLOAD)
+        # Leave one buffer of the device for the response
+        window = max(1, min(buf_count - 1, MAX_WINDOW))
+        sha = hashlib.sha256(image).digest()
+
+        def chunk(offset: int) -> Dict[str, Any]:
+            payload: Dict[str, Any] = {"off": offset, "data": b""}
+            if offset == 0:
+                payload.update(len=len(image), sha=sha)
+            # +2, the length of data takes up to 2 more bytes once it isn't empty
+            overhead = SMP_HEADER.size + len(cbor_encode(payload)) + 2
+            if overhead >= mtu:
+                raise SMPError(f"SMP buffer size {mtu} is too small")
+            payload["data"] = image[offset : offset + mtu - overhead]
+            return payload
+
+        async def upload_request(payload, **kwargs) -> int:
+            """Send a chunk, return the offset the device expects next."""
+            response = await self.request(
+                MGMT_OP_WRITE,
+                MGMT_GROUP_ID_IMAGE,
+                IMG_MGMT_ID_UPLOAD,
+                payload,
+                **kwargs,
+            )
+            expected = response.get("off")
+            if not isinstance(expected, int) or isinstance(expected, bool):
+                raise SMPError(f"Invalid image upload response: {response!r}")
+            return expected
+
+        # Offset 0 (re)starts the upload, it must not be sent again once the device
+        # started receiving the image. So it is never pipelined.
+        acked = await upload_request(chunk(0), timeout=ERASE_TIMEOUT, retries=2)
+        offset = acked
+        # In flight requests, with their start and end offset
+        pending: Dict[asyncio.Future, Tuple[int, int]] = {}
+        try:
+            while acked < len(image):
+                while offset < len(image) and len(pending) < window:
+                    payload = chunk(offset)
+                    end = offset + len(payload["data"])
+                    pending[asyncio.ensure_future(upload_request(payload))] = (
+                        offset,
+                        end,
+                    )
+                    offset = end
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    # The offset the device expects next
+                    expected = task.result()
+                    _, end = pending.pop(task)
+                    if expected > acked:
+                        acked = expected
+                        if progress is not None:
+                            progress(acked / len(image))
+                    in_flight = {start for start, _ in pending.values()}
+                    if (
+                        expected < end
+                        and expected < offset
+                        and expected not in in_flight
+                    ):
+                        # An earlier chunk was lost, the device dropped this one.
+                        # Continue from where the device is.
+                        offset = max(expected, acked)
+        finally:
+            for task in pending:
+                task.cancel()
+            # Retrieve the errors of the other requests, only the first one is raised
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def image_state(self) -> List[Dict[str, Any]]:
+        response = await self.request(
+            MGMT_OP_READ, MGMT_GROUP_ID_IMAGE, IMG_MGMT_ID_STATE, {}
+        )
+        return response.get("images", [])
+
+    async def confirm(self, image_sha: bytes) -> None:
+        await self.request(
+            MGMT_OP_WRITE,
+            MGMT_GROUP_ID_IMAGE,
+            IMG_MGMT_ID_STATE,
+            {"hash": image_sha, "confirm": True},
+        )
+
+    async def reset(self) -> None:
+        try:
+            await self.request(MGMT_OP_WRITE, MGMT_GROUP_ID_OS, OS_MGMT_ID_RESET, {})
+        except SMPError as err:
+            # The device may already be restarting before the response got out
+            _LOGGER.warning("No confirmation for the reset request: %s", err)
+
+
+async def upload_image(
+    host: str,
+    filename: str,
+    port: int = SMP_UDP_PORT,
+    progress: Optional[Callable[[float], None]] = None,
+) -> None:
+    """Upload, confirm and boot a signed image, in a single SMP session."""
+    with open(filename, "rb") as f_handle:
+        image = f_handle.read()
+    image_sha = image_hash(image)
+
+    async with SMPClient(host, port) as client:
+        start = time.perf_counter()
+        await client.upload(image, progress)
+        duration = time.perf_counter() - start
+        _LOGGER.info(
+            "Uploaded %.1f KiB in %.1fs (%.1f KiB/s)",
+            len(image) / 1024,
+            duration,
+            len(image) / 1024 / duration,
+        )
+        await client.confirm(image_sha)
+        await client.reset()
+
+
+def run_smp_upload(host: str, filename: str, port: int = SMP_UDP_PORT) -> int:
+    from esphome.espota2 import ProgressBar
+
+    progress = ProgressBar()
+    try:
+        asyncio.run(upload_image(host, filename, port, progress.update))
+    except (SMPError, OSError) as err:
+        _LOGGER.error("Uploading to %s failed: %s", host, err)
+        return 1
+    finally:
+        progress.done()
+    _LOGGER.info("Upload successful, restarting %s", host)
+    return 0
@@ -1,15 +1,17 @@
 import abc
+import copy
 import functools
 import heapq
 import logging
 import re
+from collections.abc import MutableMapping
 
 # pylint: disable=unused-import, wrong-import-order
 from contextlib import contextmanager
 
 import voluptuous as vol
 
-from esphome import core, yaml_util, loader
+from esphome import config_cache, core, yaml_util, loader
 import esphome.core.config as core_config
 from esphome.const import (
     CONF_ESPHOME,
@@ -23,9 +25,14 @@ from esphome.core import CORE, EsphomeError
 from esphome.helpers import indent
 from esphome.util import safe_print, OrderedDict
 
-from typing import List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 from esphome.loader import get_component, get_platform, ComponentManifest
-from esphome.yaml_util import is_secret, ESPHomeDataBase, ESPForceValue
+from esphome.yaml_util import (
+    is_secret,
+    make_data_base,
+    ESPHomeDataBase,
+    ESPForceValue,
+)
 from esphome.voluptuous_schema import ExtraKeysInvalid
 from esphome.log import color, Fore
 import esphome.final_validate as fv
@@ -96,6 +103,8 @@ class Config(OrderedDict, fv.FinalValidateConfig):
         self._validation_tasks: List[_ValidationStepTask] = []
         # ID to ensure stable order for keys with equal priority
         self._validation_tasks_id = 0
+        # Session to reuse validated fragments from, if any
+        self.session = None  # type: Optional[ValidationSession]
 
     def add_error(self, error):
         # type: (vol.Invalid) -> None
@@ -472,6 +481,7 @@ class SchemaValidationStep(ConfigValidationStep):
     def __init__(
         self, domain: str, path: ConfigPath, conf: ConfigType, comp: ComponentManifest
     ):
+        self.domain = domain
         self.path = path
         self.conf = conf
         self.comp = comp
@@ -479,6 +489,28 @@ class SchemaValidationStep(ConfigValidationStep):
     def run(self, result: Config) -> None:
         if self.comp.config_schema is None:
             return
+        session = result.session
+        if session is None or self.domain in ValidationSession.CONTEXT_DOMAINS:
+            self._validate(result)
+        else:
+            key, validated = session.lookup(self.path, self.comp, self.conf)
+            if validated is not None:
+                result.set_by_path(self.path, validated)
+            else:
+                num_errors = len(result.errors)
+                data = CORE.data
+                CORE.data = accessed = _AccessedCoreData(data)
+                try:
+                    self._validate(result)
+                finally:
+                    CORE.data = data
+                # Validators changing CORE.data have to run every time
+                if len(result.errors) == num_errors and not accessed.changed():
+                    session.store(self.path, key, result.get_nested_item(self.path))
+
+        result.add_validation_step(FinalValidateValidationStep(self.path, self.comp))
+
+    def _validate(self, result: Config) -> None:
         with result.catch_error(self.path):
             if self.comp.is_platform:
                 # Remove 'platform' key for validation
@@ -497,7 +529,77 @@ class SchemaValidationStep(ConfigValidationStep):
                 validated = schema(self.conf)
                 result.set_by_path(self.path, validated)
 
-        result.add_validation_step(FinalValidateValidationStep(self.path, self.comp))
+
+_MISSING = object()
+
+
+class _AccessedCoreData(MutableMapping):
+    """CORE.data while a fragment is validated, to find out if the validators change it.
+
+    Only the domains (top-level keys) the validators access are copied, on first
+    access, instead of all of CORE.data.
+    """
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._data = data
+        # Copy of each accessed domain, _MISSING for domains that didn't exist
+        self._copies = {}  # type: Dict[str, Any]
+        self._iterated = False
+
+    def _access(self, key: str) -> None:
+        if key not in self._copies:
+            self._copies[key] = (
+                copy.deepcopy(self._data[key]) if key in self._data else _MISSING
+            )
+
+    def __getitem__(self, key):
+        self._access(key)
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._access(key)
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        self._access(key)
+        del self._data[key]
+
+    def __iter__(self):
+        # All domains can be accessed through the iterator
+        self._iterated = True
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def changed(self) -> bool:
+        """Return whether the validators may have changed CORE.data."""
+        if self._iterated:
+            return True
+        return any(
+            self._data.get(key, _MISSING) != value
+            for key, value in self._copies.items()
+        )
+
+
+class _UsedIDs:
+    """Incrementally maintained set of ID names that automatic IDs must not use."""
+
+    def __init__(self, declared: Iterable[str]) -> None:
+        self._used = set(declared) | set(cv.RESERVED_IDS) | CORE.loaded_integrations
+        # First suffix that may still be free for each preferred name
+        self._tries = {}  # type: Dict[str, int]
+
+    def add_unique(self, preferred: str) -> str:
+        """Same result as ensure_unique_string(), and mark the name as used."""
+        tries = self._tries.get(preferred, 1)
+        name = preferred if tries == 1 else f"{preferred}_{tries}"
+        while name in self._used:
+            tries += 1
+            name = f"{preferred}_{tries}"
+        self._tries[preferred] = tries
+        self._used.add(name)
+        return name
 
 
 class IDPassValidationStep(ConfigValidationStep):
@@ -526,36 +628,65 @@ class IDPassValidationStep(ConfigValidationStep):
             return
 
         searching_ids = []  # type: List[Tuple[core.ID, ConfigPath]]
+        # First declaration for each ID name
+        declared_by_name = {}  # type: Dict[str, Tuple[core.ID, ConfigPath]]
         for id, path in iter_ids(result):
             if id.is_declaration:
                 if id.id is not None:
                     # Look for duplicate definitions
-                    match = next(
-                        (v for v in result.declare_ids if v[0].id == id.id), None
-                    )
+                    match = declared_by_name.get(id.id)
                     if match is not None:
                         opath = "->".join(str(v) for v in match[1])
                         result.add_str_error(
                             f"ID {id.id} redefined! Check {opath}", path
                         )
                         continue
+                    declared_by_name[id.id] = (id, path)
                 result.declare_ids.append((id, path))
             else:
                 searching_ids.append((id, path))
 
         # Resolve default ids after manual IDs
-        for id, _ in result.declare_ids:
-            id.resolve([v[0].id for v in result.declare_ids])
-            if isinstance(id.type, MockObjClass) and id.type.inherits_from(Component):
-                CORE.component_ids.add(id.id)
+        used_ids = _UsedIDs(declared_by_name)
+        # Declared IDs (with their declaration index) by the type key of their type
+        declared_by_type = {}  # type: Dict[str, List[Tuple[int, core.ID]]]
+        # Representative type object for each key in declared_by_type
+        declared_types = {}  # type: Dict[str, MockObjClass]
+        for i, (id, path) in enumerate(result.declare_ids):
+            if id.id is None:
+                id.id = used_ids.add_unique(id.auto_id_base)
+                declared_by_name[id.id] = (id, path)
+            if isinstance(id.type, MockObjClass):
+                type_key = id.type.type_key
+                declared_by_type.setdefault(type_key, []).append((i, id))
+                declared_types.setdefault(type_key, id.type)
+        for type_key, type_ids in declared_by_type.items():
+            if declared_types[type_key].inherits_from(Component):
+                CORE.component_ids.update(v[1].id for v in type_ids)
+
+        # Declared IDs that can be used for an automatic ID, by searched type
+        candidates = {}  # type: Dict[str, List[core.ID]]
+
+        def find_candidates(type_: MockObjClass) -> List[core.ID]:
+            key = type_.type_key
+            if key not in candidates:
+                found = [
+                    v
+                    for type_key, type_ids in declared_by_type.items()
+                    if declared_types[type_key].inherits_from(type_)
+                    for v in type_ids
+                ]
+                # Keep declaration order
+                candidates[key] = [v[1] for v in sorted(found, key=lambda v: v[0])]
+            return candidates[key]
+
+        manual_ids = None  # type: Optional[List[str]]
 
         # Check searched IDs
         for id, path in searching_ids:
             if id.id is not None:
                 # manually declared
-                match = next(
-                    (v[0] for v in result.declare_ids if v[0].id == id.id), None
-                )
+                match = declared_by_name.get(id.id, (None,))[0]
                 if match is None or not match.is_manual:
                     # No declared ID with this name
                     import difflib
@@ -565,9 +696,11 @@ class IDPassValidationStep(ConfigValidationStep):
                         "an ID with that name in your configuration."
                     )
                     # Find candidates
-                    matches = difflib.get_close_matches(
-                        id.id, [v[0].id for v in result.declare_ids if v[0].is_manual]
-                    )
+                    if manual_ids is None:
+                        manual_ids = [
+                            v[0].id for v in result.declare_ids if v[0].is_manual
+                        ]
+                    matches = difflib.get_close_matches(id.id, manual_ids)
                     if matches:
                         matches_s = ", ".join(f'"{x}"' for x in matches)
                         error += f" These IDs look similar: {matches_s}."
@@ -585,13 +718,7 @@ class IDPassValidationStep(ConfigValidationStep):
                     )
 
             if id.id is None and id.type is not None:
-                matches = []
-                for v in result.declare_ids:
-                    if v[0] is None or not isinstance(v[0].type, MockObjClass):
-                        continue
-                    inherits = v[0].type.inherits_from(id.type)
-                    if inherits:
-                        matches.append(v[0])
+                matches = find_candidates(id.type)
 
                 if len(matches) == 0:
                     result.add_str_error(
@@ -647,8 +774,184 @@ class FinalValidateValidationStep(ConfigValidationStep):
         fv.full_config.reset(token)
 
 
-def validate_config(config, command_line_substitutions):
+def _fragment_key(value, with_ranges=True):
+    """Return a hashable key that is equal for equal raw config fragments.
+
+    With with_ranges, the fragments also have to come from the same position in the
+    same document, so that errors are reported at the right place.
+    """
+    if with_ranges:
+        esp_range = getattr(value, "esp_range", None)
+        if esp_range is not None:
+            start, end = esp_range.start_mark, esp_range.end_mark
+            mark = (start.document, start.line, start.column, end.line, end.column)
+            mark += (value.content_offset,)
+        else:
+            mark = None
+    else:
+        mark = None
+    if isinstance(value, dict):
+        items = tuple(
+            (_fragment_key(k, with_ranges), _fragment_key(v, with_ranges))
+            for k, v in value.items()
+        )
+        return type(value), mark, items
+    if isinstance(value, list):
+        return type(value), mark, tuple(_fragment_key(v, with_ranges) for v in value)
+    if isinstance(value, core.Lambda):
+        return type(value), mark, value.value
+    try:
+        hash(value)
+    except TypeError:
+        # Never equal to another key
+        return object()
+    return type(value), mark, value
+
+
+def _copy_fragment(value):
+    """Copy everything in a validated config fragment that the ID pass may change."""
+    if isinstance(value, dict):
+        res = copy.copy(value)
+        for key, item in res.items():
+            res[key] = _copy_fragment(item)
+        return res
+    if isinstance(value, list):
+        res = copy.copy(value)
+        for i, item in enumerate(res):
+            res[i] = _copy_fragment(item)
+        return res
+    if isinstance(value, core.ID):
+        return copy.copy(value)
+    if isinstance(value, core.Lambda):
+        # Don't share the IDs the lambda requires
+        res = core.Lambda(value)
+        if isinstance(value, ESPHomeDataBase):
+            res = make_data_base(res, value)
+        return res
+    return value
+
+
+def _raw_fragment(config: ConfigType, path: ConfigPath) -> Any:
+    """Return the fragment at path of a config before validation, None if missing."""
+    value = config
+    for part in path:
+        if isinstance(part, int) and not isinstance(value, list):
+            # A single platform entry, validated as a list of one
+            value = [value]
+        try:
+            value = value[part]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return value
+
+
+class ValidationSession:
+    """Keeps schema validated config fragments across validations of a config.
+
+    The vscode/dashboard editor validates the same config on every change, a config
+    fragment that didn't change since the last validation (including its position in
+    the document) is not validated against its schema again. The ID pass and final
+    validation always run on the whole config, so they pick up changes in the IDs a
+    fragment refers to.
+
+    Fragments that refer to an ID declared by a changed or removed fragment (directly
+    or through other fragments) are validated again too, using the IDs of the last
+    validation.
+    """
+
+    # The fragments all other fragments are validated in the context of, all cached
+    # fragments are dropped when they change
+    CONTEXT_DOMAINS = (CONF_ESPHOME, *TARGET_PLATFORMS)
+
+    def __init__(self) -> None:
+        self._context = None
+        self._config = None  # type: Optional[ConfigType]
+        # Last (key, validated fragment) by config path
+        self._fragments = {}  # type: Dict[Tuple, Tuple[Any, ConfigFragmentType]]
+        # Key of the raw fragment of every path validated in the last validation
+        self._sources = {}  # type: Dict[Tuple, Any]
+        # (raw fragment, key) by path in the config being validated
+        self._raw_keys = {}  # type: Dict[Tuple, Tuple[Any, Any]]
+        # The ID graph of the last validation, the IDs each fragment declares and
+        # refers to
+        self._declared = {}  # type: Dict[Tuple, Set[str]]
+        self._references = {}  # type: Dict[Tuple, Set[str]]
+
+    def start(self, config: ConfigType) -> None:
+        """Start validating config, dropping the fragments that have to be validated again."""
+        context = _fragment_key(
+            {k: config[k] for k in self.CONTEXT_DOMAINS if k in config},
+            with_ranges=False,
+        )
+        self._config = config
+        self._raw_keys = {}
+        if context != self._context:
+            self._context = context
+            self._fragments.clear()
+        else:
+            self._drop_dependents()
+        self._sources = {}
+
+    def _raw_key(self, path: Tuple) -> Tuple[Any, Any]:
+        """Return the raw fragment at path in the config being validated and its key."""
+        entry = self._raw_keys.get(path)
+        if entry is None:
+            raw = _raw_fragment(self._config, path)
+            entry = self._raw_keys[path] = (raw, _fragment_key(raw))
+        return entry
+
+    def _drop_dependents(self) -> None:
+        """Drop the changed and removed fragments and all fragments depending on them."""
+        dropped = {
+            path
+            for path, source in self._sources.items()
+            if self._raw_key(path)[1] != source
+        }
+        ids = set().union(*(self._declared.get(path, ()) for path in dropped))
+        while ids:
+            dependents = {
+                path
+                for path, references in self._references.items()
+                if path not in dropped and not references.isdisjoint(ids)
+            }
+            dropped |= dependents
+            ids = set().union(*(self._declared.get(path, ()) for path in dependents))
+        for path in dropped:
+            self._fragments.pop(path, None)
+
+    def lookup(
+        self, path: ConfigPath, comp: ComponentManifest, conf: ConfigType
+    ) -> Tuple[Any, Optional[ConfigFragmentType]]:
+        """Return the key for conf and a copy of its validated fragment, if known."""
+        path = tuple(path)
+        raw, source = self._raw_key(path)
+        self._sources[path] = source
+        conf_key = source if conf is raw else _fragment_key(conf)
+        key = (comp, frozenset(CORE.loaded_integrations), conf_key)
+        entry = self._fragments.get(path)
+        if entry is None or entry[0] != key:
+            return key, None
+        return key, _copy_fragment(entry[1])
+
+    def store(self, path: ConfigPath, key: Any, validated: ConfigFragmentType) -> None:
+        self._fragments[tuple(path)] = (key, _copy_fragment(validated))
+
+    def finish(self, result: Config) -> None:
+        """Record the ID graph of a finished validation."""
+        declared = {}  # type: Dict[Tuple, Set[str]]
+        references = {}  # type: Dict[Tuple, Set[str]]
+        for path in self._sources:
+            for id, _ in iter_ids(result.get_nested_item(list(path))):
+                if id.id is not None:
+                    ids = declared if id.is_declaration else references
+                    ids.setdefault(path, set()).add(id.id)
+        self._declared = declared
+        self._references = references
+
+
+def validate_config(config, command_line_substitutions, session=None):
     result = Config()
+    result.session = session
 
     loader.clear_component_meta_finders()
     loader.install_custom_components_meta_finder()
@@ -728,6 +1031,9 @@ def validate_config(config, command_line_substitutions):
     # Remove temporary esphome config path again, it will be reloaded later
     result.remove_output_path([CONF_ESPHOME], CONF_ESPHOME)
 
+    if session is not None:
+        session.start(config)
+
     # First run platform validation steps
     for key in TARGET_PLATFORMS:
         if key in config:
@@ -735,6 +1041,8 @@ def validate_config(config, command_line_substitutions):
     result.run_validation_steps()
 
     if result.errors:
+        if session is not None:
+            session.finish(result)
         return result
 
     for domain, conf in config.items():
@@ -743,6 +1051,8 @@ def validate_config(config, command_line_substitutions):
 
     result.run_validation_steps()
 
+    if session is not None:
+        session.finish(result)
     return result
 
 
@@ -807,14 +1117,14 @@ class InvalidYAMLError(EsphomeError):
         self.base_exc = base_exc
 
 
-def _load_config(command_line_substitutions):
+def _load_config(command_line_substitutions, session=None):
     try:
         config = yaml_util.load_yaml(CORE.config_path)
     except EsphomeError as e:
         raise InvalidYAMLError(e) from e
 
     try:
-        result = validate_config(config, command_line_substitutions)
+        result = validate_config(config, command_line_substitutions, session)
     except EsphomeError:
         raise
     except Exception:
@@ -824,9 +1134,9 @@ def _load_config(command_line_substitutions):
     return result
 
 
-def load_config(command_line_substitutions):
+def load_config(command_line_substitutions, session=None):
     try:
-        return _load_config(command_line_substitutions)
+        return _load_config(command_line_substitutions, session)
     except vol.Invalid as err:
         raise EsphomeError(f"Error while parsing config: {err}") from err
 
@@ -968,8 +1278,12 @@ def strip_default_ids(config):
     return config
 
 
-def read_config(command_line_substitutions):
+def read_config(command_line_substitutions, use_cache=False):
     _LOGGER.info("Reading configuration %s...", CORE.config_path)
+    if use_cache:
+        cached = config_cache.load_cached_config(command_line_substitutions)
+        if cached is not None:
+            return cached
     try:
         res = load_config(command_line_substitutions)
     except EsphomeError as err:
@@ -992,4 +1306,7 @@ def read_config(command_line_substitutions):
             safe_print(errstr)
             safe_print(indent(dump_dict(res, path)[0]))
         return None
-    return OrderedDict(res)
+    config = OrderedDict(res)
+    if use_cache:
+        config_cache.store_config(command_line_substitutions, config)
+    return config
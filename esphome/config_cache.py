@@ -0,0 +1,153 @@
+"""On-disk cache of validated configurations.
+
+Validating a configuration (packages, substitutions, all component schemas and the ID
+pass) is by far the slowest part of commands like `esphome logs` or `esphome upload`.
+The result only depends on the files the YAML loader read, the command line
+substitutions and the ESPHome version, so it is stored in `.esphome/` together with
+the hashes of all those files and reused as long as none of them changed.
+"""
+import io
+import logging
+import os
+import pickle
+import sys
+from typing import Any, Dict, Optional
+
+from esphome import const, yaml_util
+from esphome.const import CONF_EXTERNAL_COMPONENTS
+from esphome.core import CORE
+from esphome.helpers import ClassAddingPickler, write_file
+from esphome.types import ConfigType
+
+_LOGGER = logging.getLogger(__name__)
+
+# Increase when the structure of the cached data changes
+CACHE_VERSION = 1
+# ClassAddingPickler needs Pickler.reducer_override, added in Python 3.8
+CACHE_SUPPORTED = sys.version_info >= (3, 8)
+
+
+def config_cache_path() -> str:
+    return CORE.relative_internal_path(f"{CORE.config_filename}.config_cache")
+
+
+def _hash_file(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f_handle:
+            return yaml_util.hash_content(f_handle.read())
+    except OSError:
+        return None
+
+
+def _static_key(command_line_substitutions: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "cache_version": CACHE_VERSION,
+        "esphome_version": const.__version__,
+        "python_version": tuple(sys.version_info[:2]),
+        "config_path": os.path.abspath(CORE.config_path),
+        "substitutions": sorted(
+            (str(k), str(v)) for k, v in command_line_substitutions.items()
+        ),
+    }
+
+
+def _is_valid(key: Dict[str, Any], command_line_substitutions) -> bool:
+    if key["static"] != _static_key(command_line_substitutions):
+        return False
+    for name, value in key["env_vars"].items():
+        if os.environ.get(name) != value:
+            return False
+    for directory, files in key["included_dirs"].items():
+        if yaml_util.list_included_files(directory) != files:
+            return False
+    for path, digest in key["files"].items():
+        if _hash_file(path) != digest:
+            return False
+    return True
+
+
+def load_cached_config(command_line_substitutions) -> Optional[ConfigType]:
+    """Return the cached validated config, or None if it is missing or outdated.
+
+    On a cache hit CORE is set up as if the configuration was validated.
+    """
+    path = config_cache_path()
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, "rb") as f_handle:
+            entry = pickle.load(f_handle)
+        if not _is_valid(entry["key"], command_line_substitutions):
+            _LOGGER.debug("Config cache %s is outdated", path)
+            return None
+        data = pickle.loads(entry["data"])
+    except Exception as err:  # pylint: disable=broad-except
+        # Any problem with the cache just means we have to validate again
+        _LOGGER.debug("Could not read config cache %s: %s", path, err)
+        return None
+
+    _LOGGER.info("Using cached validated configuration")
+    CORE.name = data["name"]
+    CORE.build_path = data["build_path"]
+    CORE.data = data["data"]
+    CORE.raw_config = data["raw_config"]
+    CORE.loaded_integrations = data["loaded_integrations"]
+    CORE.component_ids = data["component_ids"]
+    yaml_util.restore_secret_values(data["secret_values"])
+    return data["config"]
+
+
+def _is_cacheable(config: ConfigType, files) -> bool:
+    if CONF_EXTERNAL_COMPONENTS in config:
+        # Code from git repositories or local directories, may change at any time
+        return False
+    if os.path.isdir(os.path.join(CORE.config_dir, "custom_components")):
+        return False
+    # Remote packages are loaded with their own load_yaml() call, which resets
+    # the tracked files, so the main configuration file is missing then.
+    return os.path.abspath(CORE.config_path) in files
+
+
+def store_config(command_line_substitutions, config: ConfigType) -> None:
+    """Store a validated config, right after it was read with read_config()."""
+    if not CACHE_SUPPORTED:
+        _LOGGER.debug("Not caching validated config, requires Python 3.8+")
+        return
+    file_hashes, included_dirs, env_vars, secret_values = yaml_util.loaded_sources()
+    if not _is_cacheable(config, file_hashes):
+        return
+
+    data = {
+        "config": config,
+        "name": CORE.name,
+        "build_path": CORE.build_path,
+        "data": CORE.data,
+        "raw_config": CORE.raw_config,
+        "loaded_integrations": CORE.loaded_integrations,
+        "component_ids": CORE.component_ids,
+        "secret_values": secret_values,
+    }
+    buf = io.BytesIO()
+    try:
+        ClassAddingPickler(buf, protocol=pickle.HIGHEST_PROTOCOL).dump(data)
+    except Exception as err:  # pylint: disable=broad-except
+        # Not all components store picklable data, just don't cache those
+        _LOGGER.warning("Could not cache validated config: %s", err)
+        return
+
+    key = {
+        "static": _static_key(command_line_substitutions),
+        "files": file_hashes,
+        "included_dirs": included_dirs,
+        "env_vars": env_vars,
+    }
+    write_file(
+        config_cache_path(),
+        pickle.dumps({"key": key, "data": buf.getvalue()}),
+    )
+
+
+def clear_config_cache() -> None:
+    path = config_cache_path()
+    if os.path.isfile(path):
+        os.remove(path)
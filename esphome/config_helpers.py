@@ -5,11 +5,17 @@ from esphome.core import CORE
 from esphome.helpers import read_file
 
 
+def is_editor_file(path):
+    # type: (str) -> bool
+    """Return whether read_config_file() gets the content of path from the editor."""
+    return CORE.vscode and (
+        not CORE.ace or os.path.abspath(path) == os.path.abspath(CORE.config_path)
+    )
+
+
 def read_config_file(path):
     # type: (str) -> str
-    if CORE.vscode and (
-        not CORE.ace or os.path.abspath(path) == os.path.abspath(CORE.config_path)
-    ):
+    if is_editor_file(path):
         print(
             json.dumps(
                 {
@@ -59,7 +59,7 @@ from esphome.jsonschema import (
 )
 
 from esphome.voluptuous_schema import _Schema
-from esphome.yaml_util import make_data_base
+from esphome.yaml_util import make_data_base, record_file
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -1354,6 +1354,8 @@ def file_(value):
         raise Invalid(
             f"Path '{path}' is not a file (full path: {os.path.abspath(path)})."
         )
+    # The validated config may depend on the content (fonts, images, certificates)
+    record_file(path)
     return value
 
 
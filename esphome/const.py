@@ -744,6 +744,8 @@ CONF_ZERO = "zero"
 
 ENV_NOGITIGNORE = "ESPHOME_NOGITIGNORE"
 ENV_QUICKWIZARD = "ESPHOME_QUICKWIZARD"
+ENV_SRC_LINK_MODE = "ESPHOME_SRC_LINK_MODE"
+ENV_MDNS_TIMEOUT = "ESPHOME_MDNS_TIMEOUT"
 
 ICON_ACCELERATION = "mdi:axis-arrow"
 ICON_ACCELERATION_X = "mdi:axis-x-arrow"
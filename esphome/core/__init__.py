@@ -17,6 +17,7 @@ from esphome.const import (
 )
 from esphome.coroutine import FakeAwaitable as _FakeAwaitable
 from esphome.coroutine import FakeEventLoop as _FakeEventLoop
+from esphome.coroutine import WaitFor as _WaitFor
 
 # pylint: disable=unused-import
 from esphome.coroutine import coroutine, coroutine_with_priority  # noqa
@@ -308,14 +309,18 @@ class ID:
         self.is_declaration = is_declaration
         self.type: Optional["MockObjClass"] = type
 
+    @property
+    def auto_id_base(self) -> str:
+        """The preferred name for an automatic ID, derived from the type."""
+        base = str(self.type).replace("::", "_").lower()
+        return "".join(c for c in base if c.isalnum() or c == "_")
+
     def resolve(self, registered_ids):
         from esphome.config_validation import RESERVED_IDS
 
         if self.id is None:
-            base = str(self.type).replace("::", "_").lower()
-            name = "".join(c for c in base if c.isalnum() or c == "_")
             used = set(registered_ids) | set(RESERVED_IDS) | CORE.loaded_integrations
-            self.id = ensure_unique_string(name, used)
+            self.id = ensure_unique_string(self.auto_id_base, used)
         return self.id
 
     def __str__(self):
@@ -470,6 +475,8 @@ class EsphomeCore:
         self.task_counter = 0
         # The variable cache, for each ID this holds a MockObj of the variable obj
         self.variables: Dict[str, "MockObj"] = {}
+        # The registered (full) ID and the MockObj of the variable, for each ID
+        self.variables_with_full_id: Dict["ID", Tuple["ID", "MockObj"]] = {}
         # A list of statements that go in the main setup() block
         self.main_statements: List["Statement"] = []
         # A list of statements to insert in the global block (includes and global variables)
@@ -499,6 +506,7 @@ class EsphomeCore:
         self.event_loop = _FakeEventLoop()
         self.task_counter = 0
         self.variables = {}
+        self.variables_with_full_id = {}
         self.main_statements = []
         self.global_statements = []
         self.libraries = []
@@ -714,7 +722,7 @@ class EsphomeCore:
                 return self.variables[id]
             except KeyError:
                 _LOGGER.debug("Waiting for variable %s (%r)", id, id)
-                yield
+                yield _WaitFor(id)
 
     async def get_variable(self, id) -> "MockObj":
         if not isinstance(id, ID):
@@ -726,16 +734,18 @@ class EsphomeCore:
 
     def _get_variable_with_full_id_generator(self, id):
         while True:
-            if id in self.variables:
-                for k, v in self.variables.items():
-                    if k == id:
-                        return (k, v)
-            _LOGGER.debug("Waiting for variable %s", id)
-            yield
+            try:
+                return self.variables_with_full_id[id]
+            except KeyError:
+                _LOGGER.debug("Waiting for variable %s", id)
+                yield _WaitFor(id)
 
     async def get_variable_with_full_id(self, id: ID) -> Tuple[ID, "MockObj"]:
         if not isinstance(id, ID):
             raise ValueError(f"ID {id!r} must be of type ID!")
+        # Fast path, check if already registered without awaiting
+        if id in self.variables_with_full_id:
+            return self.variables_with_full_id[id]
         return await _FakeAwaitable(self._get_variable_with_full_id_generator(id))
 
     def register_variable(self, id, obj):
@@ -743,6 +753,8 @@ class EsphomeCore:
             raise EsphomeError(f"ID {id} is already registered")
         _LOGGER.debug("Registered variable %s of type %s", id.id, id.type)
         self.variables[id] = obj
+        self.variables_with_full_id[id] = (id, obj)
+        self.event_loop.notify(id)
 
     def has_id(self, id):
         return id in self.variables
@@ -40,6 +40,12 @@ def my_coroutine(config):
 
 Here everything is combined in `yield` expressions. You await other coroutines using `yield` and
 the last `yield` expression defines what is returned.
+
+Waiting for a dependency does not poll: the innermost generator yields a `WaitFor` marker
+with the key (usually an `ID`) it needs. The event loop parks the task on that key and only
+re-schedules it once the key is published with `FakeEventLoop.notify()` (which
+`CORE.register_variable()` does). If the queue drains while tasks are still parked, the
+dependencies can never be satisfied and the cycle (or the missing ID) is reported.
 """
 
 import collections
@@ -48,7 +54,17 @@ import heapq
 import inspect
 import logging
 import types
-from typing import Any, Awaitable, Callable, Generator, Iterator, List, Tuple
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -159,22 +175,50 @@ class FakeAwaitable:
         return ret
 
 
+class WaitFor:
+    """Marker yielded by a generator that can't continue until `key` is published.
+
+    The event loop parks the yielding task until `FakeEventLoop.notify(key)` is called,
+    instead of resuming it over and over.
+    """
+
+    def __init__(self, key: Any) -> None:
+        self.key = key
+
+    def __repr__(self):
+        return f"WaitFor<{self.key!r}>"
+
+
 @functools.total_ordering
 class _Task:
     def __init__(
         self,
         priority: float,
         id_number: int,
-        iterator: Iterator[None],
+        iterator: Iterator[Any],
         original_function: Any,
+        args: Tuple[Any, ...] = (),
     ):
         self.priority = priority
         self.id_number = id_number
         self.iterator = iterator
         self.original_function = original_function
+        # The arguments the job was started with, used to find which task declares an ID
+        # when reporting a dependency cycle
+        self.args = args
+        self.waiting_for: Any = None
 
     def with_priority(self, priority: float) -> "_Task":
-        return _Task(priority, self.id_number, self.iterator, self.original_function)
+        return _Task(
+            priority, self.id_number, self.iterator, self.original_function, self.args
+        )
+
+    @property
+    def name(self) -> str:
+        return (
+            f"{self.original_function.__module__}."
+            f"{self.original_function.__qualname__}"
+        )
 
     @property
     def _cmp_tuple(self) -> Tuple[float, int]:
@@ -190,12 +234,41 @@ class _Task:
         return self._cmp_tuple < other._cmp_tuple
 
 
+def _declared_ids(obj: Any) -> Iterator[Any]:
+    """Find all declared IDs in the (config) arguments of a job."""
+    from esphome.core import ID
+
+    if isinstance(obj, ID):
+        if obj.is_declaration:
+            yield obj
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            yield from _declared_ids(value)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            yield from _declared_ids(value)
+
+
+def _find_cycle(start: _Task, owners: Dict[Any, _Task]) -> Optional[List[_Task]]:
+    """Follow the chain of blocked tasks from `start`, returning it if it loops."""
+    path: List[_Task] = []
+    task: Optional[_Task] = start
+    while task is not None and task not in path:
+        path.append(task)
+        task = owners.get(task.waiting_for)
+    if task is None:
+        return None
+    return path[path.index(task) :] + [task]
+
+
 class FakeEventLoop:
     """Emulate an asyncio EventLoop to run some registered coroutine jobs in sequence."""
 
     def __init__(self):
         self._pending_tasks: List[_Task] = []
         self._task_counter = 0
+        # Tasks that are blocked, by the key they are waiting for
+        self._waiting_tasks: Dict[Any, List[_Task]] = {}
 
     def add_job(self, func, *args, **kwargs):
         """Add a job to the task queue,
@@ -211,28 +284,23 @@ class FakeEventLoop:
             coro = coroutine(func)
             gen = coro(*args, **kwargs)
         prio = getattr(coro, "priority", 0.0)
-        task = _Task(prio, self._task_counter, gen, func)
+        task = _Task(prio, self._task_counter, gen, func, args + tuple(kwargs.values()))
         self._task_counter += 1
         heapq.heappush(self._pending_tasks, task)
 
+    def notify(self, key: Any) -> None:
+        """Publish `key`, re-scheduling all tasks that are waiting for it."""
+        for task in self._waiting_tasks.pop(key, ()):
+            task.waiting_for = None
+            heapq.heappush(self._pending_tasks, task)
+
     def flush_tasks(self):
         """Run until all tasks have been completed.
 
-        :raises RuntimeError: if a deadlock is detected.
+        :raises RuntimeError: if a task waits for a key that is never published,
+            for example because of a circular dependency.
         """
-        i = 0
         while self._pending_tasks:
-            i += 1
-            if i > 1000000:
-                # Detect deadlock/circular dependency by measuring how many times tasks have been
-                # executed. On the big tests/test1.yaml we only get to a fraction of this, so
-                # this shouldn't be a problem.
-                raise RuntimeError(
-                    "Circular dependency detected! "
-                    "Please run with -v option to see what functions failed to "
-                    "complete."
-                )
-
             task: _Task = heapq.heappop(self._pending_tasks)
             _LOGGER.debug(
                 "Running %s in %s (num %s)",
@@ -242,11 +310,49 @@ class FakeEventLoop:
             )
 
             try:
-                next(task.iterator)
-                # Decrease priority over time, so that if this task is blocked
-                # due to a dependency others will clear the dependency
-                # This could be improved with a less naive approach
-                new_task = task.with_priority(task.priority - 1)
-                heapq.heappush(self._pending_tasks, new_task)
+                awaiting = next(task.iterator)
             except StopIteration:
                 _LOGGER.debug(" -> finished")
+                continue
+
+            # Decrease priority every time a task yields, so that tasks that have not
+            # been blocked yet run first
+            new_task = task.with_priority(task.priority - 1)
+            if isinstance(awaiting, WaitFor):
+                _LOGGER.debug(" -> waiting for %s", awaiting.key)
+                new_task.waiting_for = awaiting.key
+                self._waiting_tasks.setdefault(awaiting.key, []).append(new_task)
+            else:
+                heapq.heappush(self._pending_tasks, new_task)
+
+        if self._waiting_tasks:
+            raise RuntimeError(self._deadlock_message())
+
+    def _deadlock_message(self) -> str:
+        blocked = sorted(
+            task for tasks in self._waiting_tasks.values() for task in tasks
+        )
+        owners: Dict[Any, _Task] = {}
+        for task in blocked:
+            for id_ in _declared_ids(task.args):
+                owners.setdefault(id_, task)
+
+        for task in blocked:
+            cycle = _find_cycle(task, owners)
+            if cycle is not None:
+                chain = " -> ".join(
+                    f"{t.name} (waiting for '{t.waiting_for}')" for t in cycle[:-1]
+                )
+                return (
+                    f"Circular dependency detected! {chain} -> {cycle[-1].name}. "
+                    "Please run with -v option to see what functions failed to "
+                    "complete."
+                )
+
+        waiting = ", ".join(
+            f"{t.name} (waiting for '{t.waiting_for}')" for t in blocked
+        )
+        return (
+            f"Unable to resolve dependencies, these functions failed to complete: {waiting}. "
+            "Please run with -v option to see what functions failed to complete."
+        )
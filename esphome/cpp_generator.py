@@ -2,6 +2,7 @@ import abc
 import inspect
 import math
 import re
+import sys
 from esphome.yaml_util import ESPHomeDataBase
 
 # pylint: disable=unused-import, wrong-import-order
@@ -41,6 +42,7 @@ SafeExpType = Union[
     bool,
     str,
     str,
+    bytes,
     int,
     float,
     TimePeriod,
@@ -186,6 +188,26 @@ class ArrayInitializer(Expression):
         return cpp
 
 
+# The C++ literal for every byte value, as HexInt prints them
+_HEX_BYTES = tuple(f"0x{i:02X}" for i in range(256))
+
+
+class ByteArrayInitializer(Expression):
+    """Array initializer for raw bytes, like image and font data.
+
+    Renders the same as an ArrayInitializer of HexInts, but without an expression
+    object for every byte.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview]):
+        self.data = bytes(data)
+
+    def __str__(self):
+        return f"{{{', '.join(map(_HEX_BYTES.__getitem__, self.data))}}}"
+
+
 class ParameterExpression(Expression):
     __slots__ = ("type", "id")
 
@@ -349,6 +371,8 @@ def safe_exp(obj: SafeExpType) -> Expression:
         return BoolLiteral(obj)
     if isinstance(obj, str):
         return StringLiteral(obj)
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return ByteArrayInitializer(obj)
     if isinstance(obj, HexInt):
         return HexIntLiteral(obj)
     if isinstance(obj, int):
@@ -970,30 +994,29 @@ class MockObjClass(MockObj):
     def __init__(self, *args, **kwargs):
         parens = kwargs.pop("parents")
         MockObj.__init__(self, *args, **kwargs)
-        self._parents = []
         for paren in parens:
             if not isinstance(paren, MockObjClass):
                 raise ValueError
-            self._parents.append(paren)
-            # pylint: disable=protected-access
-            self._parents += paren._parents
+        self._parents = tuple(parens)
+        # Canonical C++ name of this class and of all classes it inherits from
+        # (including itself), so inheritance checks are a single set lookup.
+        self.type_key = sys.intern(str(self.base))
+        # pylint: disable=protected-access
+        self._ancestors = frozenset((self.type_key,)).union(
+            *(paren._ancestors for paren in self._parents)
+        )
 
     def inherits_from(self, other: "MockObjClass") -> bool:
-        if str(self) == str(other):
-            return True
-        for parent in self._parents:
-            if str(parent) == str(other):
-                return True
-        return False
+        if isinstance(other, MockObjClass):
+            return other.type_key in self._ancestors
+        return str(other) in self._ancestors
 
     def template(self, *args: SafeExpType) -> "MockObjClass":
         if len(args) != 1 or not isinstance(args[0], TemplateArguments):
             args = TemplateArguments(*args)
         else:
             args = args[0]
-        new_parents = self._parents[:]
-        new_parents.append(self)
-        return MockObjClass(f"{self.base}{args}", parents=new_parents)
+        return MockObjClass(f"{self.base}{args}", parents=(self,))
 
     def __repr__(self):
         return f"MockObjClass<{str(self.base)}, parents={self._parents}>"
@@ -1,8 +1,11 @@
+from contextlib import contextmanager
 import hashlib
+import io
 import logging
 import random
 import socket
 import sys
+import threading
 import time
 import gzip
 
@@ -38,6 +41,16 @@ MAGIC_BYTES = [0x6C, 0x26, 0xF7, 0x5C, 0x45]
 
 FEATURE_SUPPORTS_COMPRESSION = 0x01
 
+# Limits for the size of the chunks handed to the socket and its send buffer during
+# the upload. Both grow with the measured throughput.
+MIN_CHUNK_SIZE = 1024
+MAX_CHUNK_SIZE = 64 * 1024
+MIN_SEND_BUFFER = 8192
+MAX_SEND_BUFFER = 256 * 1024
+# Keep the send buffer at this many seconds of data, so that the progress bar shows
+# the actual progress
+SEND_BUFFER_SECONDS = 0.25
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -173,107 +186,184 @@ def send_check(sock, data, msg):
         raise OTAError(f"Error sending {msg}: {err}") from err
 
 
+class PhaseTimer:
+    """Measures the time spent in each phase of the OTA protocol."""
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def __str__(self):
+        return ", ".join(f"{name} {secs:.2f}s" for name, secs in self.phases.items())
+
+
+class _Compressor(threading.Thread):
+    """Gzips the firmware in the background while the handshake is going on."""
+
+    def __init__(self, contents):
+        super().__init__(daemon=True)
+        self._contents = contents
+        self._result = None
+        self._error = None
+
+    def run(self):
+        try:
+            buffer = io.BytesIO()
+            # Compress block by block, zlib releases the GIL for each block
+            with gzip.GzipFile(fileobj=buffer, mode="wb", compresslevel=9) as gz:
+                for offset in range(0, len(self._contents), MAX_CHUNK_SIZE):
+                    gz.write(self._contents[offset : offset + MAX_CHUNK_SIZE])
+            self._result = buffer.getbuffer()
+        except Exception as err:  # pylint: disable=broad-except
+            self._error = err
+
+    def result(self):
+        self.join()
+        if self._error is not None:
+            raise OTAError(f"Error compressing firmware: {self._error}")
+        return self._result
+
+
+def send_contents(sock, contents, progress):
+    """Send contents (a memoryview) while adapting chunk and send buffer sizes.
+
+    Returns the number of bytes per second the contents were sent with.
+    """
+    size = len(contents)
+    chunk_size = MIN_CHUNK_SIZE
+    send_buffer = MIN_SEND_BUFFER
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, send_buffer)
+    start = time.perf_counter()
+    offset = 0
+    while offset < size:
+        try:
+            offset += sock.send(contents[offset : offset + chunk_size])
+        except OSError as err:
+            sys.stderr.write("\n")
+            raise OTAError(f"Error sending data: {err}") from err
+        progress.update(offset / size)
+
+        elapsed = time.perf_counter() - start
+        if elapsed < SEND_BUFFER_SECONDS:
+            # Filling the initial buffer is instant, don't take that as the rate
+            continue
+        rate = offset / elapsed
+        wanted_buffer = int(rate * SEND_BUFFER_SECONDS)
+        wanted_buffer = max(MIN_SEND_BUFFER, min(MAX_SEND_BUFFER, wanted_buffer))
+        # Avoid a setsockopt call for every chunk, only resize on big changes
+        if not send_buffer // 2 <= wanted_buffer <= send_buffer * 2:
+            send_buffer = wanted_buffer
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, send_buffer)
+        chunk_size = max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, send_buffer // 4))
+    progress.done()
+    elapsed = time.perf_counter() - start
+    return size / elapsed if elapsed > 0 else float("inf")
+
+
 def perform_ota(sock, password, file_handle, filename):
-    file_contents = file_handle.read()
+    timer = PhaseTimer()
+    with timer.phase("read"):
+        file_contents = memoryview(file_handle.read())
     file_size = len(file_contents)
     _LOGGER.info("Uploading %s (%s bytes)", filename, file_size)
 
-    # Enable nodelay, we need it for phase 1
-    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-    send_check(sock, MAGIC_BYTES, "magic bytes")
+    # Most devices support compression, start compressing during the handshake
+    compressor = _Compressor(file_contents)
+    compressor.start()
+
+    with timer.phase("handshake"):
+        # Enable nodelay, we need it for phase 1
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        send_check(sock, MAGIC_BYTES, "magic bytes")
+
+        _, version = receive_exactly(sock, 2, "version", RESPONSE_OK)
+        if version != OTA_VERSION_1_0:
+            raise OTAError(f"Unsupported OTA version {version}")
 
-    _, version = receive_exactly(sock, 2, "version", RESPONSE_OK)
-    if version != OTA_VERSION_1_0:
-        raise OTAError(f"Unsupported OTA version {version}")
+        # Features
+        send_check(sock, FEATURE_SUPPORTS_COMPRESSION, "features")
+        features = receive_exactly(
+            sock, 1, "features", [RESPONSE_HEADER_OK, RESPONSE_SUPPORTS_COMPRESSION]
+        )[0]
 
-    # Features
-    send_check(sock, FEATURE_SUPPORTS_COMPRESSION, "features")
-    features = receive_exactly(
-        sock, 1, "features", [RESPONSE_HEADER_OK, RESPONSE_SUPPORTS_COMPRESSION]
-    )[0]
+    with timer.phase("auth"):
+        (auth,) = receive_exactly(
+            sock, 1, "auth", [RESPONSE_REQUEST_AUTH, RESPONSE_AUTH_OK]
+        )
+        if auth == RESPONSE_REQUEST_AUTH:
+            if not password:
+                raise OTAError("ESP requests password, but no password given!")
+            nonce = receive_exactly(
+                sock, 32, "authentication nonce", [], decode=False
+            ).decode()
+            _LOGGER.debug("Auth: Nonce is %s", nonce)
+            cnonce = hashlib.md5(str(random.random()).encode()).hexdigest()
+            _LOGGER.debug("Auth: CNonce is %s", cnonce)
+
+            send_check(sock, cnonce, "auth cnonce")
+
+            result_md5 = hashlib.md5()
+            result_md5.update(password.encode("utf-8"))
+            result_md5.update(nonce.encode())
+            result_md5.update(cnonce.encode())
+            result = result_md5.hexdigest()
+            _LOGGER.debug("Auth: Result is %s", result)
+
+            send_check(sock, result, "auth result")
+            receive_exactly(sock, 1, "auth result", RESPONSE_AUTH_OK)
 
     if features == RESPONSE_SUPPORTS_COMPRESSION:
-        upload_contents = gzip.compress(file_contents, compresslevel=9)
+        # Only the part not hidden by the handshake
+        with timer.phase("compress"):
+            upload_contents = compressor.result()
         _LOGGER.info("Compressed to %s bytes", len(upload_contents))
     else:
         upload_contents = file_contents
 
-    (auth,) = receive_exactly(
-        sock, 1, "auth", [RESPONSE_REQUEST_AUTH, RESPONSE_AUTH_OK]
-    )
-    if auth == RESPONSE_REQUEST_AUTH:
-        if not password:
-            raise OTAError("ESP requests password, but no password given!")
-        nonce = receive_exactly(
-            sock, 32, "authentication nonce", [], decode=False
-        ).decode()
-        _LOGGER.debug("Auth: Nonce is %s", nonce)
-        cnonce = hashlib.md5(str(random.random()).encode()).hexdigest()
-        _LOGGER.debug("Auth: CNonce is %s", cnonce)
-
-        send_check(sock, cnonce, "auth cnonce")
-
-        result_md5 = hashlib.md5()
-        result_md5.update(password.encode("utf-8"))
-        result_md5.update(nonce.encode())
-        result_md5.update(cnonce.encode())
-        result = result_md5.hexdigest()
-        _LOGGER.debug("Auth: Result is %s", result)
-
-        send_check(sock, result, "auth result")
-        receive_exactly(sock, 1, "auth result", RESPONSE_AUTH_OK)
-
-    upload_size = len(upload_contents)
-    upload_size_encoded = [
-        (upload_size >> 24) & 0xFF,
-        (upload_size >> 16) & 0xFF,
-        (upload_size >> 8) & 0xFF,
-        (upload_size >> 0) & 0xFF,
-    ]
-    send_check(sock, upload_size_encoded, "binary size")
-    receive_exactly(sock, 1, "binary size", RESPONSE_UPDATE_PREPARE_OK)
-
-    upload_md5 = hashlib.md5(upload_contents).hexdigest()
-    _LOGGER.debug("MD5 of upload is %s", upload_md5)
-
-    send_check(sock, upload_md5, "file checksum")
-    receive_exactly(sock, 1, "file checksum", RESPONSE_BIN_MD5_OK)
-
-    # Disable nodelay for transfer
-    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 0)
-    # Limit send buffer (usually around 100kB) in order to have progress bar
-    # show the actual progress
-    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 8192)
-    # Set higher timeout during upload
-    sock.settimeout(20.0)
+    with timer.phase("prepare"):
+        upload_size = len(upload_contents)
+        upload_size_encoded = [
+            (upload_size >> 24) & 0xFF,
+            (upload_size >> 16) & 0xFF,
+            (upload_size >> 8) & 0xFF,
+            (upload_size >> 0) & 0xFF,
+        ]
+        send_check(sock, upload_size_encoded, "binary size")
+        receive_exactly(sock, 1, "binary size", RESPONSE_UPDATE_PREPARE_OK)
 
-    offset = 0
-    progress = ProgressBar()
-    while True:
-        chunk = upload_contents[offset : offset + 1024]
-        if not chunk:
-            break
-        offset += len(chunk)
+        upload_md5 = hashlib.md5(upload_contents).hexdigest()
+        _LOGGER.debug("MD5 of upload is %s", upload_md5)
 
-        try:
-            sock.sendall(chunk)
-        except OSError as err:
-            sys.stderr.write("\n")
-            raise OTAError(f"Error sending data: {err}") from err
+        send_check(sock, upload_md5, "file checksum")
+        receive_exactly(sock, 1, "file checksum", RESPONSE_BIN_MD5_OK)
 
-        progress.update(offset / upload_size)
-    progress.done()
+    with timer.phase("transfer"):
+        # Disable nodelay for transfer
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 0)
+        # Set higher timeout during upload
+        sock.settimeout(20.0)
+        rate = send_contents(sock, upload_contents, ProgressBar())
 
-    # Enable nodelay for last checks
-    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    with timer.phase("finish"):
+        # Enable nodelay for last checks
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
-    _LOGGER.info("Waiting for result...")
+        _LOGGER.info("Waiting for result...")
 
-    receive_exactly(sock, 1, "receive OK", RESPONSE_RECEIVE_OK)
-    receive_exactly(sock, 1, "Update end", RESPONSE_UPDATE_END_OK)
-    send_check(sock, RESPONSE_OK, "end acknowledgement")
+        receive_exactly(sock, 1, "receive OK", RESPONSE_RECEIVE_OK)
+        receive_exactly(sock, 1, "Update end", RESPONSE_UPDATE_END_OK)
+        send_check(sock, RESPONSE_OK, "end acknowledgement")
 
     _LOGGER.info("OTA successful")
+    _LOGGER.info("Sent %s bytes at %.1f KiB/s", upload_size, rate / 1024)
+    _LOGGER.info("Time spent: %s", timer)
 
     # Do not connect logs until it is fully on
     time.sleep(1)
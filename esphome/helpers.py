@@ -2,6 +2,7 @@ import codecs
 
 import logging
 import os
+import pickle
 from pathlib import Path
 from typing import Union
 import tempfile
@@ -291,6 +292,20 @@ _TYPE_OVERLOADS = {
 _CLASS_LOOKUP = {}
 
 
+def _class_with(orig_cls, cls):
+    """Get (or create) the class with bases orig_cls and cls."""
+    key = (orig_cls, cls)
+    new_cls = _CLASS_LOOKUP.get(key)
+    if new_cls is None:
+        new_cls = orig_cls.__class__(orig_cls.__name__, (orig_cls, cls), {})
+        _CLASS_LOOKUP[key] = new_cls
+    return new_cls
+
+
+def _overload_class(type_):
+    return _TYPE_OVERLOADS[type_]
+
+
 def add_class_to_obj(value, cls):
     """Add a class to a python type.
 
@@ -303,13 +318,7 @@ def add_class_to_obj(value, cls):
         return value
 
     try:
-        orig_cls = value.__class__
-        key = (orig_cls, cls)
-        new_cls = _CLASS_LOOKUP.get(key)
-        if new_cls is None:
-            new_cls = orig_cls.__class__(orig_cls.__name__, (orig_cls, cls), {})
-            _CLASS_LOOKUP[key] = new_cls
-        value.__class__ = new_cls
+        value.__class__ = _class_with(value.__class__, cls)
         return value
     except TypeError:
         # Non heap type, look in overloads dict
@@ -319,3 +328,21 @@ def add_class_to_obj(value, cls):
             if type(value) is type_:  # pylint: disable=unidiomatic-typecheck
                 return add_class_to_obj(func(value), cls)
         raise
+
+
+class ClassAddingPickler(pickle.Pickler):
+    """Pickler that can also store objects modified by add_class_to_obj.
+
+    The classes created by add_class_to_obj can't be looked up by name, so they are
+    stored as the pair of base classes they are created from instead.
+    Requires Python 3.8+, on older versions pickling those objects fails.
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, type):
+            for type_, overload in _TYPE_OVERLOADS.items():
+                if obj is overload:
+                    return _overload_class, (type_,)
+            if len(obj.__bases__) == 2 and _CLASS_LOOKUP.get(obj.__bases__) is obj:
+                return _class_with, obj.__bases__
+        return NotImplemented
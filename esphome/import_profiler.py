@@ -0,0 +1,93 @@
+"""Measure how long modules take to import, for `esphome --profile-imports`."""
+import importlib.abc
+import importlib.machinery
+import sys
+import time
+from typing import Dict, List, Tuple
+
+COMPONENTS_PACKAGE = "esphome.components."
+# Each module found by these gets its own loader instance
+_FILE_LOADERS = (
+    importlib.machinery.SourceFileLoader,
+    importlib.machinery.SourcelessFileLoader,
+    importlib.machinery.ExtensionFileLoader,
+)
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """Times the execution of every module imported while it is installed.
+
+    The profiler sits first in sys.meta_path and only wraps the loaders the other
+    finders return. Modules found by finders that are inserted before it later on
+    (custom and external components) are not timed themselves.
+    """
+
+    def __init__(self) -> None:
+        # Module name -> [inclusive seconds, exclusive seconds]
+        self.timings: Dict[str, List[float]] = {}
+        self._stack: List[str] = []
+
+    def __enter__(self) -> "ImportProfiler":
+        sys.meta_path.insert(0, self)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if isinstance(spec.loader, _FILE_LOADERS):
+            self._wrap(spec.loader, fullname)
+        return spec
+
+    def _wrap(self, loader, name: str) -> None:
+        exec_module = loader.exec_module
+
+        def timed_exec_module(module):
+            self._stack.append(name)
+            start = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - start
+                self._stack.pop()
+                timing = self.timings.setdefault(name, [0.0, 0.0])
+                timing[0] += elapsed
+                timing[1] += elapsed
+                if self._stack:
+                    parent = self.timings.setdefault(self._stack[-1], [0.0, 0.0])
+                    parent[1] -= elapsed
+
+        loader.exec_module = timed_exec_module
+
+    def slowest(self, components: bool, count: int) -> List[Tuple[str, float, float]]:
+        rows = [
+            (name, inclusive, exclusive)
+            for name, (inclusive, exclusive) in self.timings.items()
+            if name.startswith(COMPONENTS_PACKAGE) == components
+        ]
+        # Components by what they cost including their dependencies, other modules
+        # by their own cost
+        rows.sort(key=lambda row: row[1] if components else row[2], reverse=True)
+        return rows[:count]
+
+    def report(self, count: int = 20) -> str:
+        lines = []
+        for title, components in (("Components", True), ("Other modules", False)):
+            lines.append(f"{title}:")
+            lines.append(f"{'total ms':>10} {'self ms':>10}  module")
+            for name, inclusive, exclusive in self.slowest(components, count):
+                lines.append(
+                    f"{inclusive * 1000:10.1f} {exclusive * 1000:10.1f}  {name}"
+                )
+            lines.append("")
+        total = sum(exclusive for _, exclusive in self.timings.values())
+        lines.append(f"{len(self.timings)} modules imported in {total * 1000:.1f} ms")
+        return "\n".join(lines)
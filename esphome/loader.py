@@ -1,17 +1,31 @@
+import ast
+import collections
 import logging
-from typing import Callable, List, Optional, Any, ContextManager
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Any,
+    ContextManager,
+    Set,
+    Tuple,
+    Union,
+)
 from types import ModuleType
 import importlib
+import importlib.machinery
 import importlib.util
 import importlib.resources
 import importlib.abc
+import os
+import re
 import sys
 from pathlib import Path
 from dataclasses import dataclass
 
 from esphome.const import SOURCE_FILE_EXTENSIONS
-import esphome.core.config
-from esphome.core import CORE
+from esphome.core import CORE, EsphomeError
 from esphome.types import ConfigType
 
 _LOGGER = logging.getLogger(__name__)
@@ -26,9 +40,117 @@ class FileResource:
         return importlib.resources.path(self.package, self.resource)
 
 
+def package_directory(package: str) -> Optional[str]:
+    """Return the directory of a regular package, or None if it is not on disk."""
+    paths = list(getattr(sys.modules.get(package), "__path__", None) or ())
+    if len(paths) != 1 or not os.path.isdir(paths[0]):
+        return None
+    return paths[0]
+
+
+# Module level constants of components that are read from the source when they
+# are literals, so that the module is only imported once its code is needed
+STATIC_METADATA = (
+    "IS_PLATFORM_COMPONENT",
+    "MULTI_CONF",
+    "DEPENDENCIES",
+    "CONFLICTS_WITH",
+    "AUTO_LOAD",
+    "CODEOWNERS",
+)
+
+_NO_STATIC_METADATA = ({}, set(STATIC_METADATA))
+_METADATA_NAME_RE = re.compile(r"\b(" + "|".join(STATIC_METADATA) + r")\b")
+_STAR_IMPORT_RE = re.compile(r"^\s*from\s+\S+\s+import\s+\*", re.MULTILINE)
+# The most lines a literal assignment may span
+_MAX_LITERAL_LINES = 20
+_NOT_LITERAL = object()
+
+
+def _literal_assignment(source: str, name: str) -> Any:
+    match = re.search(rf"^{name}\s*=(?!=)", source, re.MULTILINE)
+    if match is None:
+        return _NOT_LITERAL
+    lines = source[match.end() :].split("\n", _MAX_LITERAL_LINES)
+    for count in range(1, min(len(lines), _MAX_LITERAL_LINES) + 1):
+        try:
+            return ast.literal_eval("\n".join(lines[:count]).strip())
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            continue
+    return _NOT_LITERAL
+
+
+def read_static_metadata(path: str) -> Optional[Tuple[Dict[str, Any], Set[str]]]:
+    """Read the metadata constants a module source assigns literals to.
+
+    Returns the literal values, and the names that need the module to be imported:
+    everything that is mentioned anywhere else than in a single module level
+    literal assignment. None if the source can't be read.
+
+    Parsing the whole source would take about as long as importing the module
+    from its bytecode cache, so only the assignments are evaluated.
+    """
+    try:
+        with open(path, encoding="utf-8") as f_handle:
+            source = f_handle.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if _STAR_IMPORT_RE.search(source):
+        return None
+
+    values = {}
+    dynamic = set()
+    occurrences = collections.Counter(_METADATA_NAME_RE.findall(source))
+    for name, count in occurrences.items():
+        value = _literal_assignment(source, name) if count == 1 else _NOT_LITERAL
+        if value is _NOT_LITERAL:
+            dynamic.add(name)
+        else:
+            values[name] = value
+    return values, dynamic
+
+
 class ComponentManifest:
-    def __init__(self, module: ModuleType):
-        self.module = module
+    def __init__(
+        self,
+        module: Union[ModuleType, str],
+        spec: Optional[importlib.machinery.ModuleSpec] = None,
+    ):
+        """Create the manifest of a module, or of the module with the given name.
+
+        A module given by name is only imported once something that needs its code
+        is accessed, see STATIC_METADATA.
+        """
+        if isinstance(module, ModuleType):
+            self._module = module
+            self.name = module.__name__
+        else:
+            self._module = None
+            self.name = module
+        self._spec = spec
+        self._metadata: Optional[Tuple[Dict[str, Any], Set[str]]] = None
+
+    @property
+    def module(self) -> ModuleType:
+        if self._module is None:
+            try:
+                self._module = importlib.import_module(self.name)
+            except Exception as err:
+                _LOGGER.error("Unable to load component %s:", self.name, exc_info=True)
+                raise EsphomeError(f"Unable to load component {self.name}") from err
+        return self._module
+
+    def _get(self, name: str, default: Any) -> Any:
+        if self._module is None and self._spec is not None and self._spec.origin:
+            if self._metadata is None:
+                # Everything needs the module if the source can't be analyzed
+                self._metadata = (
+                    read_static_metadata(self._spec.origin) or _NO_STATIC_METADATA
+                )
+            values, dynamic = self._metadata
+            if name not in dynamic:
+                return values.get(name, default)
+        return getattr(self.module, name, default)
 
     @property
     def package(self) -> str:
@@ -39,15 +161,19 @@ class ComponentManifest:
         - esphome/components/gpio/switch/__init__.py -> esphome.components.gpio.switch
         - esphome/components/a4988/stepper.py -> esphome.components.a4988
         """
+        if self._module is None and self._spec is not None:
+            if self._spec.submodule_search_locations is not None:
+                return self.name
+            return self.name.rpartition(".")[0]
         return self.module.__package__
 
     @property
     def is_platform(self) -> bool:
-        return len(self.module.__name__.split(".")) == 4
+        return len(self.name.split(".")) == 4
 
     @property
     def is_platform_component(self) -> bool:
-        return getattr(self.module, "IS_PLATFORM_COMPONENT", False)
+        return self._get("IS_PLATFORM_COMPONENT", False)
 
     @property
     def config_schema(self) -> Optional[Any]:
@@ -55,7 +181,7 @@ class ComponentManifest:
 
     @property
     def multi_conf(self) -> bool:
-        return getattr(self.module, "MULTI_CONF", False)
+        return self._get("MULTI_CONF", False)
 
     @property
     def to_code(self) -> Optional[Callable[[Any], None]]:
@@ -63,19 +189,19 @@ class ComponentManifest:
 
     @property
     def dependencies(self) -> List[str]:
-        return getattr(self.module, "DEPENDENCIES", [])
+        return self._get("DEPENDENCIES", [])
 
     @property
     def conflicts_with(self) -> List[str]:
-        return getattr(self.module, "CONFLICTS_WITH", [])
+        return self._get("CONFLICTS_WITH", [])
 
     @property
     def auto_load(self) -> List[str]:
-        return getattr(self.module, "AUTO_LOAD", [])
+        return self._get("AUTO_LOAD", [])
 
     @property
     def codeowners(self) -> List[str]:
-        return getattr(self.module, "CODEOWNERS", [])
+        return self._get("CODEOWNERS", [])
 
     @property
     def final_validate_schema(self) -> Optional[Callable[[ConfigType], None]]:
@@ -93,6 +219,20 @@ class ComponentManifest:
         This will return all cpp source files that are located in the same folder as the
         loaded .py file (does not look through subdirectories)
         """
+        directory = package_directory(self.package)
+        if directory is not None:
+            # Regular package on disk, listing the directory is much faster
+            try:
+                with os.scandir(directory) as it:
+                    return [
+                        FileResource(self.package, entry.name)
+                        for entry in it
+                        if Path(entry.name).suffix in SOURCE_FILE_EXTENSIONS
+                        and entry.is_file()
+                    ]
+            except OSError:
+                pass
+
         ret = []
         for resource in importlib.resources.contents(self.package):
             if Path(resource).suffix not in SOURCE_FILE_EXTENSIONS:
@@ -158,8 +298,11 @@ def _lookup_module(domain):
     if domain in _COMPONENT_CACHE:
         return _COMPONENT_CACHE[domain]
 
+    name = f"esphome.components.{domain}"
     try:
-        module = importlib.import_module(f"esphome.components.{domain}")
+        # Only locates the module (and imports the component of a platform), the
+        # module itself is imported once the manifest needs it
+        spec = importlib.util.find_spec(name)
     except ImportError as e:
         if "No module named" not in str(e):
             _LOGGER.error("Unable to import component %s:", domain, exc_info=True)
@@ -167,10 +310,11 @@ def _lookup_module(domain):
     except Exception:  # pylint: disable=broad-except
         _LOGGER.error("Unable to load component %s:", domain, exc_info=True)
         return None
-    else:
-        manif = ComponentManifest(module)
-        _COMPONENT_CACHE[domain] = manif
-        return manif
+    if spec is None:
+        return None
+    manif = ComponentManifest(name, spec)
+    _COMPONENT_CACHE[domain] = manif
+    return manif
 
 
 def get_component(domain):
@@ -185,4 +329,6 @@ def get_platform(domain, platform):
 
 _COMPONENT_CACHE = {}
 CORE_COMPONENTS_PATH = (Path(__file__).parent / "components").resolve()
-_COMPONENT_CACHE["esphome"] = ComponentManifest(esphome.core.config)
+_COMPONENT_CACHE["esphome"] = ComponentManifest(
+    "esphome.core.config", importlib.util.find_spec("esphome.core.config")
+)
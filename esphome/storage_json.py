@@ -19,6 +19,10 @@ def storage_path():  # type: () -> str
     return CORE.relative_internal_path(f"{CORE.config_filename}.json")
 
 
+def src_manifest_path():  # type: () -> str
+    return CORE.relative_internal_path(f"{CORE.config_filename}.src_manifest.json")
+
+
 def ext_storage_path(base_path, config_filename):  # type: (str, str) -> str
     return os.path.join(base_path, ".esphome", f"{config_filename}.json")
 
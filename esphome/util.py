@@ -226,7 +226,9 @@ def run_external_process(*cmd, **kwargs):
     sub_stderr = RedirectText(sys.stderr, filter_lines=filter_lines)
 
     try:
-        return subprocess.call(cmd, stdout=sub_stdout, stderr=sub_stderr)
+        return subprocess.call(
+            cmd, stdout=sub_stdout, stderr=sub_stderr, cwd=kwargs.get("cwd")
+        )
     except KeyboardInterrupt:  # pylint: disable=try-except-raise
         raise
     except Exception as err:  # pylint: disable=broad-except
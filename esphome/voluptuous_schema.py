@@ -17,6 +17,20 @@ def ensure_multiple_invalid(err):
     return vol.MultipleInvalid(err)
 
 
+def _check_keys(schema):
+    # Check some things that ESPHome's schemas do not allow
+    # mostly to keep the logic in _compile_mapping sane (so these may be re-added if needed).
+    for key in schema:
+        if key is vol.Extra:
+            raise ValueError("ESPHome does not allow vol.Extra")
+        if isinstance(key, vol.Remove):
+            raise ValueError("ESPHome does not allow vol.Remove")
+        if isinstance(key, vol.primitive_types):
+            raise ValueError(
+                "All schema keys must be wrapped in cv.Required or cv.Optional"
+            )
+
+
 # pylint: disable=protected-access, unidiomatic-typecheck
 class _Schema(vol.Schema):
     """Custom cv.Schema that prints similar keys on error."""
@@ -24,12 +38,27 @@ class _Schema(vol.Schema):
     def __init__(
         self, schema, required=False, extra=vol.PREVENT_EXTRA, extra_schemas=None
     ):
-        super().__init__(schema, required=required, extra=extra)
+        # Unlike vol.Schema, the schema is only compiled when it is first used.
+        # Most schemas are built through chains of extend() at import time, and
+        # only the last one of a chain ever validates anything.
+        # pylint: disable=super-init-not-called
+        if isinstance(schema, dict):
+            _check_keys(schema)
+        self.schema = schema
+        self.required = required
+        self.extra = int(extra)
+        self._compiled_schema = None
         # List of extra schemas to apply after validation
         # Should be used sparingly, as it's not a very voluptuous-way/clean way of
         # doing things.
         self._extra_schemas = extra_schemas or []
 
+    @property
+    def _compiled(self):
+        if self._compiled_schema is None:
+            self._compiled_schema = self._compile(self.schema)
+        return self._compiled_schema
+
     def __call__(self, data):
         res = super().__call__(data)
         for extra in self._extra_schemas:
@@ -43,17 +72,7 @@ class _Schema(vol.Schema):
     def _compile_mapping(self, schema, invalid_msg=None):
         invalid_msg = invalid_msg or "mapping value"
 
-        # Check some things that ESPHome's schemas do not allow
-        # mostly to keep the logic in this method sane (so these may be re-added if needed).
-        for key in schema:
-            if key is vol.Extra:
-                raise ValueError("ESPHome does not allow vol.Extra")
-            if isinstance(key, vol.Remove):
-                raise ValueError("ESPHome does not allow vol.Remove")
-            if isinstance(key, vol.primitive_types):
-                raise ValueError(
-                    "All schema keys must be wrapped in cv.Required or cv.Optional"
-                )
+        _check_keys(schema)
 
         # Keys that may be required
         all_required_keys = {key for key in schema if isinstance(key, vol.Required)}
@@ -102,6 +121,33 @@ class _Schema(vol.Schema):
             elif isinstance(skey, vol.Marker) and isinstance(skey.schema, str):
                 key_names.append(skey.schema)
 
+        def extra_key_invalid(key, key_path):
+            if isinstance(key, str) and key_names:
+                matches = difflib.get_close_matches(key, key_names)
+                return ExtraKeysInvalid(
+                    "extra keys not allowed", key_path, candidates=matches
+                )
+            return vol.Invalid("extra keys not allowed", key_path)
+
+        if not additional_candidates and all(
+            len(key_candidates) == 1 for key_candidates in candidates_by_key.values()
+        ):
+            # Every key is a literal, so the only candidate for a key is found with a
+            # dict lookup, and the key validator (an equality check) can be skipped.
+            value_validators = {
+                literal: cvalue
+                for literal, [(_, (_, cvalue))] in candidates_by_key.items()
+            }
+            required = [(key.schema, key) for key in all_required_keys]
+            defaults = [
+                (key.schema, key.default)
+                for key in all_default_keys
+                if not isinstance(key.default, vol.Undefined)
+            ]
+            return self._compile_literal_mapping(
+                value_validators, required, defaults, extra_key_invalid, invalid_msg
+            )
+
         def validate_mapping(path, iterable, out):
             required_keys = all_required_keys.copy()
 
@@ -173,19 +219,7 @@ class _Schema(vol.Schema):
                     if self.extra == vol.ALLOW_EXTRA:
                         out[key] = value
                     elif self.extra != vol.REMOVE_EXTRA:
-                        if isinstance(key, str) and key_names:
-                            matches = difflib.get_close_matches(key, key_names)
-                            errors.append(
-                                ExtraKeysInvalid(
-                                    "extra keys not allowed",
-                                    key_path,
-                                    candidates=matches,
-                                )
-                            )
-                        else:
-                            errors.append(
-                                vol.Invalid("extra keys not allowed", key_path)
-                            )
+                        errors.append(extra_key_invalid(key, key_path))
 
             # for any required keys left that weren't found and don't have defaults:
             for key in required_keys:
@@ -198,6 +232,56 @@ class _Schema(vol.Schema):
 
         return validate_mapping
 
+    def _compile_literal_mapping(
+        self, value_validators, required, defaults, extra_key_invalid, invalid_msg
+    ):
+        get_validator = value_validators.get
+        extra = self.extra
+
+        def validate_mapping(path, iterable, out):
+            key_value_map = type(out)()
+            for key, value in iterable:
+                key_value_map[key] = value
+            for key, default in defaults:
+                if key not in key_value_map:
+                    key_value_map[key] = default()
+
+            errors = []
+            for key, value in key_value_map.items():
+                cvalue = get_validator(key)
+                if cvalue is None:
+                    if extra == vol.ALLOW_EXTRA:
+                        out[key] = value
+                    elif extra != vol.REMOVE_EXTRA:
+                        errors.append(extra_key_invalid(key, path + [key]))
+                    continue
+                key_path = path + [key]
+                try:
+                    out[key] = cvalue(key_path, value)
+                except vol.MultipleInvalid as e:
+                    exception_errors = e.errors
+                except vol.Invalid as e:
+                    exception_errors = [e]
+                else:
+                    continue
+                for err in exception_errors:
+                    if len(err.path) <= len(key_path):
+                        err.error_type = invalid_msg
+                    errors.append(err)
+
+            # A required key with an invalid value was provided, so it is only
+            # reported for its value
+            for key, marker in required:
+                if key not in key_value_map:
+                    msg = getattr(marker, "msg", None) or "required key not provided"
+                    errors.append(vol.RequiredFieldInvalid(msg, path + [marker]))
+            if errors:
+                raise vol.MultipleInvalid(errors)
+
+            return out
+
+        return validate_mapping
+
     def add_extra(self, validator):
         validator = _Schema(validator)
         self._extra_schemas.append(validator)
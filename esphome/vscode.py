@@ -2,7 +2,7 @@ import json
 import os
 
 # pylint: disable=unused-import
-from esphome.config import load_config, _format_vol_invalid, Config
+from esphome.config import load_config, _format_vol_invalid, Config, ValidationSession
 from esphome.core import CORE, DocumentRange
 import esphome.config_validation as cv
 
@@ -59,6 +59,8 @@ class VSCodeResult:
 
 
 def read_config(args):
+    # Kept across validations, so unchanged parts of the config aren't validated again
+    session = ValidationSession()
     while True:
         CORE.reset()
         data = json.loads(input())
@@ -72,7 +74,9 @@ def read_config(args):
             CORE.config_path = data["file"]
         vs = VSCodeResult()
         try:
-            res = load_config(dict(args.substitution) if args.substitution else {})
+            res = load_config(
+                dict(args.substitution) if args.substitution else {}, session
+            )
         except Exception as err:  # pylint: disable=broad-except
             vs.add_yaml_error(str(err))
         else:
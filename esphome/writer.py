@@ -1,8 +1,12 @@
+import errno
+import hashlib
+import json
 import logging
 import os
 import re
+import sys
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 from textwrap import dedent
 
 from esphome.config import iter_components
@@ -11,6 +15,7 @@ from esphome.const import (
     SOURCE_FILE_EXTENSIONS,
     __version__,
     ENV_NOGITIGNORE,
+    ENV_SRC_LINK_MODE,
 )
 from esphome.core import CORE, EsphomeError
 from esphome.helpers import (
@@ -18,10 +23,10 @@ from esphome.helpers import (
     read_file,
     write_file_if_changed,
     walk_files,
-    copy_file_if_changed,
+    file_compare,
     get_bool_env,
 )
-from esphome.storage_json import StorageJSON, storage_path
+from esphome.storage_json import StorageJSON, src_manifest_path, storage_path
 from esphome import loader
 
 from esphome.components.zephyr.zephyr_writer import (AUTO_GEN_ZEPHYR_MAIN_BEGIN,
@@ -316,29 +321,38 @@ def copy_src_tree():
     for t in ignore_targets:
         source_files_copy.pop(t)
 
-    for fname in walk_files(CORE.relative_src_path("esphome")):
-        p = Path(fname)
-        if p.suffix not in SOURCE_FILE_EXTENSIONS:
-            # Not a source file, ignore
-            continue
-        # Transform path to target path name
-        target = p.relative_to(CORE.relative_src_path())
-        if target in ignore_targets:
-            # Ignore defines.h, will be dealt with later
-            continue
-        if target not in source_files_copy:
-            # Source file removed, delete target
-            p.unlink()
-        else:
-            src_file = source_files_copy.pop(target)
-            with src_file.path() as src_path:
-                copy_file_if_changed(src_path, p)
-
-    # Now copy new files
+    mode = src_link_mode()
+    manifest = load_src_manifest()
+    new_manifest = {}
     for target, src_file in source_files_copy.items():
+        key = target.as_posix()
         dst_path = CORE.relative_src_path(*target.parts)
+        entry = manifest.get(key) if manifest is not None else None
+        if entry is not None and _manifest_entry_valid(entry, src_file, dst_path):
+            new_manifest[key] = entry
+            continue
         with src_file.path() as src_path:
-            copy_file_if_changed(src_path, dst_path)
+            new_manifest[key] = _copy_source_file(str(src_path), dst_path, entry, mode)
+
+    if manifest is None:
+        # No manifest yet, look for stale files in the whole tree
+        for fname in walk_files(CORE.relative_src_path("esphome")):
+            p = Path(fname)
+            if p.suffix not in SOURCE_FILE_EXTENSIONS:
+                # Not a source file, ignore
+                continue
+            # Transform path to target path name
+            target = p.relative_to(CORE.relative_src_path())
+            if target not in ignore_targets and target not in source_files_copy:
+                # Source file removed, delete target
+                p.unlink()
+    else:
+        for key in manifest.keys() - new_manifest.keys():
+            dst_path = Path(CORE.relative_src_path(*key.split("/")))
+            if dst_path.is_file():
+                dst_path.unlink()
+
+    save_src_manifest(new_manifest)
 
     # Finally copy defines
     write_file_if_changed(
@@ -360,6 +374,176 @@ def copy_src_tree():
         copy_files()
 
 
+SRC_LINK_MODES = ("copy", "reflink", "hardlink")
+# ioctl to share the data blocks of another file, see ioctl_ficlone(2)
+FICLONE = 0x40049409
+
+
+def src_link_mode() -> str:
+    """How copy_src_tree() puts the source files in the build directory.
+
+    - copy (default): a separate copy for every build directory.
+    - reflink: a copy on write clone, on Linux where supported by the filesystem
+      (btrfs, XFS...). Uses no extra disk space until one of the files is changed.
+    - hardlink: a hard link to the installed file. All build directories share the
+      same file, so the source files must never be edited in the build directory.
+
+    reflink and hardlink fall back to copying if the file can't be linked, for
+    example when the build directory is on another filesystem.
+    """
+    mode = os.getenv(ENV_SRC_LINK_MODE, "copy").lower()
+    if mode not in SRC_LINK_MODES:
+        raise EsphomeError(
+            f"Invalid {ENV_SRC_LINK_MODE} '{mode}', "
+            f"must be one of {', '.join(SRC_LINK_MODES)}"
+        )
+    return mode
+
+
+def _reflink(src_path: str, dst_path: str) -> None:
+    if not sys.platform.startswith("linux"):
+        # The ioctl number is Linux specific
+        raise OSError(errno.EOPNOTSUPP, "reflink is only supported on Linux")
+    import fcntl
+
+    with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+# (mode, source device, target device) combinations that failed to link before
+_UNSUPPORTED_LINKS = set()
+
+
+def link_file_if_changed(src_path: str, dst_path: str, mode: str) -> None:
+    """Copy or link src_path to dst_path, see src_link_mode().
+
+    The target is always replaced instead of written to, so a hard linked target
+    never changes the installed file.
+    """
+    import shutil
+
+    if mode == "hardlink":
+        try:
+            if os.path.samefile(src_path, dst_path):
+                return
+        except OSError:
+            pass
+    elif file_compare(src_path, dst_path):
+        return
+
+    mkdir_p(os.path.dirname(dst_path))
+    tmp_path = f"{dst_path}.tmp"
+    try:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        if mode != "copy":
+            devices = (
+                mode,
+                os.stat(src_path).st_dev,
+                os.stat(os.path.dirname(dst_path)).st_dev,
+            )
+            if devices in _UNSUPPORTED_LINKS:
+                mode = "copy"
+        try:
+            if mode == "hardlink":
+                os.link(src_path, tmp_path)
+            elif mode == "reflink":
+                _reflink(src_path, tmp_path)
+            else:
+                shutil.copy(src_path, tmp_path)
+        except (OSError, ImportError) as err:
+            if mode == "copy":
+                raise
+            _LOGGER.debug("Could not %s %s, copying: %s", mode, src_path, err)
+            _UNSUPPORTED_LINKS.add(devices)
+            if os.path.lexists(tmp_path):
+                os.remove(tmp_path)
+            shutil.copy(src_path, tmp_path)
+        os.replace(tmp_path, dst_path)
+    except OSError as err:
+        raise EsphomeError(
+            f"Error copying file {src_path} to {dst_path}: {err}"
+        ) from err
+
+
+SRC_MANIFEST_VERSION = 1
+
+
+def load_src_manifest() -> Optional[Dict[str, Dict[str, Any]]]:
+    """Load the manifest of the files copy_src_tree() copied in the last build.
+
+    Maps the target path of every file to the stat of the source and target files
+    and the hash of its content. Returns None if there is no usable manifest.
+    """
+    try:
+        with open(src_manifest_path(), encoding="utf-8") as f_handle:
+            data = json.load(f_handle)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != SRC_MANIFEST_VERSION:
+        return None
+    if data.get("build_path") != CORE.build_path:
+        return None
+    return data.get("files")
+
+
+def save_src_manifest(files: Dict[str, Dict[str, Any]]) -> None:
+    data = {
+        "version": SRC_MANIFEST_VERSION,
+        "build_path": CORE.build_path,
+        "files": files,
+    }
+    write_file_if_changed(src_manifest_path(), json.dumps(data, sort_keys=True))
+
+
+def _resource_file(src_file: loader.FileResource) -> Optional[str]:
+    """Return the path of a resource of a regular package, without extracting it."""
+    directory = loader.package_directory(src_file.package)
+    if directory is None:
+        return None
+    return os.path.join(directory, src_file.resource)
+
+
+def _stat_matches(path, size, mtime_ns) -> bool:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return stat.st_size == size and stat.st_mtime_ns == mtime_ns
+
+
+def _manifest_entry_valid(entry, src_file: loader.FileResource, dst_path) -> bool:
+    """Check that neither the source nor the target file changed since the copy."""
+    return (
+        entry["source"] == _resource_file(src_file)
+        and _stat_matches(entry["source"], entry["size"], entry["mtime_ns"])
+        and _stat_matches(dst_path, entry["target_size"], entry["target_mtime_ns"])
+    )
+
+
+def _copy_source_file(src_path: str, dst_path: str, entry, mode: str) -> Dict[str, Any]:
+    """Copy a source file to the build directory and return its manifest entry."""
+    with open(src_path, "rb") as f_handle:
+        digest = hashlib.sha256(f_handle.read()).hexdigest()
+    if (
+        entry is None
+        or entry["hash"] != digest
+        or not _stat_matches(dst_path, entry["target_size"], entry["target_mtime_ns"])
+    ):
+        # Only the modification time changed if the hash and the target are the same
+        link_file_if_changed(src_path, dst_path, mode)
+    src_stat = os.stat(src_path)
+    dst_stat = os.stat(dst_path)
+    return {
+        "source": src_path,
+        "size": src_stat.st_size,
+        "mtime_ns": src_stat.st_mtime_ns,
+        "hash": digest,
+        "target_size": dst_stat.st_size,
+        "target_mtime_ns": dst_stat.st_mtime_ns,
+    }
+
+
 def generate_defines_h():
     define_content_l = [x.as_macro for x in CORE.defines]
     define_content_l.sort()
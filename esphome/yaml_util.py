@@ -1,16 +1,20 @@
+import copy
 import fnmatch
 import functools
+import hashlib
 import inspect
+import io
 import logging
 import math
 import os
+import time
 
 import uuid
 import yaml
 import yaml.constructor
 
 from esphome import core
-from esphome.config_helpers import read_config_file
+from esphome.config_helpers import is_editor_file, read_config_file
 from esphome.core import (
     EsphomeError,
     IPAddress,
@@ -30,6 +34,23 @@ _LOGGER = logging.getLogger(__name__)
 SECRET_YAML = "secrets.yaml"
 _SECRET_CACHE = {}
 _SECRET_VALUES = {}
+# Everything the last load_yaml() call depended on: the files read (with the hash of
+# their content, also the files validators read), the file listings of included
+# directories and the environment variables used
+_LOADED_FILES = {}
+_INCLUDED_DIRS = {}
+_ENV_VARS = {}
+_SOURCES = (_LOADED_FILES, _INCLUDED_DIRS, _ENV_VARS, _SECRET_VALUES)
+_FILES, _DIRS, _ENV, _SECRETS = range(len(_SOURCES))
+
+# Parsed documents by absolute path, kept across load_yaml() calls so that the
+# dashboard validation loop doesn't parse unchanged includes again and again
+_DOCUMENT_CACHE = {}
+# The documents currently being loaded (outermost first)
+_LOADING = []
+# Files modified less than this long ago are not cached, a later write to them might
+# not change their mtime on file systems with a coarse timestamp resolution.
+_MTIME_RESOLUTION_NS = 2_000_000_000
 
 
 class ESPHomeDataBase:
@@ -45,7 +66,8 @@ class ESPHomeDataBase:
         # pylint: disable=attribute-defined-outside-init
         self._esp_range = DocumentRange.from_marks(node.start_mark, node.end_mark)
         if isinstance(node, yaml.ScalarNode):
-            if node.style is not None and node.style in "|>":
+            # libyaml reports plain scalars with an empty style instead of None
+            if node.style in ("|", ">"):
                 self._content_offset = 1
 
     def from_database(self, database):
@@ -88,8 +110,8 @@ def _add_data_ref(fn):
     return wrapped
 
 
-class ESPHomeLoader(yaml.SafeLoader):  # pylint: disable=too-many-ancestors
-    """Loader class that keeps track of line numbers."""
+class ESPHomeLoaderMixin:
+    """Mixin for the loader classes that keeps track of line numbers."""
 
     @_add_data_ref
     def construct_yaml_int(self, node):
@@ -222,6 +244,7 @@ class ESPHomeLoader(yaml.SafeLoader):  # pylint: disable=too-many-ancestors
     @_add_data_ref
     def construct_env_var(self, node):
         args = node.value.split()
+        _record_source(_ENV, args[0], os.environ.get(args[0]))
         # Check for a default value
         if len(args) > 1:
             return os.getenv(args[0], " ".join(args[1:]))
@@ -246,7 +269,7 @@ class ESPHomeLoader(yaml.SafeLoader):  # pylint: disable=too-many-ancestors
                 f"Secret '{node.value}' not defined", node.start_mark
             )
         val = secrets[node.value]
-        _SECRET_VALUES[str(val)] = node.value
+        _record_source(_SECRETS, str(val), node.value)
         return val
 
     @_add_data_ref
@@ -255,12 +278,12 @@ class ESPHomeLoader(yaml.SafeLoader):  # pylint: disable=too-many-ancestors
 
     @_add_data_ref
     def construct_include_dir_list(self, node):
-        files = filter_yaml_files(_find_files(self._rel_path(node.value), "*.yaml"))
+        files = _find_included_files(self._rel_path(node.value))
         return [_load_yaml_internal(f) for f in files]
 
     @_add_data_ref
     def construct_include_dir_merge_list(self, node):
-        files = filter_yaml_files(_find_files(self._rel_path(node.value), "*.yaml"))
+        files = _find_included_files(self._rel_path(node.value))
         merged_list = []
         for fname in files:
             loaded_yaml = _load_yaml_internal(fname)
@@ -270,7 +293,7 @@ class ESPHomeLoader(yaml.SafeLoader):  # pylint: disable=too-many-ancestors
 
     @_add_data_ref
     def construct_include_dir_named(self, node):
-        files = filter_yaml_files(_find_files(self._rel_path(node.value), "*.yaml"))
+        files = _find_included_files(self._rel_path(node.value))
         mapping = OrderedDict()
         for fname in files:
             filename = os.path.splitext(os.path.basename(fname))[0]
@@ -279,7 +302,7 @@ class ESPHomeLoader(yaml.SafeLoader):  # pylint: disable=too-many-ancestors
 
     @_add_data_ref
     def construct_include_dir_merge_named(self, node):
-        files = filter_yaml_files(_find_files(self._rel_path(node.value), "*.yaml"))
+        files = _find_included_files(self._rel_path(node.value))
         mapping = OrderedDict()
         for fname in files:
             loaded_yaml = _load_yaml_internal(fname)
@@ -297,47 +320,115 @@ class ESPHomeLoader(yaml.SafeLoader):  # pylint: disable=too-many-ancestors
         return add_class_to_obj(obj, ESPForceValue)
 
 
-ESPHomeLoader.add_constructor("tag:yaml.org,2002:int", ESPHomeLoader.construct_yaml_int)
-ESPHomeLoader.add_constructor(
-    "tag:yaml.org,2002:float", ESPHomeLoader.construct_yaml_float
-)
-ESPHomeLoader.add_constructor(
-    "tag:yaml.org,2002:binary", ESPHomeLoader.construct_yaml_binary
-)
-ESPHomeLoader.add_constructor(
-    "tag:yaml.org,2002:omap", ESPHomeLoader.construct_yaml_omap
-)
-ESPHomeLoader.add_constructor("tag:yaml.org,2002:str", ESPHomeLoader.construct_yaml_str)
-ESPHomeLoader.add_constructor("tag:yaml.org,2002:seq", ESPHomeLoader.construct_yaml_seq)
-ESPHomeLoader.add_constructor("tag:yaml.org,2002:map", ESPHomeLoader.construct_yaml_map)
-ESPHomeLoader.add_constructor("!env_var", ESPHomeLoader.construct_env_var)
-ESPHomeLoader.add_constructor("!secret", ESPHomeLoader.construct_secret)
-ESPHomeLoader.add_constructor("!include", ESPHomeLoader.construct_include)
-ESPHomeLoader.add_constructor(
-    "!include_dir_list", ESPHomeLoader.construct_include_dir_list
-)
-ESPHomeLoader.add_constructor(
-    "!include_dir_merge_list", ESPHomeLoader.construct_include_dir_merge_list
-)
-ESPHomeLoader.add_constructor(
-    "!include_dir_named", ESPHomeLoader.construct_include_dir_named
-)
-ESPHomeLoader.add_constructor(
-    "!include_dir_merge_named", ESPHomeLoader.construct_include_dir_merge_named
-)
-ESPHomeLoader.add_constructor("!lambda", ESPHomeLoader.construct_lambda)
-ESPHomeLoader.add_constructor("!force", ESPHomeLoader.construct_force)
+class ESPHomePurePythonLoader(
+    ESPHomeLoaderMixin, yaml.SafeLoader
+):  # pylint: disable=too-many-ancestors
+    """Loader class using the pure Python YAML parser."""
+
+
+try:
+    from yaml import CSafeLoader as _CSafeLoader
+
+    class ESPHomeLoader(
+        ESPHomeLoaderMixin, _CSafeLoader
+    ):  # pylint: disable=too-many-ancestors
+        """Loader class using the libyaml parser, which is a lot faster."""
+
+except ImportError:
+    # PyYAML was built without libyaml
+    ESPHomeLoader = ESPHomePurePythonLoader
+
+
+for _loader in {ESPHomePurePythonLoader, ESPHomeLoader}:
+    _loader.add_constructor(
+        "tag:yaml.org,2002:int", ESPHomeLoaderMixin.construct_yaml_int
+    )
+    _loader.add_constructor(
+        "tag:yaml.org,2002:float", ESPHomeLoaderMixin.construct_yaml_float
+    )
+    _loader.add_constructor(
+        "tag:yaml.org,2002:binary", ESPHomeLoaderMixin.construct_yaml_binary
+    )
+    _loader.add_constructor(
+        "tag:yaml.org,2002:omap", ESPHomeLoaderMixin.construct_yaml_omap
+    )
+    _loader.add_constructor(
+        "tag:yaml.org,2002:str", ESPHomeLoaderMixin.construct_yaml_str
+    )
+    _loader.add_constructor(
+        "tag:yaml.org,2002:seq", ESPHomeLoaderMixin.construct_yaml_seq
+    )
+    _loader.add_constructor(
+        "tag:yaml.org,2002:map", ESPHomeLoaderMixin.construct_yaml_map
+    )
+    _loader.add_constructor("!env_var", ESPHomeLoaderMixin.construct_env_var)
+    _loader.add_constructor("!secret", ESPHomeLoaderMixin.construct_secret)
+    _loader.add_constructor("!include", ESPHomeLoaderMixin.construct_include)
+    _loader.add_constructor(
+        "!include_dir_list", ESPHomeLoaderMixin.construct_include_dir_list
+    )
+    _loader.add_constructor(
+        "!include_dir_merge_list", ESPHomeLoaderMixin.construct_include_dir_merge_list
+    )
+    _loader.add_constructor(
+        "!include_dir_named", ESPHomeLoaderMixin.construct_include_dir_named
+    )
+    _loader.add_constructor(
+        "!include_dir_merge_named",
+        ESPHomeLoaderMixin.construct_include_dir_merge_named,
+    )
+    _loader.add_constructor("!lambda", ESPHomeLoaderMixin.construct_lambda)
+    _loader.add_constructor("!force", ESPHomeLoaderMixin.construct_force)
 
 
 def load_yaml(fname):
     _SECRET_VALUES.clear()
     _SECRET_CACHE.clear()
+    _LOADED_FILES.clear()
+    _INCLUDED_DIRS.clear()
+    _ENV_VARS.clear()
     return _load_yaml_internal(fname)
 
 
 def _load_yaml_internal(fname):
+    path = os.path.abspath(fname)
+    cached = _DOCUMENT_CACHE.get(path)
+    if cached is not None and cached.is_valid():
+        cached.replay()
+        return _copy_data(cached.data)
+
+    document = _LoadedDocument()
+    _LOADING.append(document)
+    try:
+        document.data = _parse_yaml_file(fname)
+    finally:
+        _LOADING.pop()
+    if document.cacheable:
+        _DOCUMENT_CACHE[path] = document
+        return _copy_data(document.data)
+    _DOCUMENT_CACHE.pop(path, None)
+    return document.data
+
+
+def _parse_yaml_file(fname):
+    path = os.path.abspath(fname)
+    if is_editor_file(fname):
+        for document in _LOADING:
+            document.cacheable = False
+    else:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            # Let read_config_file() report the error
+            stat = None
+        for document in _LOADING:
+            document.add_file(path, stat)
     content = read_config_file(fname)
-    loader = ESPHomeLoader(content)
+    _record_source(_FILES, path, hash_content(content))
+    # libyaml takes the file name for its marks from the stream
+    stream = io.StringIO(content)
+    stream.name = fname
+    loader = ESPHomeLoader(stream)
     loader.name = fname
     try:
         return loader.get_single_data() or OrderedDict()
@@ -347,6 +438,87 @@ def _load_yaml_internal(fname):
         loader.dispose()
 
 
+def _record_source(index, key, value):
+    """Record something a config depends on in _SOURCES[index].
+
+    Also records it for all documents currently being loaded, so that it can be
+    replayed when the cached document is used again.
+    """
+    _SOURCES[index][key] = value
+    for document in _LOADING:
+        document.sources[index][key] = value
+
+
+class _LoadedDocument:
+    """A parsed YAML file, with everything that loading it depended on."""
+
+    def __init__(self):
+        self.data = None
+        self.cacheable = True
+        # The (mtime, size) of all files read, by absolute path
+        self.stats = {}
+        self.sources = tuple({} for _ in _SOURCES)
+
+    def add_file(self, path, stat):
+        if stat is None or time.time_ns() - stat.st_mtime_ns < _MTIME_RESOLUTION_NS:
+            self.cacheable = False
+            return
+        self.stats[path] = (stat.st_mtime_ns, stat.st_size)
+
+    def is_valid(self):
+        for path, stat_key in self.stats.items():
+            if is_editor_file(path):
+                return False
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return False
+            if (stat.st_mtime_ns, stat.st_size) != stat_key:
+                return False
+        for directory, files in self.sources[_DIRS].items():
+            if list_included_files(directory) != files:
+                return False
+        return all(
+            os.environ.get(key) == value for key, value in self.sources[_ENV].items()
+        )
+
+    def replay(self):
+        """Record the sources of this document as if it had been loaded again."""
+        for index, recorded in enumerate(self.sources):
+            for key, value in recorded.items():
+                _record_source(index, key, value)
+        for document in _LOADING:
+            document.stats.update(self.stats)
+
+
+# Values of exactly these types can't be changed, so copies can share them
+_IMMUTABLE_TYPES = (str, int, float, bool, bytes, type(None))
+
+
+def _copy_data(value, memo=None):
+    """Copy a parsed document, so that it can be modified without changing the cache.
+
+    Only plain immutable values are shared with the cached document. Subclasses such
+    as the ESPHomeDataBase strings are copied too, validation changes them in place
+    (add_class_to_obj, cv.enum).
+    """
+    if memo is None:
+        memo = {}
+    if type(value) in _IMMUTABLE_TYPES:  # pylint: disable=unidiomatic-typecheck
+        return value
+    if id(value) in memo:
+        return memo[id(value)]
+    res = copy.copy(value)
+    memo[id(value)] = res
+    if isinstance(res, dict):
+        for key, item in res.items():
+            res[key] = _copy_data(item, memo)
+    elif isinstance(res, list):
+        for i, item in enumerate(res):
+            res[i] = _copy_data(item, memo)
+    return res
+
+
 def dump(dict_):
     """Dump YAML to a string and remove null."""
     return yaml.dump(
@@ -354,6 +526,59 @@ def dump(dict_):
     )
 
 
+def hash_content(content):
+    """Hash the content of a config file, as read by read_config_file()."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+def list_included_files(directory):
+    """Return the YAML files an !include_dir_* tag for directory includes."""
+    return filter_yaml_files(_find_files(directory, "*.yaml"))
+
+
+def _find_included_files(directory):
+    files = list_included_files(directory)
+    _record_source(_DIRS, os.path.abspath(directory), files)
+    return files
+
+
+def record_file(path):
+    """Record a file a validator depends on, like the files the loader read.
+
+    Its hash is None if it can't be read.
+    """
+    path = os.path.abspath(path)
+    try:
+        with open(path, "rb") as f_handle:
+            digest = hash_content(f_handle.read())
+    except OSError:
+        digest = None
+    _record_source(_FILES, path, digest)
+
+
+def loaded_sources():
+    """Return what the last load_yaml() call read.
+
+    A tuple of the hashes of the files read (including those of record_file()), the YAML files found in each included
+    directory, the environment variables used and the secret values (to hide them
+    in dumps).
+    """
+    return (
+        dict(_LOADED_FILES),
+        {k: list(v) for k, v in _INCLUDED_DIRS.items()},
+        dict(_ENV_VARS),
+        dict(_SECRET_VALUES),
+    )
+
+
+def restore_secret_values(secret_values):
+    """Restore the secret values of a config loaded without load_yaml()."""
+    _SECRET_VALUES.clear()
+    _SECRET_VALUES.update(secret_values)
+
+
 def _is_file_valid(name):
     """Decide if a file is valid."""
     return not name.startswith(".")
@@ -1,3 +1,4 @@
+import atexit
 import socket
 import threading
 import time
@@ -19,42 +20,49 @@ from zeroconf._services import ServiceStateChange
 _CLASS_IN = 1
 _FLAGS_QR_QUERY = 0x0000  # query
 _TYPE_A = 1
+_TYPE_AAAA = 28
 _LOGGER = logging.getLogger(__name__)
 
 
 class HostResolver(RecordUpdateListener):
-    def __init__(self, name: str):
+    def __init__(self, name: str, record_type: int = _TYPE_A):
         self.name = name
+        self.record_type = record_type
         self.address: Optional[bytes] = None
+        self._resolved = threading.Event()
 
     def update_record(self, zc: Zeroconf, now: float, record: DNSRecord) -> None:
         if record is None:
             return
-        if record.type == _TYPE_A:
+        if record.type == self.record_type:
             assert isinstance(record, DNSAddress)
             if record.name == self.name:
                 self.address = record.address
+                self._resolved.set()
 
     def request(self, zc: Zeroconf, timeout: float) -> bool:
         now = time.time()
         delay = 0.2
-        next_ = now + delay
+        next_ = now
         last = now + timeout
 
         try:
-            zc.add_listener(self, None)
+            # With the question, records already in the cache are reported right away
+            zc.add_listener(self, DNSQuestion(self.name, self.record_type, _CLASS_IN))
             while self.address is None:
                 if last <= now:
                     # Timeout
                     return False
                 if next_ <= now:
                     out = DNSOutgoing(_FLAGS_QR_QUERY)
-                    out.add_question(DNSQuestion(self.name, _TYPE_A, _CLASS_IN))
+                    out.add_question(
+                        DNSQuestion(self.name, self.record_type, _CLASS_IN)
+                    )
                     zc.send(out)
                     next_ = now + delay
                     delay *= 2
 
-                time.sleep(min(next_, last) - now)
+                self._resolved.wait(min(next_, last) - now)
                 now = time.time()
         finally:
             zc.remove_listener(self)
@@ -188,3 +196,27 @@ class EsphomeZeroconf(Zeroconf):
         if info.request(self, timeout):
             return socket.inet_ntoa(info.address)
         return None
+
+    def resolve_host6(self, host: str, timeout=3.0):
+        info = HostResolver(host, _TYPE_AAAA)
+        if info.request(self, timeout):
+            return socket.inet_ntop(socket.AF_INET6, info.address)
+        return None
+
+
+_SHARED_ZEROCONF: Optional[EsphomeZeroconf] = None
+_SHARED_ZEROCONF_LOCK = threading.Lock()
+
+
+def shared_zeroconf() -> EsphomeZeroconf:
+    """Return a Zeroconf instance for the whole process, closed at exit.
+
+    Starting Zeroconf binds sockets and spawns threads, and its cache only helps
+    if it outlives a single lookup.
+    """
+    global _SHARED_ZEROCONF  # pylint: disable=global-statement
+    with _SHARED_ZEROCONF_LOCK:
+        if _SHARED_ZEROCONF is None:
+            _SHARED_ZEROCONF = EsphomeZeroconf()
+            atexit.register(_SHARED_ZEROCONF.close)
+        return _SHARED_ZEROCONF
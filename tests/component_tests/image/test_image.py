@@ -0,0 +1,83 @@
+"""Tests for the pixel packing of the image, animation and font components."""
+
+import random
+
+import pytest
+
+from esphome.components import font, image
+
+PIL = pytest.importorskip("PIL")
+from PIL import Image, ImageFont  # noqa: E402 pylint: disable=wrong-import-position
+
+
+def reference_image_bytes(img, image_type, dither):
+    """The original per pixel implementation of image_to_bytes."""
+    width, height = img.size
+    if image_type == "GRAYSCALE":
+        return bytes(img.convert("L", dither=dither).getdata())
+    if image_type == "RGB24":
+        return bytes(c for pix in img.convert("RGB").getdata() for c in pix)
+    img = img.convert("1", dither=dither)
+    width8 = ((width + 7) // 8) * 8
+    data = [0 for _ in range(height * width8 // 8)]
+    for y in range(height):
+        for x in range(width):
+            if img.getpixel((x, y)):
+                continue
+            pos = x + y * width8
+            data[pos // 8] |= 0x80 >> (pos % 8)
+    return bytes(data)
+
+
+def reference_mask_bytes(mask):
+    """The original per pixel implementation of mask_to_bytes."""
+    width, height = mask.size
+    width8 = ((width + 7) // 8) * 8
+    data = [0] * (height * width8 // 8)
+    for y in range(height):
+        for x in range(width):
+            if not mask.getpixel((x, y)):
+                continue
+            pos = x + y * width8
+            data[pos // 8] |= 0x80 >> (pos % 8)
+    return bytes(data)
+
+
+def random_image(width, height, mode="RGB"):
+    rand = random.Random(width * 1000 + height)
+    img = Image.new("RGB", (width, height))
+    img.putdata(
+        [
+            (rand.randrange(256), rand.randrange(256), rand.randrange(256))
+            for _ in range(width * height)
+        ]
+    )
+    return img.convert(mode)
+
+
+@pytest.mark.parametrize("image_type", ("BINARY", "GRAYSCALE", "RGB24"))
+@pytest.mark.parametrize("dither", ("NONE", "FLOYDSTEINBERG"))
+@pytest.mark.parametrize("size", ((1, 1), (8, 3), (13, 7), (64, 17)))
+@pytest.mark.parametrize("mode", ("RGB", "RGBA", "L", "1", "P"))
+def test_image_to_bytes(image_type, dither, size, mode):
+    img = random_image(*size, mode=mode)
+    dither = getattr(Image, dither)
+
+    actual = image.image_to_bytes(img, image_type, dither)
+
+    assert actual == reference_image_bytes(img, image_type, dither)
+
+
+@pytest.mark.parametrize("size", (10, 23))
+def test_mask_to_bytes(size):
+    ttf = ImageFont.load_default()
+    if not hasattr(ttf, "font_variant"):
+        pytest.skip("Pillow without FreeType support")
+    ttf = ttf.font_variant(size=size)
+
+    for glyph in "! AgW%äΩ":
+        mask = ttf.getmask(glyph, mode="1")
+
+        actual = font.mask_to_bytes(mask)
+
+        assert actual == reference_mask_bytes(mask), glyph
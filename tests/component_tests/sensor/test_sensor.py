@@ -1,5 +1,10 @@
 """Tests for the sensor component."""
 
+import pytest
+
+import esphome.config_validation as cv
+from esphome.components import sensor
+
 
 def test_sensor_device_class_set(generate_main):
     """
@@ -12,3 +17,35 @@ def test_sensor_device_class_set(generate_main):
 
     # Then
     assert 's_1->set_device_class("voltage");' in main_cpp
+
+
+def test_sensor_filter_window_size(generate_main):
+    """
+    The window size of sliding window filters is a template argument, so the window is stored in the filter
+    """
+    # Given
+
+    # When
+    main_cpp = generate_main("tests/component_tests/sensor/test_sensor.yaml")
+
+    # Then
+    assert "new sensor::MedianFilter<7>(4, 1)" in main_cpp
+    assert "new sensor::SlidingWindowMovingAverageFilter<20>(10, 1)" in main_cpp
+
+
+@pytest.mark.parametrize("window_size", (0, 100000, "many"))
+@pytest.mark.parametrize(
+    "schema",
+    (
+        sensor.MEDIAN_SCHEMA,
+        sensor.MIN_SCHEMA,
+        sensor.MAX_SCHEMA,
+        sensor.SLIDING_AVERAGE_SCHEMA,
+    ),
+)
+def test_sensor_filter_window_size_invalid(schema, window_size):
+    """
+    The window is allocated at boot, so a huge window_size is rejected instead of running out of memory
+    """
+    with pytest.raises(cv.Invalid, match="between 1 and 1000"):
+        schema({"window_size": window_size, "send_every": 1})
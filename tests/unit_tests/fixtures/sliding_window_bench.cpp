@@ -0,0 +1,171 @@
+// Host harness for esphome/components/sensor/sliding_window.h, see test_sensor_sliding_window.py
+//
+//   sliding_window_bench check
+//     Compares the windows with the deque based implementation the filters used before, prints "ok".
+//   sliding_window_bench bench <window_size> <samples>
+//     Prints "<filter> <old ns per sample> <new ns per sample>" for the median, min and max filters.
+
+#include "sliding_window.h"
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <deque>
+#include <random>
+#include <string>
+#include <vector>
+
+using esphome::sensor::IndexedValue;
+using esphome::sensor::MaxWindow;
+using esphome::sensor::MinWindow;
+using esphome::sensor::SortedWindow;
+
+namespace {
+
+// The windows of the median, min and max filters before the sliding windows
+struct DequeWindow {
+  std::deque<float> queue;
+  size_t window_size;
+
+  void push(float value) {
+    while (this->queue.size() >= this->window_size)
+      this->queue.pop_front();
+    this->queue.push_back(value);
+  }
+  float median() const {
+    std::deque<float> median_queue = this->queue;
+    std::sort(median_queue.begin(), median_queue.end());
+    size_t size = median_queue.size();
+    if (size % 2)
+      return median_queue[size / 2];
+    return (median_queue[size / 2] + median_queue[size / 2 - 1]) / 2.0f;
+  }
+  float min() const { return *std::min_element(this->queue.begin(), this->queue.end()); }
+  float max() const { return *std::max_element(this->queue.begin(), this->queue.end()); }
+};
+
+std::vector<float> samples(size_t count, unsigned seed, int distinct) {
+  std::mt19937 rng(seed);
+  std::uniform_int_distribution<int> dist(0, distinct - 1);
+  std::vector<float> values(count);
+  for (auto &value : values)
+    value = dist(rng) * 0.25f - 10.0f;
+  return values;
+}
+
+bool check(size_t window_size, const std::vector<float> &values, size_t resize_at, size_t resize_to) {
+  // The windows can grow up to their capacity
+  size_t capacity = std::max(window_size, resize_to);
+  std::vector<float> sorted_values(capacity), sorted_storage(capacity);
+  std::vector<IndexedValue> min_entries(capacity), max_entries(capacity);
+  DequeWindow reference{{}, window_size};
+  SortedWindow sorted(sorted_values.data(), sorted_storage.data(), capacity);
+  MinWindow min(min_entries.data(), capacity);
+  MaxWindow max(max_entries.data(), capacity);
+  sorted.set_window_size(window_size);
+  min.set_window_size(window_size);
+  max.set_window_size(window_size);
+  for (size_t i = 0; i < values.size(); i++) {
+    if (i == resize_at) {
+      reference.window_size = resize_to;
+      while (reference.queue.size() > resize_to)
+        reference.queue.pop_front();
+      sorted.set_window_size(resize_to);
+      min.set_window_size(resize_to);
+      max.set_window_size(resize_to);
+    }
+    reference.push(values[i]);
+    sorted.push(values[i]);
+    min.push(values[i]);
+    max.push(values[i]);
+    if (sorted.median() != reference.median() || min.front() != reference.min() || max.front() != reference.max()) {
+      std::printf("window %zu, resize %zu at %zu: mismatch at sample %zu\n", window_size, resize_to, resize_at, i);
+      return false;
+    }
+  }
+  return true;
+}
+
+template<typename F> double ns_per_sample(const std::vector<float> &values, F &&push) {
+  volatile float sink = 0.0f;
+  auto start = std::chrono::steady_clock::now();
+  for (float value : values)
+    sink = push(value);
+  auto elapsed = std::chrono::steady_clock::now() - start;
+  (void) sink;
+  return std::chrono::duration<double, std::nano>(elapsed).count() / values.size();
+}
+
+void bench(size_t window_size, size_t count) {
+  std::vector<float> values = samples(count, 1, 4096);
+  {
+    DequeWindow reference{{}, window_size};
+    std::vector<float> sorted_values(window_size), sorted_storage(window_size);
+    SortedWindow sorted(sorted_values.data(), sorted_storage.data(), window_size);
+    double before = ns_per_sample(values, [&](float value) {
+      reference.push(value);
+      return reference.median();
+    });
+    double after = ns_per_sample(values, [&](float value) {
+      sorted.push(value);
+      return sorted.median();
+    });
+    std::printf("median %.1f %.1f\n", before, after);
+  }
+  {
+    DequeWindow reference{{}, window_size};
+    std::vector<IndexedValue> entries(window_size);
+    MinWindow min(entries.data(), window_size);
+    double before = ns_per_sample(values, [&](float value) {
+      reference.push(value);
+      return reference.min();
+    });
+    double after = ns_per_sample(values, [&](float value) {
+      min.push(value);
+      return min.front();
+    });
+    std::printf("min %.1f %.1f\n", before, after);
+  }
+  {
+    DequeWindow reference{{}, window_size};
+    std::vector<IndexedValue> entries(window_size);
+    MaxWindow max(entries.data(), window_size);
+    double before = ns_per_sample(values, [&](float value) {
+      reference.push(value);
+      return reference.max();
+    });
+    double after = ns_per_sample(values, [&](float value) {
+      max.push(value);
+      return max.front();
+    });
+    std::printf("max %.1f %.1f\n", before, after);
+  }
+}
+
+}  // namespace
+
+int main(int argc, char **argv) {
+  std::string mode = argc > 1 ? argv[1] : "check";
+  if (mode == "bench" && argc == 4) {
+    bench(std::strtoul(argv[2], nullptr, 10), std::strtoul(argv[3], nullptr, 10));
+    return 0;
+  }
+  if (mode != "check")
+    return 2;
+
+  unsigned seed = 0;
+  for (size_t window_size : {1, 2, 3, 5, 8, 50, 200}) {
+    // Few distinct values to exercise ties
+    for (int distinct : {3, 1000}) {
+      std::vector<float> values = samples(1000, seed++, distinct);
+      for (size_t resize_to : {window_size, size_t(1), window_size / 2 + 1, window_size * 2}) {
+        for (size_t resize_at : {size_t(0), window_size / 2, size_t(600)}) {
+          if (!check(window_size, values, resize_at, resize_to))
+            return 1;
+        }
+      }
+    }
+  }
+  std::printf("ok\n");
+  return 0;
+}
@@ -0,0 +1,121 @@
+import os
+
+import pytest
+
+from esphome import asset_cache
+from esphome.core import CORE
+
+pytest.importorskip("PIL")
+
+
+@pytest.fixture
+def asset(tmp_path):
+    CORE.config_path = str(tmp_path / "test.yaml")
+    path = tmp_path / "image.png"
+    path.write_bytes(b"image data")
+
+    yield path
+
+    CORE.reset()
+
+
+@pytest.fixture
+def generate():
+    calls = []
+
+    def generate_(value=b"packed"):
+        def inner():
+            calls.append(value)
+            return 10, 20, value
+
+        return inner
+
+    generate_.calls = calls
+    return generate_
+
+
+def cache_entries():
+    return sorted(os.listdir(asset_cache.asset_cache_dir()))
+
+
+def test_cached_asset(asset, generate):
+    first = asset_cache.cached_asset("image", str(asset), {"size": 1}, generate())
+
+    second = asset_cache.cached_asset("image", str(asset), {"size": 1}, generate())
+
+    assert first == second == (10, 20, b"packed")
+    assert generate.calls == [b"packed"]
+    assert len(cache_entries()) == 1
+
+
+@pytest.mark.parametrize(
+    "kind, options",
+    (
+        ("font", {"size": 1}),
+        ("image", {"size": 2}),
+        ("image", {"size": 1, "dither": "NONE"}),
+    ),
+)
+def test_cached_asset_key(asset, generate, kind, options):
+    asset_cache.cached_asset("image", str(asset), {"size": 1}, generate())
+
+    asset_cache.cached_asset(kind, str(asset), options, generate())
+
+    assert len(generate.calls) == 2
+
+
+def test_cached_asset_file_changed(asset, generate):
+    asset_cache.cached_asset("image", str(asset), {}, generate())
+
+    asset.write_bytes(b"other image data")
+    actual = asset_cache.cached_asset("image", str(asset), {}, generate(b"other"))
+
+    assert actual == (10, 20, b"other")
+
+
+def test_cached_asset_missing_file(asset, generate):
+    asset.unlink()
+
+    asset_cache.cached_asset("image", str(asset), {}, generate())
+    asset_cache.cached_asset("image", str(asset), {}, generate())
+
+    assert len(generate.calls) == 2
+    assert not os.path.exists(asset_cache.asset_cache_dir())
+
+
+def test_cached_asset_corrupt_entry(asset, generate):
+    asset_cache.cached_asset("image", str(asset), {}, generate())
+    (entry,) = cache_entries()
+    with open(os.path.join(asset_cache.asset_cache_dir(), entry), "wb") as f_handle:
+        f_handle.write(b"garbage")
+
+    actual = asset_cache.cached_asset("image", str(asset), {}, generate())
+
+    assert actual == (10, 20, b"packed")
+    assert len(generate.calls) == 2
+
+
+def test_cached_asset_eviction(asset, generate, monkeypatch):
+    monkeypatch.setattr(asset_cache, "MAX_CACHE_SIZE", 2500)
+
+    def load(size):
+        return asset_cache.cached_asset(
+            "image", str(asset), {"size": size}, generate(bytes([size]) * 1000)
+        )
+
+    load(0)
+    load(1)
+    for entry in cache_entries():
+        os.utime(os.path.join(asset_cache.asset_cache_dir(), entry), (0, 0))
+    # Use the first entry again, so the second one is the least recently used
+    load(0)
+
+    load(2)
+
+    assert len(cache_entries()) == 2
+    generate.calls.clear()
+    load(0)
+    load(2)
+    assert generate.calls == []
+    load(1)
+    assert generate.calls == [bytes([1]) * 1000]
@@ -0,0 +1,76 @@
+"""Codegen benchmark with large synthetic configurations.
+
+By default only a small configuration is generated so the unit test suite stays fast.
+Set the ``ESPHOME_BENCHMARK`` environment variable to also run the 10k sensor
+configuration. Timings are reported as test properties (``--junitxml``) so they can be
+tracked over time.
+"""
+import os
+import time
+
+import pytest
+
+from esphome.__main__ import generate_cpp_contents
+from esphome.config import read_config
+from esphome.core import CORE
+
+BENCHMARK = bool(os.environ.get("ESPHOME_BENCHMARK"))
+
+
+def synthetic_config(num_sensors: int) -> str:
+    """Generate a config with `num_sensors` template sensors.
+
+    Every sensor refers to the next one in its lambda, so most code generation
+    jobs have to wait for a variable that has not been registered yet.
+    """
+    lines = [
+        "esphome:",
+        "  name: benchmark",
+        "  platform: ESP8266",
+        "  board: d1_mini_lite",
+        "",
+        "sensor:",
+    ]
+    for i in range(num_sensors):
+        lines += [
+            "  - platform: template",
+            f"    id: sensor_{i}",
+            f'    name: "Sensor {i}"',
+            f'    lambda: "return id(sensor_{(i + 1) % num_sensors}).state;"',
+        ]
+    return "\n".join(lines) + "\n"
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    yield tmp_path / "benchmark.yaml"
+
+    CORE.reset()
+
+
+@pytest.mark.parametrize(
+    "num_sensors",
+    (
+        100,
+        pytest.param(
+            10000,
+            marks=pytest.mark.skipif(
+                not BENCHMARK, reason="set ESPHOME_BENCHMARK to run"
+            ),
+        ),
+    ),
+)
+def test_codegen_synthetic_sensors(config_path, record_property, num_sensors):
+    config_path.write_text(synthetic_config(num_sensors))
+    CORE.config_path = str(config_path)
+
+    start = time.perf_counter()
+    CORE.config = read_config({})
+    validated = time.perf_counter()
+    generate_cpp_contents(CORE.config)
+    generated = time.perf_counter()
+
+    record_property("validation_seconds", validated - start)
+    record_property("codegen_seconds", generated - validated)
+    assert len(CORE.variables) >= num_sensors
+    assert f"return sensor_{num_sensors - 1}->state;" in CORE.cpp_main_section
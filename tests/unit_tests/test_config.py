@@ -0,0 +1,288 @@
+import pytest
+
+from esphome import config, yaml_util
+from esphome.core import CORE
+
+BASE_CONFIG = """
+esphome:
+  name: test
+  platform: ESP8266
+  board: d1_mini_lite
+"""
+
+
+@pytest.fixture
+def validate(tmp_path):
+    def validator(text: str, session=None, base=BASE_CONFIG) -> config.Config:
+        path = tmp_path / "test.yaml"
+        path.write_text(base + text)
+        CORE.reset()
+        CORE.config_path = str(path)
+        return config.validate_config(yaml_util.load_yaml(str(path)), {}, session)
+
+    yield validator
+
+    CORE.reset()
+
+
+def error_messages(result):
+    return [err.msg for err in result.errors]
+
+
+class TestIDPassValidationStep:
+    def test_redefined_id(self, validate):
+        result = validate(
+            """
+sensor:
+  - platform: template
+    id: my_sensor
+  - platform: template
+    id: my_sensor
+"""
+        )
+
+        assert error_messages(result) == ["ID my_sensor redefined! Check sensor->0->id"]
+
+    def test_missing_id_suggests_similar(self, validate):
+        result = validate(
+            """
+sensor:
+  - platform: template
+    id: my_sensor
+interval:
+  - interval: 1s
+    then:
+      - sensor.template.publish:
+          id: my_sensr
+          state: 1
+"""
+        )
+
+        assert error_messages(result) == [
+            "Couldn't find ID 'my_sensr'. Please check you have defined an ID "
+            'with that name in your configuration. These IDs look similar: "my_sensor".'
+        ]
+
+    def test_wrong_type(self, validate):
+        result = validate(
+            """
+binary_sensor:
+  - platform: template
+    id: my_binary_sensor
+interval:
+  - interval: 1s
+    then:
+      - sensor.template.publish:
+          id: my_binary_sensor
+          state: 1
+"""
+        )
+
+        assert error_messages(result) == [
+            "ID 'my_binary_sensor' of type template_::TemplateBinarySensor doesn't "
+            "inherit from sensor::Sensor. Please double check your ID is pointing to "
+            "the correct value"
+        ]
+
+    def test_auto_id_too_many_candidates(self, validate):
+        result = validate(
+            """
+i2c:
+  - id: bus_a
+    sda: 4
+    scl: 5
+  - id: bus_b
+    sda: 12
+    scl: 13
+sensor:
+  - platform: tmp102
+    name: Temperature
+"""
+        )
+
+        assert error_messages(result) == [
+            "Too many candidates found for 'i2c_id' type 'i2c::I2CBus' "
+            "Some are 'bus_a', 'bus_b'"
+        ]
+
+    def test_auto_id_single_candidate(self, validate):
+        result = validate(
+            """
+i2c:
+  id: bus_a
+sensor:
+  - platform: tmp102
+    name: Temperature
+"""
+        )
+
+        assert result.errors == []
+        assert result["sensor"][0]["i2c_id"].id == "bus_a"
+
+    def test_auto_ids_unique(self, validate):
+        result = validate(
+            """
+sensor:
+  - platform: template
+    id: template__templatesensor_2
+  - platform: template
+    name: Second
+  - platform: template
+    name: Third
+  - platform: template
+    name: Fourth
+"""
+        )
+
+        assert result.errors == []
+        assert [conf["id"].id for conf in result["sensor"]] == [
+            "template__templatesensor_2",
+            "template__templatesensor",
+            "template__templatesensor_3",
+            "template__templatesensor_4",
+        ]
+        assert "template__templatesensor_3" in CORE.component_ids
+
+
+SESSION_CONFIG = """
+sensor:
+  - platform: tmp102
+    name: Temperature
+  - platform: template
+    id: my_sensor
+    name: My Sensor
+interval:
+  - interval: 1s
+    then:
+      - sensor.template.publish:
+          id: my_sensor
+          state: 1
+i2c:
+  - id: bus_a
+    sda: 4
+    scl: 5
+"""
+
+ZEPHYR_CONFIG = """
+esphome:
+  name: test
+zephyr:
+  board: nrf52840dongle_nrf52840
+  zephyr_base: zephyr
+  flash_args: ""
+"""
+
+
+class TestValidationSession:
+    @pytest.fixture
+    def validated_paths(self, mocker):
+        spy = mocker.spy(config.SchemaValidationStep, "_validate")
+
+        def validated():
+            paths = [call.args[0].path for call in spy.call_args_list]
+            spy.reset_mock()
+            # The context domains are always validated
+            return [
+                p for p in paths if p[0] not in config.ValidationSession.CONTEXT_DOMAINS
+            ]
+
+        return validated
+
+    def test_reuses_unchanged_fragments(self, validate, validated_paths):
+        session = config.ValidationSession()
+        expected = validate(SESSION_CONFIG, session)
+        validated_paths()
+
+        actual = validate(SESSION_CONFIG, session)
+
+        assert validated_paths() == []
+        assert actual.errors == []
+        assert yaml_util.dump(actual) == yaml_util.dump(expected)
+        assert actual["sensor"][0]["i2c_id"].id == "bus_a"
+
+    def test_changed_fragment_validated(self, validate, validated_paths):
+        session = config.ValidationSession()
+        validate(SESSION_CONFIG, session)
+        validated_paths()
+
+        result = validate(
+            SESSION_CONFIG.replace("name: Temperature", "name: Temperatur2"), session
+        )
+
+        assert validated_paths() == [["sensor", 0]]
+        assert result["sensor"][0]["name"] == "Temperatur2"
+
+    def test_changed_context_drops_fragments(self, validate, validated_paths):
+        session = config.ValidationSession()
+        validate(SESSION_CONFIG, session)
+        validated_paths()
+
+        validate(SESSION_CONFIG.replace("sda: 4", "sda: 2") + "logger:\n", session)
+        validate(SESSION_CONFIG, session)
+
+        assert validated_paths().count(["sensor", 0]) == 2
+
+    def test_ids_resolved_again(self, validate, validated_paths):
+        session = config.ValidationSession()
+        validate(SESSION_CONFIG, session)
+        validated_paths()
+
+        result = validate(
+            SESSION_CONFIG.replace("id: my_sensor\n    name", "id: my_sensr\n    name")
+            + "  - id: bus_b\n    sda: 12\n    scl: 13\n",
+            session,
+        )
+
+        # sensor 0 uses bus_a and the interval my_sensor, both declared by changed
+        # fragments
+        assert validated_paths() == [
+            ["sensor", 0],
+            ["sensor", 1],
+            ["interval"],
+            ["i2c", 0],
+            ["i2c", 1],
+        ]
+        assert error_messages(result) == [
+            "Too many candidates found for 'i2c_id' type 'i2c::I2CBus' "
+            "Some are 'bus_a', 'bus_b'",
+            "Couldn't find ID 'my_sensor'. Please check you have defined an ID "
+            'with that name in your configuration. These IDs look similar: "my_sensr".',
+        ]
+
+    def test_dependents_validated(self, validate, validated_paths):
+        session = config.ValidationSession()
+        validate(SESSION_CONFIG, session)
+        validated_paths()
+
+        validate(SESSION_CONFIG.replace("name: My Sensor", "name: Other"), session)
+
+        # The interval refers to my_sensor
+        assert validated_paths() == [["sensor", 1], ["interval"]]
+
+    def test_core_data_changes_not_reused(self, validate, validated_paths, mocker):
+        from esphome.components import template
+
+        schema = template.sensor.CONFIG_SCHEMA
+
+        def set_data(value):
+            CORE.data.setdefault("test", {})["value"] = 1
+            return schema(value)
+
+        mocker.patch.object(template.sensor, "CONFIG_SCHEMA", set_data)
+        session = config.ValidationSession()
+        validate(SESSION_CONFIG, session)
+        validated_paths()
+
+        validate(SESSION_CONFIG, session)
+
+        assert validated_paths() == [["sensor", 1]]
+
+    def test_zephyr(self, validate, validated_paths):
+        session = config.ValidationSession()
+        validate(SESSION_CONFIG, session, base=ZEPHYR_CONFIG)
+        validated_paths()
+
+        result = validate(SESSION_CONFIG, session, base=ZEPHYR_CONFIG)
+
+        assert result.errors == []
+        assert validated_paths() == []
@@ -0,0 +1,181 @@
+import os
+
+import pytest
+
+from esphome import config_cache, yaml_util
+from esphome.config import read_config
+from esphome.core import CORE
+
+CONFIG = """
+esphome:
+  name: !secret node_name
+  platform: ESP8266
+  board: d1_mini_lite
+
+sensor: !include sensors.yaml
+binary_sensor: !include_dir_list binary_sensors
+"""
+
+ZEPHYR_CONFIG = """
+esphome:
+  name: zephyr-node
+
+zephyr:
+  board: nrf52840dongle_nrf52840
+  zephyr_base: zephyr
+  flash_args: ""
+
+sensor: !include sensors.yaml
+"""
+
+WEB_SERVER_CONFIG = """
+wifi:
+  ssid: test
+  password: password1
+
+web_server:
+  css_include: style.css
+"""
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    (tmp_path / "test.yaml").write_text(CONFIG)
+    (tmp_path / "secrets.yaml").write_text("node_name: secret-node\n")
+    (tmp_path / "sensors.yaml").write_text(
+        "- platform: template\n  id: sensor_1\n  name: Sensor 1\n"
+    )
+    (tmp_path / "binary_sensors").mkdir()
+    (tmp_path / "binary_sensors" / "a.yaml").write_text(
+        "platform: template\nname: Binary A\n"
+    )
+    CORE.config_path = str(tmp_path / "test.yaml")
+
+    yield tmp_path
+
+    CORE.reset()
+
+
+def read_again(substitutions=None):
+    path = CORE.config_path
+    CORE.reset()
+    yaml_util.restore_secret_values({})
+    CORE.config_path = path
+    return read_config(substitutions or {}, use_cache=True)
+
+
+@pytest.fixture
+def mock_load_config(mocker):
+    from esphome import config
+
+    return mocker.spy(config, "load_config")
+
+
+def test_cache_hit(config_dir, mock_load_config):
+    expected = read_config({}, use_cache=True)
+    expected_integrations = set(CORE.loaded_integrations)
+
+    actual = read_again()
+
+    assert mock_load_config.call_count == 1
+    assert actual == expected
+    assert CORE.name == "secret-node"
+    assert CORE.loaded_integrations == expected_integrations
+    assert CORE.build_path == str(config_dir / "secret-node")
+    assert yaml_util.is_secret("secret-node") == "node_name"
+
+
+def test_cache_not_used_by_default(config_dir, mock_load_config):
+    read_config({}, use_cache=True)
+
+    read_config({})
+
+    assert mock_load_config.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "filename, content",
+    (
+        ("test.yaml", CONFIG + "\nlogger:\n"),
+        ("secrets.yaml", "node_name: other-node\n"),
+        ("sensors.yaml", "- platform: template\n  name: Sensor 2\n"),
+        ("binary_sensors/b.yaml", "platform: template\nname: Binary B\n"),
+    ),
+)
+def test_cache_invalidated_by_files(config_dir, mock_load_config, filename, content):
+    read_config({}, use_cache=True)
+
+    (config_dir / filename).write_text(content)
+    read_again()
+
+    assert mock_load_config.call_count == 2
+
+
+def test_cache_invalidated_by_validated_files(config_dir, mock_load_config):
+    (config_dir / "test.yaml").write_text(CONFIG + WEB_SERVER_CONFIG)
+    (config_dir / "style.css").write_text("body {}\n")
+    read_config({}, use_cache=True)
+
+    (config_dir / "style.css").write_text("body { color: red; }\n")
+    read_again()
+
+    assert mock_load_config.call_count == 2
+
+
+def test_cache_invalidated_by_substitutions(config_dir, mock_load_config):
+    read_config({"foo": "bar"}, use_cache=True)
+
+    read_again({"foo": "baz"})
+
+    assert mock_load_config.call_count == 2
+
+
+def test_cache_invalidated_by_env_var(config_dir, mock_load_config, monkeypatch):
+    (config_dir / "secrets.yaml").write_text("node_name: !env_var NODE_NAME\n")
+    monkeypatch.setenv("NODE_NAME", "env-node")
+    read_config({}, use_cache=True)
+
+    monkeypatch.setenv("NODE_NAME", "other-env-node")
+    read_again()
+
+    assert mock_load_config.call_count == 2
+    assert CORE.name == "other-env-node"
+
+
+def test_cache_skipped_for_custom_components(config_dir):
+    (config_dir / "custom_components").mkdir()
+
+    read_config({}, use_cache=True)
+
+    assert not os.path.exists(config_cache.config_cache_path())
+
+
+def test_clear_config_cache(config_dir):
+    read_config({}, use_cache=True)
+    assert os.path.exists(config_cache.config_cache_path())
+
+    config_cache.clear_config_cache()
+
+    assert not os.path.exists(config_cache.config_cache_path())
+
+
+def test_cache_not_supported(config_dir, mock_load_config, monkeypatch):
+    monkeypatch.setattr(config_cache, "CACHE_SUPPORTED", False)
+    read_config({}, use_cache=True)
+
+    read_again()
+
+    assert mock_load_config.call_count == 2
+    assert not os.path.exists(config_cache.config_cache_path())
+
+
+def test_cache_zephyr(config_dir, mock_load_config):
+    (config_dir / "test.yaml").write_text(ZEPHYR_CONFIG)
+    read_config({}, use_cache=True)
+    expected = CORE.zephyr_manager
+
+    read_again()
+
+    assert mock_load_config.call_count == 1
+    assert CORE.zephyr_manager == expected
+    assert CORE.zephyr_manager.board._manager is CORE.zephyr_manager
@@ -124,3 +124,41 @@ def hex_int__valid(value):
 
     assert isinstance(actual, HexInt)
     assert actual == value
+
+
+def test_schema__compiled_on_first_use(mocker):
+    compile_mapping = mocker.spy(config_validation.Schema, "_compile_mapping")
+    schema = (
+        config_validation.Schema({config_validation.Required("a"): int})
+        .extend({config_validation.Optional("b", default=2): int})
+        .extend({config_validation.Optional("c"): int})
+    )
+    compile_mapping.assert_not_called()
+
+    assert schema({"a": 1}) == {"a": 1, "b": 2}
+    assert schema({"a": 3, "c": 4}) == {"a": 3, "b": 2, "c": 4}
+    assert compile_mapping.call_count == 1
+
+
+def test_schema__invalid_key_fails_on_creation():
+    with pytest.raises(ValueError, match="must be wrapped"):
+        config_validation.Schema({"a": int})
+
+
+def test_schema__literal_keys_errors():
+    schema = config_validation.Schema(
+        {
+            config_validation.Required("name"): config_validation.string,
+            config_validation.Required("port"): config_validation.port,
+            config_validation.Optional("interval", default=5): config_validation.int_,
+        }
+    )
+
+    with pytest.raises(config_validation.MultipleInvalid) as excinfo:
+        schema({"port": "foo", "intervall": 3})
+
+    errors = {tuple(map(str, err.path)): err for err in excinfo.value.errors}
+    assert set(errors) == {("port",), ("intervall",), ("name",)}
+    assert errors[("port",)].error_type == "dictionary value"
+    assert errors[("intervall",)].candidates == ["interval"]
+    assert errors[("name",)].msg == "required key not provided"
@@ -0,0 +1,115 @@
+import pytest
+
+from esphome import core
+from esphome.coroutine import (
+    FakeAwaitable,
+    FakeEventLoop,
+    WaitFor,
+    coroutine_with_priority,
+)
+
+
+@pytest.fixture
+def target():
+    target = core.EsphomeCore()
+    yield target
+
+
+def make_id(name, is_declaration=False):
+    return core.ID(name, is_declaration=is_declaration)
+
+
+class TestFakeEventLoop:
+    def test_priority_ordering(self):
+        order = []
+
+        @coroutine_with_priority(10.0)
+        async def high():
+            order.append("high")
+
+        async def low():
+            order.append("low")
+
+        target = FakeEventLoop()
+        target.add_job(low)
+        target.add_job(high)
+        target.flush_tasks()
+
+        assert order == ["high", "low"]
+
+    def test_waiting_task_resumed_on_register(self, target):
+        order = []
+
+        async def consumer():
+            var = await target.get_variable(make_id("foo"))
+            order.append(("consumer", var))
+
+        async def producer():
+            order.append(("producer", None))
+            target.register_variable(make_id("foo", True), "foo_obj")
+
+        target.add_job(consumer)
+        target.add_job(producer)
+        target.flush_tasks()
+
+        assert order == [("producer", None), ("consumer", "foo_obj")]
+
+    def test_waiting_task_only_resumed_once(self, target):
+        resumes = []
+        foo = make_id("foo")
+
+        def wait_for_foo():
+            while foo not in target.variables:
+                resumes.append(foo)
+                yield WaitFor(foo)
+
+        async def consumer():
+            await FakeAwaitable(wait_for_foo())
+
+        def busy():
+            for _ in range(100):
+                yield
+
+        async def producer():
+            await FakeAwaitable(busy())
+            target.register_variable(make_id("foo", True), "foo_obj")
+
+        target.add_job(consumer)
+        target.add_job(producer)
+        target.flush_tasks()
+
+        assert target.event_loop._waiting_tasks == {}
+        assert len(resumes) == 1
+
+    def test_circular_dependency(self, target):
+        async def to_code_a(config):
+            await target.get_variable(make_id("b"))
+            target.register_variable(config["id"], "a_obj")
+
+        async def to_code_b(config):
+            await target.get_variable(make_id("a"))
+            target.register_variable(config["id"], "b_obj")
+
+        target.add_job(to_code_a, {"id": make_id("a", True)})
+        target.add_job(to_code_b, {"id": make_id("b", True)})
+
+        with pytest.raises(
+            core.EsphomeError, match="Circular dependency detected!"
+        ) as e:
+            target.flush_tasks()
+
+        assert "to_code_a (waiting for 'b') ->" in str(e.value)
+        assert "to_code_b (waiting for 'a') ->" in str(e.value)
+
+    def test_missing_dependency(self, target):
+        async def to_code(config):
+            await target.get_variable(make_id("missing"))
+
+        target.add_job(to_code, {"id": make_id("a", True)})
+
+        with pytest.raises(
+            core.EsphomeError, match="Unable to resolve dependencies"
+        ) as e:
+            target.flush_tasks()
+
+        assert "to_code (waiting for 'missing')" in str(e.value)
@@ -6,6 +6,7 @@ import pytest
 
 from esphome import cpp_generator as cg
 from esphome import cpp_types as ct
+from esphome.core import HexInt
 
 
 class TestExpressions:
@@ -131,6 +132,32 @@ class TestArrayInitializer:
         assert actual == "{\n  1,\n  2,\n  3,\n  4,\n}"
 
 
+class TestByteArrayInitializer:
+    def test_str__empty(self):
+        target = cg.ByteArrayInitializer(b"")
+
+        actual = str(target)
+
+        assert actual == "{}"
+
+    def test_str__same_as_hex_ints(self):
+        data = bytes(range(256))
+        target = cg.ByteArrayInitializer(data)
+
+        actual = str(target)
+
+        assert actual == str(cg.ArrayInitializer(*[HexInt(x) for x in data]))
+        assert actual.startswith("{0x00, 0x01, 0x02,")
+        assert actual.endswith(", 0xFE, 0xFF}")
+
+    @pytest.mark.parametrize("data", (b"\x01\xAB", bytearray(b"\x01\xAB")))
+    def test_safe_exp(self, data):
+        actual = cg.safe_exp(data)
+
+        assert isinstance(actual, cg.ByteArrayInitializer)
+        assert str(actual) == "{0x01, 0xAB}"
+
+
 class TestParameterListExpression:
     def test_str(self):
         target = cg.ParameterListExpression(
@@ -297,3 +324,43 @@ class TestMockObj:
         assert isinstance(actual, cg.MockObj)
         assert actual.base == "foo.eek"
         assert actual.op == "."
+
+
+class TestMockObjClass:
+    @pytest.fixture
+    def classes(self):
+        base = cg.MockObjClass("foo::Base", parents=())
+        mixin = cg.MockObjClass("foo::Mixin", parents=())
+        child = cg.MockObjClass("foo::Child", parents=(base, mixin))
+        grandchild = cg.MockObjClass("foo::GrandChild", parents=(child,))
+        return base, mixin, child, grandchild
+
+    def test_inherits_from(self, classes):
+        base, mixin, child, grandchild = classes
+
+        assert grandchild.inherits_from(grandchild)
+        assert grandchild.inherits_from(child)
+        assert grandchild.inherits_from(base)
+        assert grandchild.inherits_from(mixin)
+        assert not child.inherits_from(grandchild)
+        assert not base.inherits_from(mixin)
+
+    def test_inherits_from__compares_names(self, classes):
+        base, _, _, grandchild = classes
+
+        assert grandchild.inherits_from(cg.MockObjClass("foo::Base", parents=()))
+        assert not base.inherits_from(cg.MockObjClass("foo::Other", parents=()))
+
+    def test_template(self, classes):
+        _, mixin, child, _ = classes
+
+        actual = child.template(ct.int32)
+
+        assert str(actual) == "foo::Child<int32_t>"
+        assert actual.inherits_from(child)
+        assert actual.inherits_from(mixin)
+        assert not child.inherits_from(actual)
+
+    def test_parents_must_be_classes(self):
+        with pytest.raises(ValueError):
+            cg.MockObjClass("foo::Bar", parents=(cg.MockObj("foo::Baz"),))
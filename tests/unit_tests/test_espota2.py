@@ -0,0 +1,116 @@
+import gzip
+import hashlib
+import os
+import socket
+import threading
+
+import pytest
+
+from esphome import espota2
+
+PASSWORD = "secret"
+NONCE = b"0123456789abcdef0123456789abcdef"
+
+
+def receive_exactly(conn, amount):
+    data = b""
+    while len(data) < amount:
+        chunk = conn.recv(amount - len(data))
+        assert chunk, "connection closed"
+        data += chunk
+    return data
+
+
+class FakeDevice(threading.Thread):
+    """Device side of the OTA protocol, records what was uploaded."""
+
+    def __init__(self, compression, password=None):
+        super().__init__(daemon=True)
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(1)
+        self.port = self.server.getsockname()[1]
+        self.compression = compression
+        self.password = password
+        self.upload = None
+        self.md5 = None
+        self.auth_ok = None
+
+    def run(self):
+        conn, _ = self.server.accept()
+        with conn:
+            assert receive_exactly(conn, 5) == bytes(espota2.MAGIC_BYTES)
+            conn.sendall(bytes([espota2.RESPONSE_OK, espota2.OTA_VERSION_1_0]))
+            receive_exactly(conn, 1)
+            conn.sendall(
+                bytes(
+                    [
+                        espota2.RESPONSE_SUPPORTS_COMPRESSION
+                        if self.compression
+                        else espota2.RESPONSE_HEADER_OK
+                    ]
+                )
+            )
+            if self.password is not None:
+                conn.sendall(bytes([espota2.RESPONSE_REQUEST_AUTH]) + NONCE)
+                cnonce = receive_exactly(conn, 32)
+                expected = hashlib.md5(
+                    self.password.encode() + NONCE + cnonce
+                ).hexdigest()
+                self.auth_ok = receive_exactly(conn, 32).decode() == expected
+            conn.sendall(bytes([espota2.RESPONSE_AUTH_OK]))
+            size = int.from_bytes(receive_exactly(conn, 4), "big")
+            conn.sendall(bytes([espota2.RESPONSE_UPDATE_PREPARE_OK]))
+            self.md5 = receive_exactly(conn, 32).decode()
+            conn.sendall(bytes([espota2.RESPONSE_BIN_MD5_OK]))
+            self.upload = receive_exactly(conn, size)
+            conn.sendall(
+                bytes([espota2.RESPONSE_RECEIVE_OK, espota2.RESPONSE_UPDATE_END_OK])
+            )
+            assert receive_exactly(conn, 1) == bytes([espota2.RESPONSE_OK])
+        self.server.close()
+
+
+@pytest.fixture
+def firmware(tmp_path):
+    path = tmp_path / "firmware.bin"
+    # Partly compressible, like a real firmware image
+    path.write_bytes(os.urandom(100_000) + bytes(200_000))
+    return path
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(mocker):
+    mocker.patch("esphome.espota2.time.sleep")
+
+
+@pytest.mark.parametrize("compression", (True, False))
+def test_perform_ota(firmware, compression):
+    device = FakeDevice(compression, password=PASSWORD)
+    device.start()
+
+    rc = espota2.run_ota("127.0.0.1", device.port, PASSWORD, str(firmware))
+    device.join(5)
+
+    assert rc == 0
+    assert device.auth_ok
+    assert hashlib.md5(device.upload).hexdigest() == device.md5
+    if compression:
+        assert gzip.decompress(device.upload) == firmware.read_bytes()
+        assert len(device.upload) < firmware.stat().st_size
+    else:
+        assert device.upload == firmware.read_bytes()
+
+
+def test_phase_timer():
+    timer = espota2.PhaseTimer()
+
+    with timer.phase("handshake"):
+        pass
+    with timer.phase("transfer"):
+        pass
+    with timer.phase("handshake"):
+        pass
+
+    assert list(timer.phases) == ["handshake", "transfer"]
+    assert str(timer).startswith("handshake 0.00s, transfer 0.00s")
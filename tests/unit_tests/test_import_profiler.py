@@ -0,0 +1,26 @@
+import sys
+
+from esphome.import_profiler import ImportProfiler
+
+
+def test_import_profiler(tmp_path, monkeypatch):
+    (tmp_path / "profiled_parent.py").write_text(
+        "import time\nimport profiled_child\ntime.sleep(0.02)\n"
+    )
+    (tmp_path / "profiled_child.py").write_text("import time\ntime.sleep(0.05)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    try:
+        with ImportProfiler() as profiler:
+            import profiled_parent  # noqa: F401 pylint: disable=import-outside-toplevel,import-error,unused-import
+    finally:
+        sys.modules.pop("profiled_parent", None)
+        sys.modules.pop("profiled_child", None)
+
+    parent_total, parent_self = profiler.timings["profiled_parent"]
+    child_total, child_self = profiler.timings["profiled_child"]
+    assert child_total == child_self >= 0.05
+    assert parent_total >= 0.07
+    assert 0.02 <= parent_self < parent_total - 0.04
+    assert profiler not in sys.meta_path
+    assert "profiled_parent" in profiler.report()
@@ -0,0 +1,85 @@
+import importlib.util
+import sys
+
+import pytest
+
+from esphome import loader
+
+SOURCE = """
+import esphome.codegen as cg
+
+CODEOWNERS = ["@esphome/core"]
+DEPENDENCIES = ["i2c"]
+AUTO_LOAD = ["sensor"] + EXTRA
+MULTI_CONF = True
+
+raise RuntimeError("Module body executed")
+"""
+
+
+@pytest.fixture
+def module_spec(tmp_path):
+    path = tmp_path / "lazy_component.py"
+    path.write_text(SOURCE)
+    yield importlib.util.spec_from_file_location("lazy_component", path)
+    sys.modules.pop("lazy_component", None)
+
+
+def test_read_static_metadata(module_spec):
+    values, dynamic = loader.read_static_metadata(module_spec.origin)
+
+    assert values == {
+        "CODEOWNERS": ["@esphome/core"],
+        "DEPENDENCIES": ["i2c"],
+        "MULTI_CONF": True,
+    }
+    assert dynamic == {"AUTO_LOAD"}
+
+
+@pytest.mark.parametrize(
+    "source",
+    (
+        "DEPENDENCIES = ['a']\nDEPENDENCIES = ['b']\n",
+        "DEPENDENCIES = ['a']\nif True:\n    DEPENDENCIES.append('b')\n",
+        "from .base import DEPENDENCIES\n",
+        "DEPENDENCIES = []\nDEPENDENCIES += ['b']\n",
+    ),
+)
+def test_read_static_metadata_reassigned(tmp_path, source):
+    path = tmp_path / "component.py"
+    path.write_text(source)
+
+    values, dynamic = loader.read_static_metadata(str(path))
+
+    assert "DEPENDENCIES" not in values
+    assert "DEPENDENCIES" in dynamic
+
+
+def test_read_static_metadata_star_import(tmp_path):
+    path = tmp_path / "component.py"
+    path.write_text("from .base import *\nDEPENDENCIES = ['a']\n")
+
+    assert loader.read_static_metadata(str(path)) is None
+
+
+def test_manifest_reads_metadata_without_import(module_spec):
+    manifest = loader.ComponentManifest("lazy_component", module_spec)
+
+    assert manifest.dependencies == ["i2c"]
+    assert manifest.codeowners == ["@esphome/core"]
+    assert manifest.multi_conf is True
+    assert manifest.conflicts_with == []
+    assert manifest.is_platform_component is False
+    assert "lazy_component" not in sys.modules
+
+
+def test_manifest_imports_when_needed(module_spec):
+    manifest = loader.ComponentManifest("lazy_component", module_spec)
+
+    with pytest.raises(loader.EsphomeError, match="Unable to load component"):
+        manifest.auto_load
+
+
+def test_get_component_missing():
+    assert loader.get_component("does_not_exist") is None
+    assert loader.get_platform("sensor", "does_not_exist") is None
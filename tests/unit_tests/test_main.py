@@ -0,0 +1,136 @@
+import io
+import threading
+
+import pytest
+
+from esphome import __main__ as main
+from esphome.const import KEY_CORE, KEY_TARGET_PLATFORM
+from esphome.core import CORE, EsphomeError
+
+
+@pytest.fixture
+def configs(tmp_path):
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.yaml").write_text("esphome:\n")
+    return tmp_path
+
+
+def update_all(configs, *args):
+    return main.command_update_all(
+        main.parse_args(["esphome", "update-all", *args, str(configs)])
+    )
+
+
+class FakeProcess:
+    """A finished 'esphome' subprocess, for subprocess.Popen."""
+
+    def __init__(self, output, returncode):
+        self.stdout = io.BytesIO(output)
+        self.returncode = returncode
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+def test_update_all_serial(configs, mocker, capsys):
+    calls = []
+
+    def run(*cmd):
+        calls.append(cmd[2:4])
+        return 1 if cmd[2:4] == ("compile", str(configs / "b.yaml")) else 0
+
+    mocker.patch.object(main, "run_external_process", side_effect=run)
+
+    assert update_all(configs) == 1
+
+    a, b, c = (str(configs / f"{name}.yaml") for name in ("a", "b", "c"))
+    # Each config is uploaded right after it compiled, like 'esphome run'
+    assert calls == [
+        ("compile", a),
+        ("upload", a),
+        ("compile", b),
+        ("compile", c),
+        ("upload", c),
+    ]
+    out = capsys.readouterr().out
+    assert f"{a}: " in out and f"{b}: " in out
+    assert out.count("FAILED") == 1
+
+
+def test_update_all_parallel(configs, mocker, capsys):
+    a, b, c = (str(configs / f"{name}.yaml") for name in ("a", "b", "c"))
+    lock = threading.Lock()
+    calls = []
+
+    def popen(cmd, **kwargs):
+        with lock:
+            calls.append(tuple(cmd[2:4]))
+        failed = tuple(cmd[2:4]) == ("upload", c)
+        return FakeProcess(f"{cmd[2]} output\n".encode(), 2 if failed else 0)
+
+    mocker.patch.object(main, "_update_all_target", return_value="ESP8266")
+    mocker.patch("subprocess.Popen", side_effect=popen)
+
+    assert update_all(configs, "-j", "3") == 1
+
+    assert sorted(calls) == sorted(
+        [(step, f) for f in (a, b, c) for step in ("compile", "upload")]
+    )
+    # The first build of a target installs its packages before the others start
+    assert calls[0] == ("compile", a)
+    for f in (a, b, c):
+        assert calls.index(("compile", f)) < calls.index(("upload", f))
+    out = capsys.readouterr().out
+    assert f"[{b}] compile output" in out
+    assert f"[{b}] upload output" in out
+    assert f"{c}: " in out
+    assert out.count("FAILED") == 1
+
+
+def test_update_all_command_missing(configs, mocker, capsys):
+    mocker.patch("subprocess.Popen", side_effect=FileNotFoundError("esphome"))
+
+    assert update_all(configs, "--jobs", "2") == 3
+
+
+@pytest.mark.parametrize("jobs", ("0", "-1", "many"))
+def test_update_all_invalid_jobs(jobs, capsys):
+    with pytest.raises(SystemExit):
+        main.parse_args(["esphome", "update-all", "-j", jobs, "configs"])
+
+    assert "positive integer" in capsys.readouterr().err
+
+
+@pytest.fixture
+def zephyr_device(tmp_path, mocker):
+    CORE.config_path = str(tmp_path / "test.yaml")
+    CORE.name = "test"
+    CORE.build_path = str(tmp_path / "test")
+    CORE.config = {}
+    CORE.data[KEY_CORE] = {KEY_TARGET_PLATFORM: "zephyr"}
+    mocker.patch.object(main, "get_serial_ports", return_value=[])
+
+    yield mocker.patch(
+        "esphome.components.zephyr.netUpload.get_flash_address",
+        return_value="fd00::1",
+    )
+
+    CORE.reset()
+
+
+def test_choose_host_zephyr_flashed(zephyr_device, tmp_path):
+    (tmp_path / "test").mkdir()
+    (tmp_path / "test" / "boot_flashed.info").write_text("")
+
+    assert main.choose_upload_log_host(None, None, True, False, False) == "fd00::1"
+
+
+def test_choose_host_zephyr_not_flashed(zephyr_device):
+    with pytest.raises(EsphomeError):
+        main.choose_upload_log_host(None, None, True, False, False)
+
+    # Can't be flashed over the network, so no need to wait for mDNS
+    zephyr_device.assert_not_called()
@@ -0,0 +1,70 @@
+"""Host tests and micro-benchmark of the sliding windows of the sensor filters.
+
+The harness in fixtures/sliding_window_bench.cpp compiles
+esphome/components/sensor/sliding_window.h with the host compiler and compares it
+with the deque based windows the median, min and max filters used before. Set the
+``ESPHOME_BENCHMARK`` environment variable to also time both; the timings are
+reported as test properties (``--junitxml``).
+"""
+import os
+from pathlib import Path
+import shutil
+import subprocess
+
+import pytest
+
+from esphome.loader import CORE_COMPONENTS_PATH
+
+BENCHMARK = bool(os.environ.get("ESPHOME_BENCHMARK"))
+HARNESS = Path(__file__).parent / "fixtures" / "sliding_window_bench.cpp"
+
+requires_compiler = pytest.mark.skipif(
+    shutil.which("g++") is None, reason="No host C++ compiler"
+)
+
+
+@pytest.fixture(scope="module")
+def harness(tmp_path_factory):
+    binary = tmp_path_factory.mktemp("sliding_window") / "sliding_window_bench"
+    subprocess.run(
+        [
+            "g++",
+            "-std=gnu++17",
+            "-O2",
+            "-Wall",
+            "-Werror",
+            f"-I{CORE_COMPONENTS_PATH / 'sensor'}",
+            str(HARNESS),
+            "-o",
+            str(binary),
+        ],
+        check=True,
+    )
+    return binary
+
+
+@requires_compiler
+def test_sliding_windows_match_deque(harness):
+    result = subprocess.run(
+        [str(harness), "check"], capture_output=True, text=True, check=False
+    )
+
+    assert result.returncode == 0, result.stdout
+    assert result.stdout == "ok\n"
+
+
+@requires_compiler
+@pytest.mark.skipif(not BENCHMARK, reason="set ESPHOME_BENCHMARK to run")
+@pytest.mark.parametrize("window_size", (5, 50, 200))
+def test_sliding_windows_benchmark(harness, record_property, window_size):
+    result = subprocess.run(
+        [str(harness), "bench", str(window_size), "200000"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    for line in result.stdout.splitlines():
+        name, before, after = line.split()
+        record_property(f"{name}_deque_ns", float(before))
+        record_property(f"{name}_window_ns", float(after))
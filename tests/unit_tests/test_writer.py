@@ -0,0 +1,159 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from esphome import const, writer
+from esphome.core import CORE, EsphomeError
+
+
+@pytest.fixture
+def build_dir(tmp_path):
+    CORE.config_path = str(tmp_path / "test.yaml")
+    CORE.build_path = str(tmp_path / "build")
+    CORE.config = {"esphome": {}, "logger": {}}
+    CORE.data[const.KEY_CORE] = {const.KEY_TARGET_PLATFORM: "esp8266"}
+
+    yield tmp_path / "build" / "src"
+
+    CORE.reset()
+
+
+@pytest.fixture
+def copied_files(mocker):
+    spy = mocker.spy(writer, "link_file_if_changed")
+
+    def copied():
+        files = [
+            os.path.relpath(call.args[1], CORE.relative_src_path())
+            for call in spy.call_args_list
+        ]
+        spy.reset_mock()
+        return files
+
+    return copied
+
+
+def test_copy_src_tree(build_dir, copied_files):
+    writer.copy_src_tree()
+
+    assert (build_dir / "esphome" / "components" / "logger" / "logger.h").is_file()
+    assert (build_dir / "esphome" / "core" / "application.h").is_file()
+    assert "esphome/core/application.h" in copied_files()
+    assert os.path.isfile(writer.src_manifest_path())
+
+
+def test_copy_src_tree_unchanged(build_dir, copied_files, mocker):
+    writer.copy_src_tree()
+    copied_files()
+    walk_files = mocker.spy(writer, "walk_files")
+
+    writer.copy_src_tree()
+
+    assert copied_files() == []
+    walk_files.assert_not_called()
+
+
+def test_copy_src_tree_target_changed(build_dir, copied_files):
+    writer.copy_src_tree()
+    copied_files()
+    target = build_dir / "esphome" / "components" / "logger" / "logger.h"
+    expected = target.read_text()
+    target.write_text("changed")
+
+    writer.copy_src_tree()
+
+    assert copied_files() == ["esphome/components/logger/logger.h"]
+    assert target.read_text() == expected
+
+
+def test_copy_src_tree_removed_component(build_dir):
+    writer.copy_src_tree()
+
+    del CORE.config["logger"]
+    writer.copy_src_tree()
+
+    assert not (build_dir / "esphome" / "components" / "logger" / "logger.h").exists()
+    assert (build_dir / "esphome" / "core" / "application.h").is_file()
+
+
+def test_copy_src_tree_without_manifest(build_dir, copied_files):
+    writer.copy_src_tree()
+    copied_files()
+    os.remove(writer.src_manifest_path())
+    stale = build_dir / "esphome" / "components" / "removed" / "removed.h"
+    stale.parent.mkdir()
+    stale.write_text("")
+    mtime = (build_dir / "esphome" / "core" / "application.h").stat().st_mtime_ns
+
+    writer.copy_src_tree()
+
+    assert not stale.exists()
+    assert (
+        build_dir / "esphome" / "core" / "application.h"
+    ).stat().st_mtime_ns == mtime
+
+
+@pytest.mark.parametrize("mode", writer.SRC_LINK_MODES)
+def test_copy_src_tree_link_mode(build_dir, monkeypatch, mode):
+    monkeypatch.setenv(const.ENV_SRC_LINK_MODE, mode)
+    target = build_dir / "esphome" / "components" / "logger" / "logger.h"
+    writer.copy_src_tree()
+
+    source = writer.loader.package_directory("esphome.components.logger")
+    assert target.read_bytes() == (Path(source) / "logger.h").read_bytes()
+    assert target.samefile(Path(source) / "logger.h") == (mode == "hardlink")
+
+
+def test_link_file_if_changed_replaces_target(tmp_path):
+    src = tmp_path / "src.h"
+    src.write_text("source")
+    dst = tmp_path / "build" / "dst.h"
+    writer.link_file_if_changed(str(src), str(dst), "hardlink")
+    assert dst.samefile(src)
+
+    other = tmp_path / "other.h"
+    other.write_text("other")
+    writer.link_file_if_changed(str(other), str(dst), "copy")
+
+    assert src.read_text() == "source"
+    assert dst.read_text() == "other"
+
+
+def test_link_file_if_changed_fallback(tmp_path, mocker):
+    mocker.patch("os.link", side_effect=OSError("Invalid cross-device link"))
+    src = tmp_path / "src.h"
+    src.write_text("source")
+    dst = tmp_path / "dst.h"
+
+    writer.link_file_if_changed(str(src), str(dst), "hardlink")
+
+    assert dst.read_text() == "source"
+    assert not dst.samefile(src)
+    assert not (tmp_path / "dst.h.tmp").exists()
+
+
+def test_src_link_mode_invalid(monkeypatch):
+    monkeypatch.setenv(const.ENV_SRC_LINK_MODE, "symlink")
+
+    with pytest.raises(EsphomeError, match="ESPHOME_SRC_LINK_MODE"):
+        writer.src_link_mode()
+
+
+def test_src_link_mode_default(monkeypatch):
+    monkeypatch.delenv(const.ENV_SRC_LINK_MODE, raising=False)
+
+    assert writer.src_link_mode() == "copy"
+
+
+def test_reflink_not_linux(tmp_path, mocker):
+    mocker.patch.object(writer.sys, "platform", "darwin")
+    ioctl = mocker.patch("fcntl.ioctl")
+    src = tmp_path / "src.h"
+    src.write_text("source")
+    dst = tmp_path / "dst.h"
+
+    writer.link_file_if_changed(str(src), str(dst), "reflink")
+
+    ioctl.assert_not_called()
+    assert dst.read_text() == "source"
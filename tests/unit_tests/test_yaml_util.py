@@ -0,0 +1,213 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from esphome import yaml_util
+from esphome.core import EnumValue, Lambda
+from esphome.helpers import add_class_to_obj
+
+TEST_CONFIGS = sorted((Path(__file__).parent.parent).glob("*.yaml"))
+
+requires_libyaml = pytest.mark.skipif(
+    yaml_util.ESPHomeLoader is yaml_util.ESPHomePurePythonLoader,
+    reason="PyYAML was built without libyaml",
+)
+
+
+@pytest.fixture
+def load_with(monkeypatch):
+    def loader(loader_cls, fname):
+        monkeypatch.setattr(yaml_util, "ESPHomeLoader", loader_cls)
+        monkeypatch.setattr(yaml_util, "_DOCUMENT_CACHE", {})
+        return yaml_util.load_yaml(str(fname))
+
+    return loader
+
+
+def mark_tuple(esp_range):
+    if esp_range is None:
+        return None
+    start, end = esp_range.start_mark, esp_range.end_mark
+    return start.document, start.line, start.column, end.line, end.column
+
+
+def assert_same_data(expected, actual, path="root"):
+    if isinstance(expected, Lambda):
+        assert str(expected) == str(actual), path
+    elif not isinstance(expected, (dict, list)):
+        assert expected == actual, path
+    assert type(expected) is type(actual), path
+    assert mark_tuple(getattr(expected, "esp_range", None)) == mark_tuple(
+        getattr(actual, "esp_range", None)
+    ), path
+    assert getattr(expected, "content_offset", 0) == getattr(
+        actual, "content_offset", 0
+    ), path
+
+    if isinstance(expected, dict):
+        assert len(expected) == len(actual), path
+        for (key_e, value_e), (key_a, value_a) in zip(expected.items(), actual.items()):
+            assert_same_data(key_e, key_a, f"{path}->{key_e}")
+            assert_same_data(value_e, value_a, f"{path}->{key_e}")
+    elif isinstance(expected, list):
+        assert len(expected) == len(actual), path
+        for i, (value_e, value_a) in enumerate(zip(expected, actual)):
+            assert_same_data(value_e, value_a, f"{path}->{i}")
+
+
+@requires_libyaml
+@pytest.mark.parametrize("fname", TEST_CONFIGS, ids=lambda path: path.name)
+def test_loaders_equivalent(load_with, fname):
+    expected = load_with(yaml_util.ESPHomePurePythonLoader, fname)
+    actual = load_with(yaml_util.ESPHomeLoader, fname)
+
+    assert_same_data(expected, actual)
+
+
+@pytest.mark.parametrize(
+    "loader_cls",
+    (
+        yaml_util.ESPHomePurePythonLoader,
+        pytest.param(yaml_util.ESPHomeLoader, marks=requires_libyaml),
+    ),
+)
+def test_line_tracking(load_with, tmp_path, loader_cls):
+    path = tmp_path / "test.yaml"
+    path.write_text("plain: value\nblock: |\n  first\n  second\n")
+
+    actual = load_with(loader_cls, path)
+
+    assert mark_tuple(actual["plain"].esp_range) == (str(path), 0, 7, 0, 12)
+    assert actual["plain"].content_offset == 0
+    assert mark_tuple(actual["block"].esp_range) == (str(path), 1, 7, 4, 0)
+    assert actual["block"].content_offset == 1
+
+
+@requires_libyaml
+def test_parse_benchmark(load_with, record_property):
+    for name, loader_cls in (
+        ("pure_python", yaml_util.ESPHomePurePythonLoader),
+        ("libyaml", yaml_util.ESPHomeLoader),
+    ):
+        start = time.perf_counter()
+        for fname in TEST_CONFIGS:
+            load_with(loader_cls, fname)
+        record_property(f"{name}_seconds", time.perf_counter() - start)
+
+
+def write_old(path, text, age=10):
+    """Write a file with a modification time in the past, so it can be cached."""
+    path.write_text(text)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def include_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(yaml_util, "_DOCUMENT_CACHE", {})
+    write_old(
+        tmp_path / "main.yaml",
+        "first: !include common.yaml\nsecond: !include common.yaml\n"
+        "env: !env_var TEST_INCLUDE_CACHE\n",
+    )
+    write_old(
+        tmp_path / "common.yaml",
+        "value: !secret password\nlambda: !lambda return 1;\n"
+        "nested: !include_dir_list nested\n",
+    )
+    write_old(tmp_path / "secrets.yaml", "password: hunter2\n")
+    (tmp_path / "nested").mkdir()
+    write_old(tmp_path / "nested" / "a.yaml", "a\n")
+    monkeypatch.setenv("TEST_INCLUDE_CACHE", "1")
+    return tmp_path
+
+
+@pytest.fixture
+def parsed_files(mocker):
+    spy = mocker.spy(yaml_util, "_parse_yaml_file")
+
+    def parsed():
+        files = [os.path.basename(call.args[0]) for call in spy.call_args_list]
+        spy.reset_mock()
+        return sorted(files)
+
+    return parsed
+
+
+def test_include_cache_parses_once(include_dir, parsed_files):
+    first = yaml_util.load_yaml(str(include_dir / "main.yaml"))
+    assert parsed_files() == ["a.yaml", "common.yaml", "main.yaml", "secrets.yaml"]
+    sources = yaml_util.loaded_sources()
+
+    second = yaml_util.load_yaml(str(include_dir / "main.yaml"))
+
+    assert parsed_files() == []
+    assert_same_data(first, second)
+    assert yaml_util.loaded_sources() == sources
+    assert yaml_util.is_secret("hunter2") == "password"
+
+
+def test_include_cache_returns_copies(include_dir):
+    first = yaml_util.load_yaml(str(include_dir / "main.yaml"))
+    first["first"]["value"] = "changed"
+    first["first"]["nested"].append("b")
+    first["second"]["lambda"].value = "return 2;"
+
+    second = yaml_util.load_yaml(str(include_dir / "main.yaml"))
+
+    assert second["first"]["value"] == "hunter2"
+    assert second["first"]["nested"] == ["a"]
+    assert second["second"]["lambda"].value == "return 1;"
+
+
+def test_include_cache_copies_scalars(include_dir):
+    first = yaml_util.load_yaml(str(include_dir / "main.yaml"))
+    # As cv.enum does
+    value = add_class_to_obj(first["first"]["nested"][0], EnumValue)
+    value.enum_value = 1
+
+    second = yaml_util.load_yaml(str(include_dir / "main.yaml"))
+
+    assert second["first"]["nested"][0] == "a"
+    assert not isinstance(second["first"]["nested"][0], EnumValue)
+    assert second["first"]["nested"][0].esp_range is not None
+
+
+@pytest.mark.parametrize(
+    "change",
+    (
+        lambda path: write_old(path / "nested" / "a.yaml", "b\n", age=5),
+        lambda path: write_old(path / "nested" / "b.yaml", "b\n"),
+        lambda path: write_old(path / "secrets.yaml", "password: other\n", age=5),
+    ),
+)
+def test_include_cache_invalidated_by_nested_files(include_dir, parsed_files, change):
+    yaml_util.load_yaml(str(include_dir / "main.yaml"))
+    parsed_files()
+
+    change(include_dir)
+    yaml_util.load_yaml(str(include_dir / "main.yaml"))
+
+    assert "common.yaml" in parsed_files()
+
+
+def test_include_cache_invalidated_by_env_var(include_dir, parsed_files, monkeypatch):
+    yaml_util.load_yaml(str(include_dir / "main.yaml"))
+    parsed_files()
+
+    monkeypatch.setenv("TEST_INCLUDE_CACHE", "2")
+    actual = yaml_util.load_yaml(str(include_dir / "main.yaml"))
+
+    assert parsed_files() == ["main.yaml"]
+    assert actual["env"] == "2"
+
+
+def test_include_cache_skips_recent_files(include_dir, parsed_files):
+    (include_dir / "common.yaml").write_text("value: 1\n")
+
+    yaml_util.load_yaml(str(include_dir / "main.yaml"))
+    yaml_util.load_yaml(str(include_dir / "main.yaml"))
+
+    assert parsed_files() == ["common.yaml"] * 4 + ["main.yaml"] * 2
@@ -0,0 +1,120 @@
+import os
+import subprocess
+
+import pytest
+
+from esphome.components.zephyr import zephyrManager
+from esphome.core import CORE
+
+
+@pytest.fixture
+def manager(tmp_path):
+    CORE.config_path = str(tmp_path / "test.yaml")
+    yield zephyrManager.ZephyrManager(
+        "nrf52840dongle_nrf52840", str(tmp_path / "zephyr"), {}, ""
+    )
+    CORE.reset()
+
+
+def setup_device(tmp_path, name, key="key"):
+    """Create the files the Zephyr writer would create for a device.
+
+    The key is shared by all devices, unless it is None.
+    """
+    CORE.name = name
+    CORE.build_path = str(tmp_path / name)
+    boot_source = tmp_path / name / "boot" / "mcuboot" / "boot" / "zephyr"
+    boot_source.mkdir(parents=True)
+    (boot_source / "dts.overlay").write_text("&flash0 {};\n")
+    (tmp_path / name / "boot" / "mcuboot.json").write_text('{"revision": "abc"}')
+    if key is not None:
+        shared_key = tmp_path / ".esphome" / zephyrManager.SHARED_SIGNING_KEY
+        shared_key.parent.mkdir(exist_ok=True)
+        shared_key.write_text(key)
+
+
+@pytest.fixture
+def west(mocker):
+    mocker.patch.object(zephyrManager, "run_external_process", return_value=0)
+    return mocker.patch.object(
+        zephyrManager.subprocess,
+        "run",
+        return_value=subprocess.CompletedProcess([], 0, stdout=b""),
+    )
+
+
+def test_bootloader_dir_shared(manager, tmp_path):
+    setup_device(tmp_path, "first")
+    first = manager.bootloader_dir()
+    setup_device(tmp_path, "second", key=None)
+    second = manager.bootloader_dir()
+
+    assert manager.signing_key == str(
+        tmp_path / ".esphome" / zephyrManager.SHARED_SIGNING_KEY
+    )
+    assert first == second
+    assert first.startswith(str(tmp_path / ".esphome"))
+
+
+def test_bootloader_dir_device_key(manager, tmp_path):
+    setup_device(tmp_path, "first")
+    first = manager.bootloader_dir()
+    # Set up before the key was shared
+    setup_device(tmp_path, "second", key=None)
+    (tmp_path / "second" / "second.pem").write_text("other key")
+    second = manager.bootloader_dir()
+
+    assert manager.signing_key == str(tmp_path / "second" / "second.pem")
+    assert first != second
+
+
+def test_signing_key_configured(tmp_path):
+    CORE.config_path = str(tmp_path / "test.yaml")
+    CORE.name = "test"
+    CORE.build_path = str(tmp_path / "test")
+    (tmp_path / "test").mkdir()
+    (tmp_path / "test" / "test.pem").write_text("key")
+    manager = zephyrManager.ZephyrManager(
+        "nrf52840dongle_nrf52840", str(tmp_path / "zephyr"), {}, "", "keys/fleet.pem"
+    )
+
+    assert manager.signing_key == str(tmp_path / "keys" / "fleet.pem")
+    CORE.reset()
+
+
+def test_bootloader_dir_not_set_up(manager, tmp_path):
+    CORE.name = "test"
+    CORE.build_path = str(tmp_path / "test")
+
+    assert manager.bootloader_dir() == str(tmp_path / "test" / "boot")
+
+
+def test_compile_reuses_bootloader(manager, tmp_path, west):
+    setup_device(tmp_path, "first")
+    assert manager.compile() == 0
+    setup_device(tmp_path, "second")
+    assert manager.compile() == 0
+
+    (command,), kwargs = west.call_args
+    assert west.call_count == 1
+    assert kwargs["cwd"] == str(tmp_path / "zephyr")
+    assert str(tmp_path / "first" / "boot" / "mcuboot") in " ".join(command)
+    assert zephyrManager.run_external_process.call_count == 2
+
+
+def test_compile_bootloader_failed(manager, tmp_path, west):
+    setup_device(tmp_path, "first")
+    west.return_value = subprocess.CompletedProcess([], 2, stdout=b"error")
+
+    assert manager.compile() == 2
+    assert manager.compile() == 2
+    assert west.call_count == 2
+
+
+def test_compile_bootloader_flashed(manager, tmp_path, west):
+    setup_device(tmp_path, "first")
+    (tmp_path / "first" / "boot_flashed.info").write_text("")
+
+    assert manager.compile() == 0
+    west.assert_not_called()
+    assert not os.path.exists(tmp_path / ".esphome" / "zephyr_mcuboot")
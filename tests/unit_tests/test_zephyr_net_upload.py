@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from esphome.components.zephyr import netUpload
+from esphome.core import CORE
+
+
+@pytest.fixture
+def resolve(tmp_path, mocker):
+    CORE.config_path = str(tmp_path / "test.yaml")
+    CORE.name = "test"
+    zc = mocker.patch("esphome.zeroconf.shared_zeroconf").return_value
+    zc.resolve_host6.return_value = "fd00::1"
+
+    yield zc.resolve_host6
+
+    CORE.reset()
+
+
+def test_get_flash_address(resolve):
+    assert netUpload.get_flash_address(1.0) == "fd00::1"
+
+    resolve.assert_called_once_with("test.local.", 1.0)
+
+
+def test_get_flash_address_cached(resolve):
+    netUpload.get_flash_address()
+    assert netUpload.get_flash_address() == "fd00::1"
+
+    assert resolve.call_count == 1
+
+
+def test_get_flash_address_cache_expired(resolve, mocker):
+    netUpload.get_flash_address()
+    mocker.patch.object(
+        netUpload.time, "time", return_value=netUpload.time.time() + 3600
+    )
+    resolve.return_value = "fd00::2"
+
+    assert netUpload.get_flash_address() == "fd00::2"
+
+
+def test_get_flash_address_not_found(resolve):
+    resolve.return_value = None
+
+    with pytest.raises(RuntimeError):
+        netUpload.get_flash_address()
+
+
+def test_net_upload_failed_forgets_address(resolve, mocker, tmp_path):
+    mocker.patch("esphome.components.zephyr_ota.smp.run_smp_upload", return_value=1)
+    netUpload.get_flash_address()
+
+    assert netUpload.net_upload(True, str(tmp_path), "fd00::1") == 1
+
+    with open(tmp_path / ".esphome" / "zephyr_addresses.json", encoding="utf-8") as f:
+        assert "test" not in json.load(f)
+
+
+@pytest.mark.parametrize(
+    "value, timeout",
+    (
+        (None, netUpload.DEFAULT_MDNS_TIMEOUT),
+        ("0.5", 0.5),
+        ("soon", netUpload.DEFAULT_MDNS_TIMEOUT),
+        ("0", netUpload.DEFAULT_MDNS_TIMEOUT),
+    ),
+)
+def test_get_flash_address_timeout(resolve, monkeypatch, value, timeout):
+    if value is not None:
+        monkeypatch.setenv(netUpload.ENV_MDNS_TIMEOUT, value)
+    else:
+        monkeypatch.delenv(netUpload.ENV_MDNS_TIMEOUT, raising=False)
+
+    netUpload.get_flash_address()
+
+    resolve.assert_called_once_with("test.local.", timeout)
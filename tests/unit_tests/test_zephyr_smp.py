@@ -0,0 +1,237 @@
+import asyncio
+import hashlib
+import struct
+import threading
+
+import pytest
+
+from esphome.components.zephyr_ota import smp
+
+
+def make_image(body: bytes) -> bytes:
+    """A minimal signed MCUboot image, with a SHA-256 TLV after a dummy one."""
+    header = struct.pack("<IIHHII", smp.IMAGE_MAGIC, 0, 32, 0, len(body), 0)
+    header = header.ljust(32, b"\0")
+    digest = hashlib.sha256(header + body).digest()
+    tlvs = struct.pack("<HH", 0x01, 4) + b"keyh"
+    tlvs += struct.pack("<HH", smp.IMAGE_TLV_SHA256, len(digest)) + digest
+    return (
+        header
+        + body
+        + struct.pack("<HH", smp.IMAGE_TLV_INFO_MAGIC, 4 + len(tlvs))
+        + tlvs
+    )
+
+
+class FakeDevice(asyncio.DatagramProtocol):
+    """Implements the image upload of the SMP server of a device."""
+
+    def __init__(self, buf_size=256, buf_count=4, drop=(), upload_error=None):
+        self.buf_size = buf_size
+        self.buf_count = buf_count
+        # Response to image uploads past the first chunk, instead of the offset
+        self.upload_error = upload_error
+        # Numbers of the received packets to ignore
+        self.drop = set(drop)
+        self.received = 0
+        self.image = bytearray()
+        self.length = None
+        self.starts = 0
+        self.confirmed = None
+        self.reset = False
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.received += 1
+        if self.received in self.drop:
+            return
+        op, _, length, group, seq, command = smp.SMP_HEADER.unpack_from(data)
+        assert len(data) <= self.buf_size
+        request = smp.cbor_decode(data[smp.SMP_HEADER.size :][:length])
+        response = self.handle(group, command, request)
+        body = smp.cbor_encode(response)
+        self.transport.sendto(
+            smp.SMP_HEADER.pack(op + 1, 0, len(body), group, seq, command) + body,
+            addr,
+        )
+
+    def handle(self, group, command, request):
+        if (group, command) == (smp.MGMT_GROUP_ID_OS, smp.OS_MGMT_ID_MCUMGR_PARAMS):
+            if self.buf_count is None:
+                return {"rc": 8}
+            return {"buf_size": self.buf_size, "buf_count": self.buf_count}
+        if (group, command) == (smp.MGMT_GROUP_ID_IMAGE, smp.IMG_MGMT_ID_UPLOAD):
+            if self.upload_error is not None and request["off"] != 0:
+                return self.upload_error
+            if request["off"] == 0:
+                self.starts += 1
+                self.length = request["len"]
+                self.image = bytearray()
+            elif request["off"] != len(self.image):
+                return {"rc": 0, "off": len(self.image)}
+            self.image += request["data"]
+            return {"rc": 0, "off": len(self.image)}
+        if (group, command) == (smp.MGMT_GROUP_ID_IMAGE, smp.IMG_MGMT_ID_STATE):
+            self.confirmed = request["hash"]
+            return {"rc": 0}
+        if (group, command) == (smp.MGMT_GROUP_ID_OS, smp.OS_MGMT_ID_RESET):
+            self.reset = True
+            return {}
+        return {"rc": 8}
+
+
+def run_upload(tmp_path, device, image):
+    path = tmp_path / "zephyr.signed.bin"
+    path.write_bytes(image)
+
+    async def upload():
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: device, local_addr=("127.0.0.1", 0)
+        )
+        port = transport.get_extra_info("sockname")[1]
+        try:
+            await smp.upload_image("127.0.0.1", str(path), port)
+        finally:
+            transport.close()
+
+    asyncio.run(upload())
+
+
+@pytest.fixture(autouse=True)
+def short_timeouts(monkeypatch):
+    monkeypatch.setattr(smp, "REQUEST_TIMEOUT", 0.1)
+    monkeypatch.setattr(smp, "ERASE_TIMEOUT", 0.5)
+
+
+@pytest.mark.parametrize(
+    "value",
+    (
+        0,
+        23,
+        24,
+        255,
+        256,
+        65536,
+        2**32,
+        -1,
+        -500,
+        b"",
+        b"\x01" * 300,
+        "off",
+        [1, [2]],
+    ),
+)
+def test_cbor_roundtrip(value):
+    assert smp.cbor_decode(smp.cbor_encode(value)) == value
+
+
+def test_cbor_decode_indefinite():
+    # {"rc": 0, "off": 64} the way the device encodes it
+    data = b"\xbf\x62rc\x00\x63off\x18\x40\xff"
+
+    assert smp.cbor_decode(data) == {"rc": 0, "off": 64}
+
+
+def test_cbor_decode_truncated():
+    with pytest.raises(ValueError):
+        smp.cbor_decode(b"\x59\x01")
+
+
+def test_image_hash():
+    image = make_image(b"\xaa" * 100)
+
+    assert smp.image_hash(image) == hashlib.sha256(image[:132]).digest()
+
+
+def test_image_hash_invalid():
+    with pytest.raises(smp.SMPError):
+        smp.image_hash(b"\0" * 64)
+
+
+def test_upload(tmp_path):
+    image = make_image(bytes(range(256)) * 20)
+    device = FakeDevice()
+
+    run_upload(tmp_path, device, image)
+
+    assert bytes(device.image) == image
+    assert device.starts == 1
+    assert device.confirmed == smp.image_hash(image)
+    assert device.reset
+
+
+def test_upload_lost_packets(tmp_path):
+    image = make_image(bytes(range(256)) * 20)
+    device = FakeDevice(drop=(1, 4, 8, 9, 10, 25))
+
+    run_upload(tmp_path, device, image)
+
+    assert bytes(device.image) == image
+    assert device.starts == 1
+    assert device.confirmed == smp.image_hash(image)
+
+
+def test_upload_without_params(tmp_path):
+    image = make_image(b"\x55" * 3000)
+    device = FakeDevice(buf_size=smp.DEFAULT_BUF_SIZE, buf_count=None)
+
+    run_upload(tmp_path, device, image)
+
+    assert bytes(device.image) == image
+
+
+def test_upload_no_response(tmp_path):
+    image = make_image(b"\x55" * 300)
+    device = FakeDevice(drop=range(1, 1000))
+
+    with pytest.raises(smp.SMPError, match="No response"):
+        run_upload(tmp_path, device, image)
+
+
+@pytest.mark.parametrize(
+    "response, message",
+    (
+        ({"rc": 2}, "error 2: out of memory"),
+        ({"rc": 42}, "error 42: unknown error"),
+        ({"rc": 0}, "Invalid image upload response"),
+        ({}, "Invalid image upload response"),
+    ),
+)
+def test_upload_error_response(tmp_path, response, message):
+    image = make_image(b"\x55" * 3000)
+    device = FakeDevice(upload_error=response)
+
+    with pytest.raises(smp.SMPError, match=message):
+        run_upload(tmp_path, device, image)
+
+
+def test_run_smp_upload_error(tmp_path, caplog):
+    path = tmp_path / "zephyr.signed.bin"
+    path.write_bytes(make_image(b"\x55" * 3000))
+    device = FakeDevice(upload_error={"rc": 6})
+
+    async def serve():
+        loop = asyncio.get_running_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: device, local_addr=("127.0.0.1", 0)
+        )
+        return transport
+
+    loop = asyncio.new_event_loop()
+    transport = loop.run_until_complete(serve())
+    port = transport.get_extra_info("sockname")[1]
+    thread = threading.Thread(target=loop.run_forever)
+    thread.start()
+    try:
+        assert smp.run_smp_upload("127.0.0.1", str(path), port) == 1
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        transport.close()
+        loop.close()
+
+    assert "error 6: bad state" in caplog.text
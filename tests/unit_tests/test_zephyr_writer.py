@@ -0,0 +1,112 @@
+import os
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from esphome.components.zephyr import zephyr_writer
+from esphome.core import CORE
+
+
+class FakeManager:
+    def __init__(self, zephyr_base, signing_key):
+        self.zephyr_base = zephyr_base
+        self.signing_key = signing_key
+        self.Kconfigs = {"CONFIG_SPI": "n"}
+        self.device_overlay_list = ["&i2c0 {};"]
+        self.board = SimpleNamespace(flash_mapping=lambda: "&flash0 {};\n")
+
+    def add_Kconfig_vec(self, configs):
+        self.Kconfigs.update(configs)
+
+
+@pytest.fixture
+def builder(tmp_path):
+    mcuboot = tmp_path / "zephyr" / "bootloader" / "mcuboot"
+    (mcuboot / "boot" / "zephyr").mkdir(parents=True)
+    (mcuboot / "boot" / "zephyr" / "prj.conf").write_text("CONFIG_MCUBOOT=y\n")
+    (mcuboot / "boot" / "zephyr" / "main.c").write_text("int main;\n")
+    CORE.config_path = str(tmp_path / "test.yaml")
+    CORE.build_path = str(tmp_path / "build")
+    CORE.name = "test"
+    # An existing key, so imgtool isn't needed
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "test.pem").write_text("key")
+
+    yield zephyr_writer.ZephyrDirectoryBuilder(
+        FakeManager(str(tmp_path / "zephyr"), str(tmp_path / "build" / "test.pem"))
+    )
+
+    CORE.reset()
+
+
+def generated_files(builder):
+    boot = os.path.join(builder.boot_dir, "mcuboot", "boot", "zephyr")
+    return {
+        path: (os.stat(path).st_mtime_ns, Path(path).read_text(encoding="utf-8"))
+        for path in (
+            os.path.join(builder.proj_dir, "CMakeLists.txt"),
+            os.path.join(builder.proj_dir, "prj.conf"),
+            os.path.join(builder.proj_dir, "app.overlay"),
+            os.path.join(boot, "prj.conf"),
+            os.path.join(boot, "dts.overlay"),
+            os.path.join(boot, "main.c"),
+        )
+    }
+
+
+def test_run(builder):
+    assert builder.run() == 0
+
+    boot = os.path.join(builder.boot_dir, "mcuboot", "boot", "zephyr")
+    with open(os.path.join(boot, "prj.conf"), encoding="utf-8") as f:
+        assert f.read() == (
+            "CONFIG_MCUBOOT=y\n"
+            f'CONFIG_BOOT_SIGNATURE_KEY_FILE="{builder.key_file}"\n'
+        )
+    with open(os.path.join(boot, "dts.overlay"), encoding="utf-8") as f:
+        assert f.read() == "&flash0 {};\n"
+
+
+def test_run_unchanged(builder, mocker):
+    builder.run()
+    expected = generated_files(builder)
+    copytree = mocker.spy(shutil, "copytree")
+
+    assert builder.run() == 0
+
+    copytree.assert_not_called()
+    assert generated_files(builder) == expected
+
+
+def test_run_mcuboot_changed(builder):
+    builder.run()
+    mcuboot = os.path.join(builder.zephyr_base, "bootloader", "mcuboot")
+    os.remove(os.path.join(mcuboot, "boot", "zephyr", "main.c"))
+    with open(os.path.join(mcuboot, "boot", "zephyr", "dts.overlay"), "w") as f:
+        f.write("/ {};\n")
+
+    builder.run()
+
+    boot = os.path.join(builder.boot_dir, "mcuboot", "boot", "zephyr")
+    assert not os.path.exists(os.path.join(boot, "main.c"))
+    with open(os.path.join(boot, "dts.overlay"), encoding="utf-8") as f:
+        assert f.read() == "/ {};\n&flash0 {};\n"
+
+
+def test_run_creates_shared_key(builder, tmp_path, mocker):
+    key_file = tmp_path / ".esphome" / "zephyr_signing_key.pem"
+    builder.key_file = str(key_file)
+
+    def keygen(command, **kwargs):
+        key_file.write_text("key")
+        return SimpleNamespace(returncode=0)
+
+    run = mocker.patch.object(zephyr_writer.subprocess, "run", side_effect=keygen)
+
+    assert builder.run() == 0
+    assert builder.run() == 0
+
+    run.assert_called_once()
+    assert run.call_args[0][0][:4] == ["imgtool", "keygen", "-k", str(key_file)]
@@ -0,0 +1,69 @@
+import socket
+import threading
+import time
+
+from zeroconf import DNSAddress
+
+from esphome import zeroconf
+
+ADDRESS = "fd00::1234"
+
+
+class FakeZeroconf:
+    """Answers every query after a delay, like a device on the network would."""
+
+    def __init__(self, delay=0.05, answer=True):
+        self.delay = delay
+        self.answer = answer
+        self.listeners = []
+        self.queries = 0
+
+    def add_listener(self, listener, question):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def send(self, out):
+        self.queries += 1
+        if self.answer:
+            threading.Timer(self.delay, self._respond).start()
+
+    def _respond(self):
+        record = DNSAddress(
+            "test.local.",
+            zeroconf._TYPE_AAAA,
+            zeroconf._CLASS_IN,
+            120,
+            socket.inet_pton(socket.AF_INET6, ADDRESS),
+        )
+        for listener in list(self.listeners):
+            listener.update_record(self, time.time(), record)
+
+
+def test_host_resolver_returns_on_answer():
+    resolver = zeroconf.HostResolver("test.local.", zeroconf._TYPE_AAAA)
+    zc = FakeZeroconf()
+
+    start = time.monotonic()
+    assert resolver.request(zc, 3.0)
+
+    assert time.monotonic() - start < 0.15
+    assert socket.inet_ntop(socket.AF_INET6, resolver.address) == ADDRESS
+    assert zc.queries == 1
+    assert not zc.listeners
+
+
+def test_host_resolver_ignores_other_types():
+    resolver = zeroconf.HostResolver("test.local.")
+
+    assert not resolver.request(FakeZeroconf(), 0.3)
+    assert resolver.address is None
+
+
+def test_host_resolver_timeout():
+    zc = FakeZeroconf(answer=False)
+
+    assert not zeroconf.HostResolver("test.local.").request(zc, 0.5)
+    # Queried again with back off
+    assert zc.queries == 2